@@ -0,0 +1,44 @@
+"""add runs
+
+Revision ID: 4119aaecd7d2
+Revises: 63c8adb7fe7a
+Create Date: 2026-10-16 23:38:12.604117
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4119aaecd7d2'
+down_revision: str | Sequence[str] | None = '63c8adb7fe7a'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_suite', sa.String(), nullable=False),
+    sa.Column('browser', sa.String(), nullable=False),
+    sa.Column('headless', sa.Boolean(), nullable=False),
+    sa.Column('priority', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('exit_code', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_runs_created_at'), 'runs', ['created_at'], unique=False)
+    op.create_index('ix_runs_status_created_at', 'runs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runs_status_created_at', table_name='runs')
+    op.drop_index(op.f('ix_runs_created_at'), table_name='runs')
+    op.drop_table('runs')
@@ -0,0 +1,32 @@
+"""add run shards and test counts
+
+Revision ID: f90aca09faac
+Revises: 4119aaecd7d2
+Create Date: 2026-10-16 23:46:36.266699
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f90aca09faac'
+down_revision: str | Sequence[str] | None = '4119aaecd7d2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('runs', sa.Column('shards', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('runs', sa.Column('total_tests', sa.Integer(), nullable=True))
+    op.add_column('runs', sa.Column('failed_tests', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('runs', 'failed_tests')
+    op.drop_column('runs', 'total_tests')
+    op.drop_column('runs', 'shards')
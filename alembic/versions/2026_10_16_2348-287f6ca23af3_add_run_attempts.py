@@ -0,0 +1,39 @@
+"""add run attempts
+
+Revision ID: 287f6ca23af3
+Revises: f90aca09faac
+Create Date: 2026-10-16 23:48:25.439422
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '287f6ca23af3'
+down_revision: str | Sequence[str] | None = 'f90aca09faac'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('run_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('attempt', sa.Integer(), nullable=False),
+    sa.Column('exit_code', sa.Integer(), nullable=True),
+    sa.Column('total_tests', sa.Integer(), nullable=False),
+    sa.Column('failed_tests', sa.Integer(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('run_id', 'attempt')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('run_attempts')
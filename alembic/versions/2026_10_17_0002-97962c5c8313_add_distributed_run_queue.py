@@ -0,0 +1,61 @@
+"""add distributed run queue
+
+Revision ID: 97962c5c8313
+Revises: 287f6ca23af3
+Create Date: 2026-10-17 00:02:10.160249
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '97962c5c8313'
+down_revision: str | Sequence[str] | None = '287f6ca23af3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('queue_workers',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('hostname', sa.String(), nullable=False),
+    sa.Column('pid', sa.Integer(), nullable=False),
+    sa.Column('slots', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('run_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('lane', sa.Integer(), nullable=False),
+    sa.Column('worker_id', sa.String(), nullable=True),
+    sa.Column('deliveries', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cancel_requested', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('enqueued_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('run_id')
+    )
+    op.create_index('ix_run_jobs_claimable', 'run_jobs', ['lane', 'id'], unique=False, postgresql_where=sa.text('worker_id IS NULL'))
+    op.create_index(op.f('ix_run_jobs_worker_id'), 'run_jobs', ['worker_id'], unique=False)
+    op.add_column('runs', sa.Column('retries', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('runs', sa.Column('timeout_seconds', sa.Integer(), nullable=True))
+    op.add_column('runs', sa.Column('submitter', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('runs', 'submitter')
+    op.drop_column('runs', 'timeout_seconds')
+    op.drop_column('runs', 'retries')
+    op.drop_index(op.f('ix_run_jobs_worker_id'), table_name='run_jobs')
+    op.drop_index('ix_run_jobs_claimable', table_name='run_jobs', postgresql_where=sa.text('worker_id IS NULL'))
+    op.drop_table('run_jobs')
+    op.drop_table('queue_workers')
@@ -0,0 +1,41 @@
+"""add run request timings
+
+Revision ID: fa097c908046
+Revises: 97962c5c8313
+Create Date: 2026-10-17 00:41:40.139896
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa097c908046'
+down_revision: str | Sequence[str] | None = '97962c5c8313'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('run_request_timings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('method', sa.String(), nullable=False),
+    sa.Column('endpoint', sa.String(), nullable=False),
+    sa.Column('phase', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('p50', sa.Float(), nullable=False),
+    sa.Column('p95', sa.Float(), nullable=False),
+    sa.Column('p99', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('run_id', 'method', 'endpoint', 'phase')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('run_request_timings')
@@ -0,0 +1,100 @@
+"""partition test_runs
+
+Revision ID: 202a7f34f54e
+Revises: fa097c908046
+Create Date: 2026-10-17 01:11:40.864237
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '202a7f34f54e'
+down_revision: str | Sequence[str] | None = 'fa097c908046'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Monthly partitions from the oldest row up to two months ahead; later ones
+# are created by app.db.partitions. Names match its partition_name().
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    m date := date_trunc(
+        'month', LEAST((SELECT min(created_at) FROM test_runs_old), now())
+    )::date;
+BEGIN
+    WHILE m <= date_trunc('month', now()) + interval '2 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF test_runs FOR VALUES FROM (%L) TO (%L)',
+            'test_runs_' || to_char(m, '"y"YYYY"m"MM'),
+            m,
+            (m + interval '1 month')::date
+        );
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('test_runs', 'test_runs_old')
+    op.execute('ALTER TABLE test_runs_old RENAME CONSTRAINT test_runs_pkey TO test_runs_old_pkey')
+    op.drop_index('ix_test_runs_test_name', table_name='test_runs_old')
+    op.drop_index('ix_test_runs_id', table_name='test_runs_old')
+    # The sequence keeps numbering the rows of the new table
+    op.execute('ALTER SEQUENCE test_runs_id_seq OWNED BY NONE')
+
+    op.create_table('test_runs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('test_runs_id_seq')"), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=True),
+    sa.Column('test_name', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute('CREATE TABLE test_runs_default PARTITION OF test_runs DEFAULT')
+    op.create_index('ix_test_runs_test_name_created_at', 'test_runs', ['test_name', 'created_at'], unique=False)
+    op.create_index('ix_test_runs_status_created_at', 'test_runs', ['status', 'created_at'], unique=False)
+    op.create_index('ix_test_runs_run_id_status', 'test_runs', ['run_id', 'status'], unique=False)
+
+    op.execute(
+        'INSERT INTO test_runs (id, test_name, status, duration, created_at) '
+        'SELECT id, test_name, status, duration, COALESCE(created_at, now()) '
+        'FROM test_runs_old'
+    )
+    op.drop_table('test_runs_old')
+    op.execute('ALTER SEQUENCE test_runs_id_seq OWNED BY test_runs.id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('test_runs', 'test_runs_partitioned')
+    op.execute('ALTER TABLE test_runs_partitioned RENAME CONSTRAINT test_runs_pkey TO test_runs_partitioned_pkey')
+    op.execute('ALTER SEQUENCE test_runs_id_seq OWNED BY NONE')
+
+    op.create_table('test_runs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('test_runs_id_seq')"), nullable=False),
+    sa.Column('test_name', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        'INSERT INTO test_runs (id, test_name, status, duration, created_at) '
+        'SELECT id, test_name, status, duration, created_at '
+        'FROM test_runs_partitioned'
+    )
+    # Drops every partition with it
+    op.drop_table('test_runs_partitioned')
+    op.execute('ALTER SEQUENCE test_runs_id_seq OWNED BY test_runs.id')
+    op.create_index(op.f('ix_test_runs_id'), 'test_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_test_runs_test_name'), 'test_runs', ['test_name'], unique=False)
@@ -0,0 +1,41 @@
+"""add test daily stats
+
+Revision ID: 999b486facaf
+Revises: 202a7f34f54e
+Create Date: 2026-10-17 01:22:55.429246
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '999b486facaf'
+down_revision: str | Sequence[str] | None = '202a7f34f54e'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('test_daily_stats',
+    sa.Column('test_name', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('executions', sa.Integer(), nullable=False),
+    sa.Column('passed', sa.Integer(), nullable=False),
+    sa.Column('flips', sa.Integer(), nullable=False),
+    sa.Column('last_status', sa.String(), nullable=False),
+    sa.Column('duration_sum', sa.Float(), nullable=False),
+    sa.Column('duration_buckets', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('test_name', 'day')
+    )
+    op.create_index('ix_test_daily_stats_day', 'test_daily_stats', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_test_daily_stats_day', table_name='test_daily_stats')
+    op.drop_table('test_daily_stats')
@@ -0,0 +1,26 @@
+"""add runs test_suite index
+
+Revision ID: 3d5e8a41c2b7
+Revises: 999b486facaf
+Create Date: 2026-10-17 02:10:23.518204
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3d5e8a41c2b7'
+down_revision: str | Sequence[str] | None = '999b486facaf'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_runs_test_suite_created_at', 'runs', ['test_suite', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runs_test_suite_created_at', table_name='runs')
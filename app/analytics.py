@@ -0,0 +1,175 @@
+"""
+Per-test flakiness and duration analytics behind GET /analytics/tests.
+
+Statistics are read from the test_daily_stats rollup, never from test_runs:
+a window of N days is N rows per test whatever the number of results, and
+those are added up in the database, durations included, since they are
+kept as histogram bucket counts.
+RollupRefresher keeps the rollup current in the background, and responses
+are held in a TTLCache, so a dashboard reload is a dictionary lookup. Data
+is thus at most ANALYTICS_REFRESH_INTERVAL + ANALYTICS_CACHE_TTL old.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Generic, Literal, TypeVar
+
+from loguru import logger
+from sqlalchemy import Row
+
+from app.db import SessionLocal
+from app.db.models import TestDailyStats
+from app.db.rollups import duration_histogram, refresh_test_stats
+from app.schemas import TestDayStats, TestStatsDetail, TestStatsSummary
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+SortKey = Literal["flip_rate", "pass_rate", "p95", "executions"]
+
+
+def window_start(days: int, today: date | None = None) -> date:
+    """First day (UTC) of a window of `days` days that ends today."""
+    return (today or datetime.now(UTC).date()) - timedelta(days=days - 1)
+
+
+def _durations(buckets: list[int], total: float) -> tuple[float, float]:
+    """p50 and p95 seconds from bucket counts of test_daily_stats."""
+    histogram = duration_histogram()
+    histogram.merge([{"labels": [""], "counts": buckets, "sum": total}])
+    return histogram.quantile(0.5, test_name=""), histogram.quantile(0.95, test_name="")
+
+
+def summarize(total: Row[Any]) -> TestStatsSummary:
+    """Window statistics of one test from repository.total_test_stats_async."""
+    p50, p95 = _durations(total.duration_buckets, total.duration_sum)
+    return TestStatsSummary(
+        test_name=total.test_name,
+        executions=total.executions,
+        passed=total.passed,
+        failed=total.executions - total.passed,
+        pass_rate=total.passed / total.executions,
+        flips=total.flips,
+        flip_rate=total.flips / total.executions,
+        p50=p50,
+        p95=p95,
+        last_status=total.last_status,
+        last_day=total.last_day,
+    )
+
+
+def detail(total: Row[Any], days: Sequence[TestDailyStats]) -> TestStatsDetail:
+    """Window statistics of one test and of each of its `days`."""
+    daily = []
+    for day in days:
+        p50, p95 = _durations(day.duration_buckets, day.duration_sum)
+        daily.append(
+            TestDayStats(
+                day=day.day,
+                executions=day.executions,
+                pass_rate=day.passed / day.executions,
+                flips=day.flips,
+                p50=p50,
+                p95=p95,
+            )
+        )
+    return TestStatsDetail(**summarize(total).model_dump(), daily=daily)
+
+
+def rank(
+    totals: Sequence[Row[Any]],
+    sort: SortKey,
+    min_executions: int,
+    limit: int,
+) -> list[TestStatsSummary]:
+    """
+    Window statistics of the tests in `totals`, worst first: flakiest,
+    least passing, slowest or most executed.
+    """
+    stats = [summarize(total) for total in totals if total.executions >= min_executions]
+    sign = 1 if sort == "pass_rate" else -1
+    stats.sort(key=lambda s: (sign * getattr(s, sort), s.test_name))
+    return stats[:limit]
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU of computed values with a time to live, for use from one
+    event loop. Concurrent misses of a key share a single computation, so a
+    burst of dashboard requests runs one query. A ttl of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, tuple[float, asyncio.Future[V]]] = OrderedDict()
+
+    async def get(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        """The cached value of `key`, computed with `load` if missing or stale."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Shielded: a cancelled request must not cancel the shared load
+            return await asyncio.shield(entry[1])
+
+        self.misses += 1
+        future = asyncio.ensure_future(load())
+        future.add_done_callback(lambda done: self._forget_failure(key, done))
+        self._entries[key] = (time.monotonic() + self.ttl, future)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return await asyncio.shield(future)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _forget_failure(self, key: K, future: asyncio.Future[V]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            return
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is future:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RollupRefresher:
+    """Refreshes test_daily_stats every `interval` seconds, off the event loop."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._watch(), name="rollup-refresher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    @staticmethod
+    def refresh() -> int:
+        with SessionLocal() as db:
+            return refresh_test_stats(db)
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Failed to refresh test analytics rollups: {e}")
+            await asyncio.sleep(self.interval)
@@ -1,7 +1,13 @@
+from app.clients.async_base import AsyncBaseAPIClient
+from app.clients.async_booker import AsyncBookerClient
 from app.clients.base import BaseAPIClient
 from app.clients.booker import BookerClient
+from app.clients.bulk import BulkResult
 
 __all__ = [
+    "AsyncBaseAPIClient",
+    "AsyncBookerClient",
     "BaseAPIClient",
     "BookerClient",
+    "BulkResult",
 ]
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from types import TracebackType
+from typing import Any, Self, cast
+from urllib.parse import urljoin
+
+import httpx
+from loguru import logger
+from pydantic import BaseModel
+
+from app import metrics
+from app.clients.base import (
+    RETRY_BACKOFF,
+    RETRY_METHODS,
+    RETRY_STATUSES,
+    RETRY_TOTAL,
+    prepare_payload,
+)
+from app.exceptions import APIClientError
+from app.schemas.common import HttpMethod
+from config.settings import ClientSettings, settings
+
+
+def _backoff(retry: int) -> float:
+    """Delay before the n-th retry, as urllib3's Retry computes it."""
+    return 0.0 if retry <= 1 else RETRY_BACKOFF * 2 ** (retry - 1)
+
+
+class AsyncHTTPClient:
+    """
+    Asynchronous transport layer: one pooled httpx.AsyncClient keeps
+    connections alive across requests, with at most `config.concurrency`
+    requests in flight at once. Retries like the synchronous HTTPClient.
+    """
+
+    def __init__(self, base_url: str, config: ClientSettings | None = None) -> None:
+        config = config or settings.client
+        self.base_url = base_url
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+            follow_redirects=True,
+        )
+        self._slots = asyncio.Semaphore(config.concurrency)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._send_with_retries(method, url, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            metrics.HTTP_CLIENT_LATENCY.observe(
+                time.perf_counter() - started, method=str(method).upper(), status=status
+            )
+
+    async def _send_with_retries(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        retriable = str(method).upper() in RETRY_METHODS
+        retry = 0
+        while True:
+            exhausted = not retriable or retry >= RETRY_TOTAL
+            try:
+                async with self._slots:
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if exhausted:
+                    raise
+            else:
+                if exhausted or response.status_code not in RETRY_STATUSES:
+                    return response
+                await response.aclose()
+
+            retry += 1
+            await asyncio.sleep(_backoff(retry))
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class AsyncBaseAPIClient:
+    """
+    Asyncio counterpart of BaseAPIClient with the same request helpers and
+    APIClientError mapping, for driving many API checks concurrently from one
+    event loop. Requests are logged but not reported as Allure steps: the
+    Allure step stack is per thread, so concurrent requests would interleave.
+
+    Close it with `aclose()`, or use it as an async context manager.
+    """
+
+    def __init__(self, base_url: str, config: ClientSettings | None = None) -> None:
+        self.config = config = config or settings.client
+        self._http = AsyncHTTPClient(base_url, config)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Executes request through transport layer with error mapping."""
+
+        url = urljoin(self._http.base_url, endpoint)
+
+        logger.debug(f"Request: {method} {url} | Body: {kwargs.get('json')}")
+
+        try:
+            response = await self._http.request(method=method, url=url, **kwargs)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Network Error: {e}")
+
+            raise APIClientError(f"Network error during {method} {url}") from e
+
+        logger.debug(
+            f"Response: {response.status_code} | "
+            f"Time: {response.elapsed.total_seconds()}s"
+        )
+
+        try:
+            response.raise_for_status()
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP Error: {e.response.status_code}")
+
+            raise APIClientError(
+                message=f"API Error {e.response.status_code}: {e}",
+                status_code=e.response.status_code,
+                payload=self._get_error_payload(e.response),
+            ) from e
+
+        return response
+
+    def _get_error_payload(self, response: httpx.Response) -> dict[str, Any] | None:
+        try:
+            return cast(dict[str, Any], response.json())
+
+        except Exception:
+            return None
+
+    async def get(self, endpoint: str, **kwargs: Any) -> httpx.Response:
+        return await self._request(HttpMethod.GET, endpoint, **kwargs)
+
+    async def post(
+        self,
+        endpoint: str,
+        payload: BaseModel | dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        json_data = prepare_payload(payload)
+
+        return await self._request(HttpMethod.POST, endpoint, json=json_data, **kwargs)
+
+    async def put(
+        self,
+        endpoint: str,
+        payload: BaseModel | dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        json_data = prepare_payload(payload)
+
+        return await self._request(HttpMethod.PUT, endpoint, json=json_data, **kwargs)
+
+    async def patch(
+        self,
+        endpoint: str,
+        payload: BaseModel | dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        json_data = prepare_payload(payload)
+
+        return await self._request(HttpMethod.PATCH, endpoint, json=json_data, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs: Any) -> httpx.Response:
+        return await self._request(HttpMethod.DELETE, endpoint, **kwargs)
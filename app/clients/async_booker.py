@@ -0,0 +1,62 @@
+from typing import Any
+
+from app.clients.async_base import AsyncBaseAPIClient
+from app.clients.booker import BookerClient
+from app.clients.decoding import decode_booking_ids
+from app.schemas import AuthRequest, AuthResponse, Booking, BookingResponse
+
+
+class AsyncBookerClient(AsyncBaseAPIClient):
+    """
+    Asyncio implementation of the Restful-Booker API interface,
+    mirroring BookerClient method for method.
+    """
+
+    AUTH_ENDPOINT = BookerClient.AUTH_ENDPOINT
+    BOOKING_ENDPOINT = BookerClient.BOOKING_ENDPOINT
+
+    async def create_auth_token(self, username: str, password: str) -> str:
+        """Obtains session token for protected endpoints."""
+        payload = AuthRequest(username=username, password=password)
+        response = await self.post(endpoint=self.AUTH_ENDPOINT, payload=payload)
+        return AuthResponse.model_validate_json(response.content).token
+
+    async def create_booking(self, booking_data: Booking) -> BookingResponse:
+        response = await self.post(endpoint=self.BOOKING_ENDPOINT, payload=booking_data)
+        return BookingResponse.model_validate_json(response.content)
+
+    async def get_booking(self, booking_id: int) -> Booking:
+        response = await self.get(endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}")
+        return Booking.model_validate_json(response.content)
+
+    async def update_booking(
+        self, booking_id: int, booking_data: Booking, token: str
+    ) -> Booking:
+        headers = {"Cookie": f"token={token}"}
+        response = await self.put(
+            endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
+            payload=booking_data,
+            headers=headers,
+        )
+        return Booking.model_validate_json(response.content)
+
+    async def partial_update_booking(
+        self, booking_id: int, payload: dict[str, Any], token: str
+    ) -> Booking:
+        headers = {"Cookie": f"token={token}"}
+        response = await self.patch(
+            endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
+            payload=payload,
+            headers=headers,
+        )
+        return Booking.model_validate_json(response.content)
+
+    async def delete_booking(self, booking_id: int, token: str) -> None:
+        headers = {"Cookie": f"token={token}"}
+        await self.delete(
+            endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}", headers=headers
+        )
+
+    async def get_booking_ids(self, params: dict[str, Any] | None = None) -> list[int]:
+        response = await self.get(endpoint=self.BOOKING_ENDPOINT, params=params)
+        return decode_booking_ids(response.content, self.config.validate_listings)
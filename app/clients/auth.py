@@ -0,0 +1,121 @@
+"""
+Auth token shared between processes, so that pytest workers, shards and
+load-test users authenticate once instead of each calling /auth.
+
+Tokens live in memory and in a JSON file guarded by an exclusive flock.
+A process that finds no valid token in the file fetches one while holding
+the lock, so concurrent processes wait for it instead of fetching too.
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+
+class TokenProvider:
+    """
+    Hands out one token per `key` (e.g. base URL and username) until it is
+    `ttl` seconds old or rejected by the server; see `refresh`. Without a
+    `path` the token is only shared within the process.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], str],
+        key: str,
+        ttl: float,
+        path: Path | None = None,
+    ) -> None:
+        self.fetch = fetch
+        self.key = key
+        self.ttl = ttl
+        self.path = path
+        self._token: str | None = None
+        self._expires_at = 0.0
+        # Every token handed out, so that callers' own tokens are told apart
+        self._issued: set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """A valid token, fetched only if no process holds one."""
+        with self._lock:
+            if self._token is not None and time.time() < self._expires_at:
+                return self._token
+            return self._load_or_fetch(rejected=None)
+
+    def refresh(self, rejected: str) -> str:
+        """
+        Replaces a token the server refused (403). If another process has
+        already replaced it, that token is reused rather than fetching again.
+        """
+        with self._lock:
+            if self._token is not None and self._token != rejected:
+                return self._token
+            return self._load_or_fetch(rejected)
+
+    def issued(self, token: str) -> bool:
+        """True if `token` was handed out by this provider, expired or not."""
+        with self._lock:
+            return token in self._issued
+
+    def _load_or_fetch(self, rejected: str | None) -> str:
+        with self._shared() as entries:
+            entry = entries.get(self.key) or {}
+            expires_at = float(entry.get("expires_at", 0))
+            if entry.get("token") not in (None, rejected) and time.time() < expires_at:
+                token = str(entry["token"])
+            else:
+                logger.info(f"Fetching auth token for {self.key}")
+                token, expires_at = self.fetch(), time.time() + self.ttl
+                entries[self.key] = {"token": token, "expires_at": expires_at}
+
+        self._token, self._expires_at = token, expires_at
+        self._issued.add(token)
+        return token
+
+    @contextmanager
+    def _shared(self) -> Iterator[dict[str, Any]]:
+        """
+        Yields the cached entries under the file lock and writes them back
+        if they changed. Without a path, yields a throwaway dict.
+        """
+        if self.path is None:
+            yield {}
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = _read_entries(self.path)
+                before = dict(entries)
+                yield entries
+                if entries != before:
+                    _write_entries(self.path, entries)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_entries(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_entries(path: Path, entries: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    # Tokens grant write access to the API; keep them private to the user
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as file:
+        json.dump(entries, file)
+    os.replace(tmp, path)
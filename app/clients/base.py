@@ -1,60 +1,222 @@
-import json
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import ExitStack
+from http import HTTPStatus
 from typing import Any, cast
 from urllib.parse import urljoin
 
-import allure
 import requests
 from loguru import logger
 from pydantic import BaseModel
 from requests import Response, Session
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-from app.exceptions import APIClientError
+from requests.adapters import BaseAdapter
+
+from app import metrics
+from app.clients.cache import CacheKey, ResponseCache
+from app.clients.cassette import CassetteAdapter, shared_cassette
+from app.clients.reporting import RequestReporter, RequestSink, ResponseRecorder
+from app.clients.resilience import BudgetedRetry, shared_breaker, shared_budget
+from app.clients.timing import (
+    CONNECTION_PHASES,
+    RequestTiming,
+    TimedHTTPAdapter,
+    capture,
+    endpoint_template,
+)
+from app.exceptions import APIClientError, CassetteMissError
 from app.schemas.common import HttpMethod
+from config.settings import ClientSettings, settings
+
+# Retry policy shared by the sync and async transports
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH")
+
+
+def prepare_payload(
+    payload: BaseModel | dict[str, Any] | None,
+) -> dict[str, Any] | None:
+    """
+    Normalizes various payload types into JSON-compatible dictionaries.
+    Supports Pydantic models with optional custom 'to_payload' methods.
+    """
+
+    if payload is None:
+        return None
+
+    if isinstance(payload, BaseModel):
+        if hasattr(payload, "to_payload"):
+            return payload.to_payload()  # type: ignore
+
+        return payload.model_dump(by_alias=True, mode="json")
+
+    return payload
 
 
 class HTTPClient:
     """
     Synchronous HTTP transport layer with session management and retry logic.
+    Pool size and timeouts come from ClientSettings. Retries are limited by
+    the target's retry budget, and requests are refused while its circuit
+    breaker is open; see app.clients.resilience. The phases of every request
+    (DNS, connect, TLS, TTFB, download) go to metrics.HTTP_CLIENT_PHASES.
+    CLIENT_CASSETTE_MODE records the exchanges to a cassette or replays them
+    offline; see app.clients.cassette.
+
+    Thread-safe mode (CLIENT_THREAD_SAFE) gives every thread its own
+    requests.Session, so threads never share session state such as cookies,
+    while all sessions draw keep-alive connections from one shared pool.
+    Size CLIENT_POOL_MAXSIZE to the number of threads, or set
+    CLIENT_POOL_BLOCK to make surplus threads wait for a free connection
+    rather than open throwaway ones ("Connection pool is full, discarding").
     """
 
-    def __init__(self, base_url: str) -> None:
+    def __init__(self, base_url: str, config: ClientSettings | None = None) -> None:
+        config = config or settings.client
         self.base_url = base_url
+        self.timeout = (config.connect_timeout, config.read_timeout)
 
-        self.session: Session = requests.Session()
+        self.breaker = shared_breaker(base_url, config)
+        self.budget = shared_budget(base_url, config)
 
-        retries = Retry(
-            total=3,
-            backoff_factor=0.3,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+        retries = BudgetedRetry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
             raise_on_status=False,
+            budget=self.budget,
+            breaker=self.breaker,
+        )
+
+        self.adapter: BaseAdapter = TimedHTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+            max_retries=retries,
         )
+        if config.cassette_mode != "passthrough":
+            self.adapter = CassetteAdapter(
+                self.adapter, shared_cassette(config.cassette, config.cassette_mode)
+            )
 
-        adapter = HTTPAdapter(max_retries=retries)
+        self._local = threading.local()
+        self._shared = None if config.thread_safe else self._new_session()
 
-        self.session.mount("http://", adapter)
+    @property
+    def session(self) -> Session:
+        """The shared session, or the calling thread's one in thread-safe mode."""
+        if self._shared is not None:
+            return self._shared
+
+        session: Session | None = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def _new_session(self) -> Session:
+        session = requests.Session()
+
+        session.mount("http://", self.adapter)
+
+        session.mount("https://", self.adapter)
 
-        self.session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Closes every pooled connection, whichever session opened it."""
+        self.adapter.close()
 
     def request(self, method: str, url: str, **kwargs: Any) -> Response:
-        return self.session.request(method=method, url=url, timeout=(10, 30), **kwargs)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            self.breaker.before_request()
+            # None for requests that never reached the target
+            healthy: bool | None = False
+            try:
+                self.budget.deposit()
+                kwargs.setdefault("timeout", self.timeout)
+                with capture() as timing:
+                    response = self.session.request(method=method, url=url, **kwargs)
+                healthy = response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+                status = str(response.status_code)
+                self._record_phases(method, url, timing)
+                return response
+            except CassetteMissError:
+                # A replay miss is the cassette's fault, not the target's
+                healthy = None
+                raise
+            finally:
+                # Settled whatever was raised: an unsettled half-open probe
+                # would keep the circuit open for the rest of the process
+                if healthy is None:
+                    self.breaker.release()
+                elif healthy:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+        finally:
+            metrics.HTTP_CLIENT_LATENCY.observe(
+                time.perf_counter() - started, method=str(method).upper(), status=status
+            )
+
+    def _record_phases(self, method: str, url: str, timing: RequestTiming) -> None:
+        if timing.headers_at is not None:
+            timing.download = time.perf_counter() - timing.headers_at
+
+        endpoint = endpoint_template(url)
+        for phase, seconds in timing.phases().items():
+            if not seconds and phase in CONNECTION_PHASES:
+                # Sent over a reused connection
+                continue
+            metrics.HTTP_CLIENT_PHASES.observe(
+                seconds, method=str(method).upper(), endpoint=endpoint, phase=phase
+            )
 
 
 class BaseAPIClient:
     """
     Abstract API client providing shared infrastructure for test orchestration:
     logging, Allure reporting, and automatic Pydantic model serialization.
+    How many requests are reported, and where to, is up to `reporter`.
+
+    With CLIENT_CACHE_SIZE set, GETs without extra options are answered from
+    a response cache that the client's own writes invalidate; see `cache`.
     """
 
-    def __init__(self, base_url: str) -> None:
-        self._http = HTTPClient(base_url)
+    def __init__(
+        self,
+        base_url: str,
+        config: ClientSettings | None = None,
+        sinks: Sequence[RequestSink] | None = None,
+    ) -> None:
+        self.config = config = config or settings.client
+        self._http = HTTPClient(base_url, config)
+        self.reporter = RequestReporter(
+            config.reporting, config.reporting_sample_every, sinks
+        )
+        self.cache = (
+            ResponseCache(config.cache_size, config.cache_ttl)
+            if config.cache_size
+            else None
+        )
 
     @property
     def session(self) -> Session:
         return self._http.session
 
+    def close(self) -> None:
+        if self.cache is not None:
+            stats = self.cache.stats
+            logger.info(
+                f"Response cache: {stats.hits} hits, {stats.revalidations} "
+                f"revalidations, {stats.misses} misses ({stats.hit_ratio:.0%})"
+            )
+        self._http.close()
+
     def _request(self, method: str, endpoint: str, **kwargs: Any) -> Response:
         """
         Executes request through transport layer with
@@ -63,48 +225,83 @@ class BaseAPIClient:
 
         url = urljoin(self._http.base_url, endpoint)
 
-        logger.debug(f"Request: {method} {url} | Body: {kwargs.get('json')}")
+        try:
+            sinks = self.reporter.select()
+            if not sinks:
+                return self._send(method, url, (), **kwargs)
+
+            with ExitStack() as stack:
+                recorders = [
+                    stack.enter_context(sink.span(method, url, kwargs.get("json")))
+                    for sink in sinks
+                ]
+                return self._send(method, url, recorders, **kwargs)
+
+        finally:
+            # Even a failed write may have changed server state
+            if self.cache is not None and method != HttpMethod.GET:
+                self.cache.invalidate(url)
+
+    def _cached_get(self, endpoint: str, params: dict[str, Any] | None) -> Response:
+        cache = cast(ResponseCache, self.cache)
+        url = urljoin(self._http.base_url, endpoint)
+        key: CacheKey = (
+            url.rstrip("/"),
+            tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        )
+
+        entry = cache.lookup(key)
+        if entry is not None and entry.fresh:
+            cache.record("hits")
+            logger.debug(f"Cache hit: GET {url}")
+            return entry.response
 
-        with allure.step(f"{method} {url}"):
-            if kwargs.get("json"):
-                allure.attach(
-                    json.dumps(kwargs.get("json"), indent=2),
-                    name="Request Body",
-                    attachment_type=allure.attachment_type.JSON,
-                )
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+        response = self._request(
+            HttpMethod.GET, endpoint, params=params, headers=headers
+        )
 
-            try:
-                response = self._http.request(method=method, url=url, **kwargs)
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            cache.record("revalidations")
+            cache.renew(key)
+            return entry.response
 
-                allure.attach(
-                    f"Status Code: {response.status_code}\n{response.text}",
-                    name="Response Body",
-                    attachment_type=allure.attachment_type.TEXT,
-                )
+        cache.record("misses")
+        if response.status_code == HTTPStatus.OK:
+            cache.store(key, response)
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        recorders: Sequence[ResponseRecorder],
+        **kwargs: Any,
+    ) -> Response:
+        try:
+            response = self._http.request(method=method, url=url, **kwargs)
 
-                logger.debug(
-                    f"Response: {response.status_code} | "
-                    f"Time: {response.elapsed.total_seconds()}s"
-                )
+        except requests.RequestException as e:
+            logger.error(f"Network Error: {e}")
 
-                try:
-                    response.raise_for_status()
+            raise APIClientError(f"Network error during {method} {url}") from e
 
-                except requests.HTTPError as e:
-                    logger.error(f"HTTP Error: {e.response.status_code}")
+        for record in recorders:
+            record(response)
 
-                    raise APIClientError(
-                        message=f"API Error {e.response.status_code}: {e}",
-                        status_code=e.response.status_code,
-                        payload=self._get_error_payload(e.response),
-                    ) from e
+        try:
+            response.raise_for_status()
 
-                return response
+        except requests.HTTPError as e:
+            logger.error(f"HTTP Error: {e.response.status_code}")
 
-            except requests.RequestException as e:
-                logger.error(f"Network Error: {e}")
+            raise APIClientError(
+                message=f"API Error {e.response.status_code}: {e}",
+                status_code=e.response.status_code,
+                payload=self._get_error_payload(e.response),
+            ) from e
 
-                raise APIClientError(f"Network error during {method} {url}") from e
+        return response
 
     def _get_error_payload(self, response: Response) -> dict[str, Any] | None:
         try:
@@ -117,23 +314,14 @@ class BaseAPIClient:
         self,
         payload: BaseModel | dict[str, Any] | None,
     ) -> dict[str, Any] | None:
-        """
-        Normalizes various payload types into JSON-compatible dictionaries.
-        Supports Pydantic models with optional custom 'to_payload' methods.
-        """
-
-        if payload is None:
-            return None
-
-        if isinstance(payload, BaseModel):
-            if hasattr(payload, "to_payload"):
-                return payload.to_payload()  # type: ignore
-
-            return payload.model_dump(by_alias=True, mode="json")
-
-        return payload
+        return prepare_payload(payload)
 
     def get(self, endpoint: str, **kwargs: Any) -> Response:
+        params = kwargs.get("params")
+        if self.cache is not None and kwargs.keys() <= {"params"}:
+            if params is None or isinstance(params, dict):
+                return self._cached_get(endpoint, params)
+
         return self._request(HttpMethod.GET, endpoint, **kwargs)
 
     def post(
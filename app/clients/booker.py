@@ -1,8 +1,16 @@
+from collections.abc import Callable, Generator, Iterable
+from http import HTTPStatus
 from typing import Any
 
 import allure
+from requests import Response
 
+from app.clients.auth import TokenProvider
 from app.clients.base import BaseAPIClient
+from app.clients.bulk import DEFAULT_MAX_WORKERS, BulkResult, fan_out
+from app.clients.decoding import decode_booking_ids
+from app.clients.streaming import CHUNK_SIZE, iter_json_array
+from app.exceptions import APIClientError
 from app.schemas import AuthRequest, AuthResponse, Booking, BookingResponse
 
 
@@ -14,53 +22,138 @@ class BookerClient(BaseAPIClient):
     AUTH_ENDPOINT = "/auth"
     BOOKING_ENDPOINT = "/booking"
 
+    tokens: TokenProvider | None = None
+
     @allure.step("Authentication")
     def create_auth_token(self, username: str, password: str) -> str:
         """Obtains session token for protected endpoints."""
         payload = AuthRequest(username=username, password=password)
         response = self.post(endpoint=self.AUTH_ENDPOINT, payload=payload)
-        return AuthResponse(**response.json()).token
+        return AuthResponse.model_validate_json(response.content).token
+
+    def authenticate(self, username: str, password: str) -> str:
+        """
+        Returns a token shared with other processes through the token cache
+        (CLIENT_TOKEN_CACHE), calling /auth only if none is valid; while a
+        cassette is recorded or replayed, only within this client. From then
+        on, a write rejected with 403 is retried once with a fresh token, if
+        it was sent with a token from here rather than one of the caller's.
+        """
+        self.tokens = TokenProvider(
+            lambda: self.create_auth_token(username, password),
+            key=f"{self._http.base_url}|{username}",
+            ttl=self.config.token_ttl,
+            path=self.config.shared_token_cache,
+        )
+        return self.tokens.get()
+
+    def _authorized(self, token: str, send: Callable[[str], Response]) -> Response:
+        """Sends with `token`, replacing it once if the API rejects it."""
+        try:
+            return send(token)
+
+        except APIClientError as e:
+            if (
+                self.tokens is None
+                or e.status_code != HTTPStatus.FORBIDDEN
+                # Only the tokens handed out here are ours to replace
+                or not self.tokens.issued(token)
+            ):
+                raise
+
+            return send(self.tokens.refresh(rejected=token))
 
     @allure.step("Create Booking")
     def create_booking(self, booking_data: Booking) -> BookingResponse:
         response = self.post(endpoint=self.BOOKING_ENDPOINT, payload=booking_data)
-        return BookingResponse(**response.json())
+        return BookingResponse.model_validate_json(response.content)
 
     @allure.step("Retrieve Booking")
     def get_booking(self, booking_id: int) -> Booking:
         response = self.get(endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}")
-        return Booking(**response.json())
+        return Booking.model_validate_json(response.content)
 
     @allure.step("Update Booking")
     def update_booking(
         self, booking_id: int, booking_data: Booking, token: str
     ) -> Booking:
-        headers = {"Cookie": f"token={token}"}
-        response = self.put(
-            endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
-            payload=booking_data,
-            headers=headers,
+        response = self._authorized(
+            token,
+            lambda token: self.put(
+                endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
+                payload=booking_data,
+                headers={"Cookie": f"token={token}"},
+            ),
         )
-        return Booking(**response.json())
+        return Booking.model_validate_json(response.content)
 
     @allure.step("Partial Update Booking")
     def partial_update_booking(
         self, booking_id: int, payload: dict[str, Any], token: str
     ) -> Booking:
-        headers = {"Cookie": f"token={token}"}
-        response = self.patch(
-            endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
-            payload=payload,
-            headers=headers,
+        response = self._authorized(
+            token,
+            lambda token: self.patch(
+                endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
+                payload=payload,
+                headers={"Cookie": f"token={token}"},
+            ),
         )
-        return Booking(**response.json())
+        return Booking.model_validate_json(response.content)
 
     @allure.step("Delete Booking")
     def delete_booking(self, booking_id: int, token: str) -> None:
-        headers = {"Cookie": f"token={token}"}
-        self.delete(endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}", headers=headers)
+        self._authorized(
+            token,
+            lambda token: self.delete(
+                endpoint=f"{self.BOOKING_ENDPOINT}/{booking_id}",
+                headers={"Cookie": f"token={token}"},
+            ),
+        )
 
     @allure.step("List Bookings")
     def get_booking_ids(self, params: dict[str, Any] | None = None) -> list[int]:
         response = self.get(endpoint=self.BOOKING_ENDPOINT, params=params)
-        return [item["bookingid"] for item in response.json()]
+        return decode_booking_ids(response.content, self.config.validate_listings)
+
+    def iter_booking_ids(
+        self, params: dict[str, Any] | None = None
+    ) -> Generator[int, None, None]:
+        """
+        Streams the IDs of the booking listing as the body arrives, for
+        listings too large for `get_booking_ids`. Closing the generator
+        early drops the rest of the response unread.
+        """
+        with self.get(
+            endpoint=self.BOOKING_ENDPOINT, params=params, stream=True
+        ) as response:
+            for item in iter_json_array(response.iter_content(CHUNK_SIZE)):
+                yield item["bookingid"]
+
+    def create_bookings(
+        self, bookings: Iterable[Booking], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Generator[BulkResult[Booking, BookingResponse], None, None]:
+        """
+        Creates bookings concurrently on up to `max_workers` threads.
+        Yields one result per booking as it completes; see `fan_out`.
+        """
+        return fan_out(self.create_booking, bookings, max_workers)
+
+    def get_bookings(
+        self, booking_ids: Iterable[int], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Generator[BulkResult[int, Booking], None, None]:
+        """Retrieves bookings concurrently, yielding them as they arrive."""
+        return fan_out(self.get_booking, booking_ids, max_workers)
+
+    def delete_bookings(
+        self,
+        booking_ids: Iterable[int],
+        token: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Generator[BulkResult[int, None], None, None]:
+        """Deletes bookings concurrently, yielding each outcome as it completes."""
+        return fan_out(
+            lambda booking_id: self.delete_booking(booking_id, token),
+            booking_ids,
+            max_workers,
+        )
@@ -0,0 +1,74 @@
+"""
+Bounded fan-out of client calls over a thread pool, behind the batch
+methods of BookerClient.
+
+Results stream back in completion order, one per input item. A failing
+item carries its exception instead of aborting the rest of the batch.
+"""
+
+import itertools
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class BulkResult(Generic[K, V]):
+    """Outcome of one item of a batch call; `index` is its input position."""
+
+    index: int
+    item: K
+    value: V | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fan_out(
+    call: Callable[[K], V],
+    items: Iterable[K],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Generator[BulkResult[K, V], None, None]:
+    """
+    Runs `call` for every item on at most `max_workers` threads and yields
+    each result as soon as it completes. Items are drawn from `items` only
+    as workers free up, so huge or lazy inputs are never queued up front.
+    Nothing runs until iteration starts; closing the iterator early leaves
+    the remaining items untouched.
+    """
+    source = enumerate(items)
+    pending: dict[Future[V], tuple[int, K]] = {}
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="bulk") as pool:
+
+        def submit(batch: Iterable[tuple[int, K]]) -> None:
+            for index, item in batch:
+                pending[pool.submit(call, item)] = (index, item)
+
+        try:
+            submit(itertools.islice(source, max_workers))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                finished = [(future, *pending.pop(future)) for future in done]
+                # Refill before yielding, so a slow consumer keeps workers busy
+                submit(itertools.islice(source, len(finished)))
+
+                for future, index, item in finished:
+                    error = future.exception()
+                    if error is None:
+                        yield BulkResult(index, item, value=future.result())
+                    elif isinstance(error, Exception):
+                        yield BulkResult(index, item, error=error)
+                    else:
+                        raise error
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,105 @@
+"""
+Opt-in response cache for idempotent GETs of BaseAPIClient.
+
+Entries are bounded in number (least recently used are evicted first) and
+in age. A stale entry that carries an ETag is revalidated with
+If-None-Match rather than dropped: a 304 answer renews it without a body.
+Any write through the client drops the entries of the written URL and of
+the collections above it, e.g. PUT /booking/5 drops /booking/5 and /booking.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+from requests import Response
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+CacheOutcome = Literal["hits", "revalidations", "misses"]
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """
+    Outcome counters. A hit is served from memory; a revalidation costs a
+    bodiless round trip; a miss costs a full request.
+    """
+
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered without downloading the body again."""
+        total = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    response: Response
+    etag: str | None
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """Thread-safe LRU of successful GET responses with a time to live."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: CacheKey) -> CacheEntry | None:
+        """The entry for `key`, fresh or stale, marked as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: CacheKey, response: Response) -> None:
+        entry = CacheEntry(
+            response, response.headers.get("ETag"), time.monotonic() + self.ttl
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def renew(self, key: CacheKey) -> None:
+        """Restarts the time to live of an entry the server confirmed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self, url: str) -> None:
+        """Drops the entries of `url` and of the collections above it."""
+        path = url.partition("?")[0].rstrip("/")
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if path == key[0] or path.startswith(f"{key[0]}/")
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def record(self, outcome: CacheOutcome) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def __len__(self) -> int:
+        return len(self._entries)
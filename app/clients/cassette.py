@@ -0,0 +1,369 @@
+"""
+Record/replay transport, so that deterministic suites run offline and in
+seconds instead of against the live target.
+
+In `record` mode every request still goes to the target, and the exchange
+is appended to a cassette, written when the client is closed. Recorders
+of one cassette in several processes, such as the shards of a run, merge
+their interactions into it; delete the file to record it afresh. In `replay`
+mode requests never leave the process: each is answered with the next
+recorded response of the same method, path (query sorted) and normalized
+JSON body (keys sorted). `passthrough` leaves the transport alone.
+
+A cassette is a JSON file:
+
+    {
+      "version": 1,
+      "interactions": [
+        {
+          "request": {"method": "POST", "path": "/booking", "body": "{...}"},
+          "response": {"status": 200, "reason": "OK", "headers": {...},
+                       "body": "{\"bookingid\":{{bookingid#1}}, ...}"}
+        }
+      ]
+    }
+
+Values the target makes up (DYNAMIC_KEYS of a JSON response, e.g. booking
+IDs and tokens) are recorded as placeholders such as {{bookingid#1}}, and so
+are the path segments and request body fields that reuse them later. On
+replay each placeholder stands for a synthetic value, its number, so the
+cassette does not depend on the IDs of the recording run and holds no
+tokens. REDACTED_KEYS of request bodies (passwords) are never written.
+"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from loguru import logger
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.exceptions import CassetteMissError
+
+CassetteMode = Literal["passthrough", "record", "replay"]
+
+CASSETTE_VERSION = 1
+DYNAMIC_KEYS = frozenset({"bookingid", "token"})
+REDACTED_KEYS = frozenset({"password"})
+# Response headers worth replaying; dates, lengths and the like are not
+RECORDED_HEADERS = ("Content-Type", "ETag")
+
+_REDACTED = "<redacted>"
+_PLACEHOLDER = re.compile(r"\{\{(\w+)#(\d+)\}\}")
+
+
+MatchKey = tuple[str, str, str]
+Binding = Literal["create", "lookup", "none"]
+
+
+class _Bindings:
+    """Placeholders and the values they stand for."""
+
+    def __init__(self) -> None:
+        self._placeholders: dict[str, str] = {}
+        # Placeholders of numbers, written unquoted into JSON bodies
+        self._numeric: set[str] = set()
+
+    def bind(self, name: str, value: int | str) -> str:
+        """The placeholder of `value`, numbered on first sight."""
+        text = str(value)
+        if text not in self._placeholders:
+            placeholder = f"{{{{{name}#{len(self._placeholders) + 1}}}}}"
+            self._placeholders[text] = placeholder
+            if isinstance(value, int):
+                self._numeric.add(placeholder)
+        return self._placeholders[text]
+
+    def substitute(self, match: re.Match[str]) -> str:
+        """The synthetic value of a replayed placeholder: its number."""
+        self._placeholders.setdefault(match[2], match[0])
+        return match[2]
+
+    def template_path(self, path: str, binding: Binding) -> str:
+        if binding == "none":
+            return path
+        return "/".join(self._placeholders.get(part, part) for part in path.split("/"))
+
+    def template_json(self, data: Any, binding: Binding) -> Any:
+        """
+        `data` with the values of DYNAMIC_KEYS replaced by placeholders and
+        those of REDACTED_KEYS blanked. Only responses `create` placeholders:
+        requests can merely reuse values the target handed out.
+        """
+        if isinstance(data, list):
+            return [self.template_json(item, binding) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        templated: dict[str, Any] = {}
+        for key, value in data.items():
+            if key in REDACTED_KEYS:
+                templated[key] = _REDACTED
+            elif key in DYNAMIC_KEYS and isinstance(value, int | str):
+                if binding == "create":
+                    templated[key] = self.bind(key, value)
+                elif binding == "lookup":
+                    templated[key] = self._placeholders.get(str(value), value)
+                else:
+                    templated[key] = value
+            else:
+                templated[key] = self.template_json(value, binding)
+        return templated
+
+    def dump_response(self, data: Any) -> str:
+        text = json.dumps(self.template_json(data, "create"))
+        return _QUOTED_PLACEHOLDER.sub(
+            lambda m: m[1] if m[1] in self._numeric else m[0], text
+        )
+
+
+_QUOTED_PLACEHOLDER = re.compile(r'"(\{\{\w+#\d+\}\})"')
+
+
+def _load_json(text: str) -> Any:
+    """The decoded body, or None when it is not JSON."""
+    try:
+        return json.loads(text) if text else None
+    except ValueError:
+        return None
+
+
+class _Request:
+    """The parts of a request that identify its recorded response."""
+
+    def __init__(self, request: PreparedRequest) -> None:
+        self.method = (request.method or "GET").upper()
+
+        parts = urlsplit(request.url or "")
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        self.path = f"{parts.path}?{query}" if query else parts.path
+
+        body = request.body
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        self.body = body or ""
+        self.json = _load_json(self.body)
+
+    def key(self, bindings: _Bindings, binding: Binding) -> MatchKey:
+        body = self.body
+        if self.json is not None:
+            body = json.dumps(
+                bindings.template_json(self.json, binding),
+                sort_keys=True,
+                separators=(",", ":"),
+            )
+        return self.method, bindings.template_path(self.path, binding), body
+
+
+class Cassette:
+    """
+    Recorded interactions of one file, shared by every client in the process
+    that uses it. Thread-safe.
+    """
+
+    def __init__(self, path: Path, mode: CassetteMode) -> None:
+        self.path = path
+        self.mode = mode
+        self.interactions: list[dict[str, Any]] = []
+        self._bindings = _Bindings()
+        # Interactions already written, and the numbers their placeholders got
+        self._saved = 0
+        self._numbers: dict[str, int] = {}
+        self._unplayed: defaultdict[MatchKey, deque[dict[str, Any]]] = defaultdict(
+            deque
+        )
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise CassetteMissError(
+                f"Cassette {self.path} not found; record it with "
+                "CLIENT_CASSETTE_MODE=record against the live target"
+            ) from None
+        if data.get("version") != CASSETTE_VERSION:
+            raise CassetteMissError(
+                f"Cassette {self.path} has version {data.get('version')}, "
+                f"expected {CASSETTE_VERSION}; record it again"
+            )
+
+        self.interactions = data["interactions"]
+        for interaction in self.interactions:
+            request = interaction["request"]
+            key = (request["method"], request["path"], request["body"])
+            self._unplayed[key].append(interaction["response"])
+        logger.info(f"Replaying {len(self.interactions)} interactions from {self.path}")
+
+    def play(self, request: PreparedRequest) -> Response:
+        """
+        The next recorded response to `request`. The request is matched with
+        the synthetic values it carries turned back into placeholders, or
+        verbatim, for literals that merely look like a synthetic value.
+        """
+        incoming = _Request(request)
+        with self._lock:
+            keys = [
+                incoming.key(self._bindings, "lookup"),
+                incoming.key(self._bindings, "none"),
+            ]
+            queue = next((self._unplayed[k] for k in keys if self._unplayed[k]), None)
+            if queue is None:
+                method, path, body = keys[0]
+                raise CassetteMissError(
+                    f"No recorded response left for {method} {path} "
+                    f"(body: {body or 'none'}) in {self.path}; record it again"
+                )
+            recorded = queue.popleft()
+            body = _PLACEHOLDER.sub(self._bindings.substitute, recorded["body"])
+
+        response = Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = "utf-8"
+        response._content = body.encode("utf-8")
+        response.url = request.url or ""
+        response.request = request
+        return response
+
+    def record(self, request: PreparedRequest, response: Response) -> None:
+        outgoing = _Request(request)
+        # Reads a streamed body in full; recording trades memory for fidelity
+        body = response.text
+        data = _load_json(body)
+
+        with self._lock:
+            method, path, request_body = outgoing.key(self._bindings, "lookup")
+            self.interactions.append(
+                {
+                    "request": {"method": method, "path": path, "body": request_body},
+                    "response": {
+                        "status": response.status_code,
+                        "reason": response.reason,
+                        "headers": {
+                            name: response.headers[name]
+                            for name in RECORDED_HEADERS
+                            if name in response.headers
+                        },
+                        "body": body
+                        if data is None
+                        else self._bindings.dump_response(data),
+                    },
+                }
+            )
+
+    def save(self) -> None:
+        """
+        Appends the interactions recorded since the last save to the file; a
+        no-op unless recording. The file is read and written under a file
+        lock, and placeholders are renumbered past those already in it, so
+        that concurrent recorders do not overwrite or alias each other.
+        """
+        if self.mode != "record":
+            return
+        with self._lock:
+            new = self.interactions[self._saved :]
+            if not new:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix(".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    saved = _read_interactions(self.path)
+                    taken = [
+                        int(m[2]) for m in _PLACEHOLDER.finditer(json.dumps(saved))
+                    ]
+                    last = max(taken, default=0)
+
+                    def renumber(match: re.Match[str]) -> str:
+                        nonlocal last
+                        if match[2] not in self._numbers:
+                            last += 1
+                            self._numbers[match[2]] = last
+                        return f"{{{{{match[1]}#{self._numbers[match[2]]}}}}}"
+
+                    merged = json.loads(_PLACEHOLDER.sub(renumber, json.dumps(new)))
+                    data = {
+                        "version": CASSETTE_VERSION,
+                        "interactions": saved + merged,
+                    }
+                    tmp = self.path.with_suffix(".tmp")
+                    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+                    os.replace(tmp, self.path)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+            self._saved = len(self.interactions)
+        logger.info(
+            f"Recorded {len(new)} interactions to {self.path}, "
+            f"{len(saved) + len(new)} in all"
+        )
+
+
+def _read_interactions(path: Path) -> list[dict[str, Any]]:
+    """Interactions already in the cassette; none if missing or outdated."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict) or data.get("version") != CASSETTE_VERSION:
+        return []
+    return list(data.get("interactions", []))
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter that records the exchanges of `adapter` into
+    `cassette`, or replays them without it, depending on the cassette mode.
+    """
+
+    def __init__(self, adapter: BaseAdapter, cassette: Cassette) -> None:
+        super().__init__()
+        self.adapter = adapter
+        self.cassette = cassette
+
+    def send(  # noqa: PLR0913
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: None | float | tuple[float, float] | tuple[float, None] = None,
+        verify: bool | str = True,
+        cert: None | bytes | str | tuple[bytes | str, bytes | str] = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        if self.cassette.mode == "replay":
+            return self.cassette.play(request)
+
+        response = self.adapter.send(request, stream, timeout, verify, cert, proxies)
+        if self.cassette.mode == "record":
+            self.cassette.record(request, response)
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+        self.cassette.save()
+
+
+_cassettes: dict[tuple[Path, CassetteMode], Cassette] = {}
+_registry_lock = threading.Lock()
+
+
+def shared_cassette(path: Path, mode: CassetteMode) -> Cassette:
+    """The process-wide cassette of `path` in `mode`, loaded once for replay."""
+    key = (path.resolve(), mode)
+    with _registry_lock:
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(*key)
+        return _cassettes[key]
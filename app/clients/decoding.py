@@ -0,0 +1,23 @@
+"""
+Response bodies straight to Python objects.
+
+Models are validated from the raw bytes with `model_validate_json`, which
+parses in pydantic-core instead of building an intermediate dict with
+`response.json()` first; it beats even unvalidated construction in Python.
+Listings use module-level TypeAdapters, compiled once. With
+CLIENT_VALIDATE_LISTINGS off, trusted hot paths skip validating listings
+and only parse them, with pydantic-core's JSON parser.
+"""
+
+from pydantic_core import from_json
+
+from app.schemas import BOOKING_IDS_ADAPTER
+
+
+def decode_booking_ids(content: bytes, validate: bool = True) -> list[int]:
+    """IDs of a /booking listing."""
+    if validate:
+        entries = BOOKING_IDS_ADAPTER.validate_json(content)
+    else:
+        entries = from_json(content)
+    return [entry["bookingid"] for entry in entries]
@@ -0,0 +1,102 @@
+"""
+Request reporting pipeline of BaseAPIClient.
+
+Every request can be reported to a set of sinks (debug logging and Allure
+steps by default). CLIENT_REPORTING picks how many requests are reported:
+all of them (`full`), one in CLIENT_REPORTING_SAMPLE_EVERY (`sampled`), or
+none (`off`). Requests that are not reported skip the sinks entirely, so no
+body is serialized and no message is formatted for them. Failures are
+logged by the client in every mode.
+"""
+
+import itertools
+import json
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any, Literal, Protocol
+
+import allure
+from loguru import logger
+from requests import Response
+
+ReportingMode = Literal["full", "sampled", "off"]
+
+ResponseRecorder = Callable[[Response], None]
+
+
+class RequestSink(Protocol):
+    """Consumer of reported requests, e.g. a log or a test report."""
+
+    def span(
+        self, method: str, url: str, body: Any
+    ) -> AbstractContextManager[ResponseRecorder]:
+        """
+        Wraps one request. Entered before it is sent; the yielded recorder
+        receives the response, and an error propagates through the context.
+        """
+        ...
+
+
+class LogSink:
+    """DEBUG log lines, formatted by loguru only if a handler accepts them."""
+
+    @contextmanager
+    def span(self, method: str, url: str, body: Any) -> Iterator[ResponseRecorder]:
+        logger.debug("Request: {} {} | Body: {}", method, url, body)
+        yield self._record
+
+    def _record(self, response: Response) -> None:
+        logger.debug(
+            "Response: {} | Time: {}s",
+            response.status_code,
+            response.elapsed.total_seconds(),
+        )
+
+
+class AllureSink:
+    """One Allure step per request, with request and response attachments."""
+
+    @contextmanager
+    def span(self, method: str, url: str, body: Any) -> Iterator[ResponseRecorder]:
+        with allure.step(f"{method} {url}"):
+            if body:
+                allure.attach(
+                    json.dumps(body, indent=2),
+                    name="Request Body",
+                    attachment_type=allure.attachment_type.JSON,
+                )
+
+            yield self._record
+
+    def _record(self, response: Response) -> None:
+        # A streamed body belongs to the caller; reading it here would load it
+        streamed = not getattr(response, "_content_consumed", True)
+        body = "<streamed>" if streamed else response.text
+        allure.attach(
+            f"Status Code: {response.status_code}\n{body}",
+            name="Response Body",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
+class RequestReporter:
+    """Picks the requests to report and hands them to the sinks."""
+
+    def __init__(
+        self,
+        mode: ReportingMode = "full",
+        sample_every: int = 1,
+        sinks: Sequence[RequestSink] | None = None,
+    ) -> None:
+        self.mode = mode
+        self.sample_every = sample_every
+        self.sinks = tuple(sinks if sinks is not None else (LogSink(), AllureSink()))
+        self._requests = itertools.count()
+
+    def select(self) -> tuple[RequestSink, ...]:
+        """The sinks the next request is reported to; empty if it is not."""
+        if self.mode == "full":
+            return self.sinks
+        if self.mode == "sampled" and next(self._requests) % self.sample_every == 0:
+            return self.sinks
+        return ()
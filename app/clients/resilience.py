@@ -0,0 +1,229 @@
+"""
+Failure containment for the synchronous transport: a circuit breaker and a
+retry budget per target, shared by every HTTPClient of that target in the
+process.
+
+The breaker counts consecutive failed requests (connection errors,
+timeouts and 5xx answers after retries). Past the threshold it opens and
+fails requests at once with CircuitOpenError; after `reset_timeout` one
+probe request is let through (half-open), and its outcome closes or
+reopens the circuit.
+
+The budget caps retries to a share of the traffic: every request deposits
+`ratio` of a retry, every retry withdraws a whole one, and `reserve`
+retries can be spent in a burst. A failing target thus draws at most
+`ratio` extra requests per request instead of RETRY_TOTAL.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from types import TracebackType
+from typing import Any, Self
+from urllib.parse import urlsplit
+
+from loguru import logger
+from urllib3.connectionpool import ConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
+
+from app.exceptions import CircuitOpenError
+from config.settings import ClientSettings
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open breaker for one target."""
+
+    def __init__(
+        self,
+        target: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.target = target
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == CircuitState.OPEN and self._cooled_down():
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def before_request(self) -> None:
+        """
+        Admits a request, or raises CircuitOpenError while the circuit is
+        open and while a half-open probe is already in flight.
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return
+            if self._state == CircuitState.OPEN and self._cooled_down():
+                self._state = CircuitState.HALF_OPEN
+            if self._state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+
+            retry_in = self._opened_at + self.reset_timeout - self._clock()
+            raise CircuitOpenError(
+                f"Circuit open for {self.target} after {self._failures} "
+                f"consecutive failures; next probe in {max(retry_in, 0.0):.1f}s"
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"Circuit closed for {self.target}")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        Settles a request that says nothing about the target, e.g. one
+        answered locally: counted neither way, but no longer a probe.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            tripped = self._failures >= self.failure_threshold
+            if self._state == CircuitState.HALF_OPEN or tripped:
+                if self._state != CircuitState.OPEN:
+                    logger.warning(
+                        f"Circuit opened for {self.target} after "
+                        f"{self._failures} consecutive failures"
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+    @property
+    def is_open(self) -> bool:
+        """Open and not yet due for a probe; retrying now is pointless."""
+        return self.state == CircuitState.OPEN
+
+    def _cooled_down(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+
+class RetryBudget:
+    """Thread-safe allowance of retries, earned as a share of requests."""
+
+    def __init__(self, ratio: float, reserve: int) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credits one request."""
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Takes one retry if the budget allows it."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class BudgetedRetry(Retry):
+    """
+    urllib3 Retry that also stops retrying once the retry budget is spent or
+    the circuit has opened, ending the request with its last outcome.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        budget: RetryBudget | None = None,
+        breaker: CircuitBreaker | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+        self.breaker = breaker
+
+    def new(self, **kwargs: Any) -> Self:
+        retry = super().new(**kwargs)
+        retry.budget = self.budget
+        retry.breaker = self.breaker
+        return retry
+
+    def increment(
+        self,
+        method: str | None = None,
+        url: str | None = None,
+        response: BaseHTTPResponse | None = None,
+        error: Exception | None = None,
+        _pool: ConnectionPool | None = None,
+        _stacktrace: TracebackType | None = None,
+    ) -> Self:
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if response is not None and response.get_redirect_location():
+            return retry
+
+        if self.breaker is not None and self.breaker.is_open:
+            cause = "circuit open"
+        elif self.budget is not None and not self.budget.withdraw():
+            cause = "retry budget exhausted"
+        else:
+            return retry
+
+        # Ends the request as if retries had run out: the last response is
+        # returned, or the last error raised
+        reason = error or ResponseError(cause)
+        raise MaxRetryError(_pool, url or "", reason) from reason  # type: ignore[arg-type]
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_budgets: dict[str, RetryBudget] = {}
+_registry_lock = threading.Lock()
+
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def shared_breaker(base_url: str, config: ClientSettings) -> CircuitBreaker:
+    """The process-wide breaker of the target serving `base_url`."""
+    origin = _origin(base_url)
+    with _registry_lock:
+        if origin not in _breakers:
+            _breakers[origin] = CircuitBreaker(
+                origin, config.breaker_threshold, config.breaker_reset_timeout
+            )
+        return _breakers[origin]
+
+
+def shared_budget(base_url: str, config: ClientSettings) -> RetryBudget:
+    """The process-wide retry budget of the target serving `base_url`."""
+    origin = _origin(base_url)
+    with _registry_lock:
+        if origin not in _budgets:
+            _budgets[origin] = RetryBudget(
+                config.retry_budget_ratio, config.retry_budget_reserve
+            )
+        return _budgets[origin]
@@ -0,0 +1,92 @@
+"""
+Incremental parsing of JSON array responses, for listings too large to load
+with `response.json()`.
+
+Elements are decoded one at a time from the body chunks as they arrive, so
+memory holds one chunk and one element rather than the whole body and the
+whole decoded list.
+"""
+
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_TAIL = "0123456789.eE+-"
+
+
+class _Buffer:
+    """Decoded text not yet parsed, refilled from the chunks on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Appends the next chunk; False once the body is exhausted."""
+        if self.exhausted:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            self.text = self.text[self.pos :] + self._decoder.decode(b"", final=True)
+        else:
+            self.text = self.text[self.pos :] + self._decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next character after whitespace; empty at the end of the body."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return self.text[self.pos : self.pos + 1]
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yields the elements of the JSON array spread over `chunks`.
+    Raises ValueError if the body is not a well-formed array.
+    """
+    buffer = _Buffer(chunks)
+    decoder = json.JSONDecoder()
+
+    if buffer.peek() != "[":
+        raise ValueError("Expected a JSON array")
+    buffer.pos += 1
+    if buffer.peek() == "]":
+        return
+
+    while True:
+        buffer.peek()
+        try:
+            element, end = decoder.raw_decode(buffer.text, buffer.pos)
+            # A number cut by a chunk boundary ("-2." of "-2.5") still parses
+            complete = buffer.exhausted or (
+                end < len(buffer.text) and buffer.text[end] not in _NUMBER_TAIL
+            )
+        except json.JSONDecodeError:
+            complete = False
+            if buffer.exhausted:
+                raise
+
+        if not complete:
+            buffer.fill()
+            continue
+
+        buffer.pos = end
+        yield element
+
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
@@ -0,0 +1,170 @@
+"""
+Per-request timing breakdown of the synchronous transport.
+
+TimedHTTPAdapter swaps urllib3's connections for subclasses that clock the
+phases of every request into the RequestTiming of the calling thread:
+
+- dns: host name resolution (new connections only)
+- connect: TCP handshake (new connections only)
+- tls: TLS handshake (new HTTPS connections only)
+- ttfb: from sending the request to receiving the response headers
+- download: from the headers to the end of the body
+
+Retried attempts add up. A streamed body is read by the caller after the
+request returns, so its download phase covers the headers only.
+"""
+
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ("dns", "connect", "tls", "ttfb", "download")
+# Phases that only new connections go through
+CONNECTION_PHASES = ("dns", "connect", "tls")
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url: str) -> str:
+    """Path of `url` with numeric IDs generalized: /booking/12 -> /booking/{id}."""
+    return _ID_SEGMENT.sub("/{id}", urlsplit(url).path) or "/"
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Seconds one request spent per phase."""
+
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    # perf_counter() of the last response headers, when the body starts
+    headers_at: float | None = None
+
+    def phases(self) -> dict[str, float]:
+        return {phase: getattr(self, phase) for phase in PHASES}
+
+
+_local = threading.local()
+
+
+def _current() -> RequestTiming | None:
+    timing: RequestTiming | None = getattr(_local, "timing", None)
+    return timing
+
+
+@contextmanager
+def capture() -> Iterator[RequestTiming]:
+    """Collects the phases of the requests sent by this thread in the block."""
+    timing = RequestTiming()
+    _local.timing = timing
+    try:
+        yield timing
+    finally:
+        _local.timing = None
+
+
+class TimedHTTPConnection(HTTPConnection):
+    # perf_counter() of the request being sent, while awaiting its response
+    _sent_at: float | None = None
+
+    def _new_conn(self) -> socket.socket:
+        timing = _current()
+        if timing is None:
+            return super()._new_conn()
+
+        # Resolved here, timed, and handed to urllib3 address by address, so
+        # that the name is looked up once and every address is still tried
+        started = time.perf_counter()
+        try:
+            addresses = [
+                str(info[4][0])
+                for info in socket.getaddrinfo(
+                    self._dns_host.strip("[]"),
+                    self.port,
+                    allowed_gai_family(),
+                    socket.SOCK_STREAM,
+                )
+            ]
+        except OSError:
+            # Let urllib3 resolve again and raise its own NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        timing.dns += resolved - started
+
+        host = self._dns_host
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+        timing.connect += time.perf_counter() - resolved
+        return sock
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        if _current() is not None:
+            self._sent_at = time.perf_counter()
+        super().request(*args, **kwargs)
+
+    def getresponse(self) -> BaseHTTPResponse:  # type: ignore[override]
+        response = super().getresponse()
+        timing = _current()
+        if timing is not None and self._sent_at is not None:
+            timing.headers_at = time.perf_counter()
+            timing.ttfb += timing.headers_at - self._sent_at
+            self._sent_at = None
+        return response
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    def connect(self) -> None:
+        timing = _current()
+        if timing is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        before = timing.dns + timing.connect
+        super().connect()
+        # Whatever connect() spent beyond resolving and the TCP handshake
+        elapsed = time.perf_counter() - started
+        timing.tls += max(elapsed - (timing.dns + timing.connect - before), 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record into `capture()` blocks."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
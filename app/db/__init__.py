@@ -1,5 +1,37 @@
 from app.db.base import Base
-from app.db.models import TestRun
-from app.db.session import SessionLocal, engine, get_db
+from app.db.models import (
+    QueueWorker,
+    Run,
+    RunAttempt,
+    RunJob,
+    RunRequestTiming,
+    TestDailyStats,
+    TestRun,
+)
+from app.db.results import ResultWriter
+from app.db.session import (
+    AsyncDatabase,
+    SessionLocal,
+    async_db,
+    engine,
+    get_async_db,
+    get_db,
+)
 
-__all__ = ["Base", "TestRun", "SessionLocal", "engine", "get_db"]
+__all__ = [
+    "Base",
+    "QueueWorker",
+    "Run",
+    "RunAttempt",
+    "RunJob",
+    "RunRequestTiming",
+    "ResultWriter",
+    "TestDailyStats",
+    "TestRun",
+    "SessionLocal",
+    "AsyncDatabase",
+    "engine",
+    "async_db",
+    "get_db",
+    "get_async_db",
+]
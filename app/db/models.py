@@ -1,7 +1,16 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    ARRAY,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
@@ -9,18 +18,217 @@ from app.db.base import Base
 class TestRun(Base):
     """
     Stores execution results for analytics and history tracking.
+
+    Range-partitioned by month on created_at, which is therefore part of the
+    primary key; app.db.partitions creates upcoming partitions and drops
+    expired ones. run_id is set for results of orchestrated runs.
     """
 
     __tablename__ = "test_runs"
     __test__ = False
+    __table_args__ = (
+        Index("ix_test_runs_test_name_created_at", "test_name", "created_at"),
+        Index("ix_test_runs_status_created_at", "status", "created_at"),
+        Index("ix_test_runs_run_id_status", "run_id", "status"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    test_name: Mapped[str] = mapped_column(index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    run_id: Mapped[int | None] = mapped_column(
+        ForeignKey("runs.id", ondelete="SET NULL")
+    )
+    test_name: Mapped[str] = mapped_column()
     status: Mapped[str] = mapped_column()
     duration: Mapped[float] = mapped_column()
     created_at: Mapped[datetime] = mapped_column(
-        server_default=func.now(), nullable=True
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
 
     def __repr__(self) -> str:
         return f"<TestRun(test='{self.test_name}', status='{self.status}')>"
+
+
+class TestDailyStats(Base):
+    """
+    Rollup of one test's results of one day (UTC) in test_runs, kept current
+    by app.db.rollups. Only PASSED and FAILED results count as executions.
+    A flip is an execution whose outcome differs from the test's previous
+    one. Durations are counts per TEST_DURATION_BUCKETS bucket, which add up
+    across days into percentiles of any window.
+    """
+
+    __tablename__ = "test_daily_stats"
+    __test__ = False
+    __table_args__ = (Index("ix_test_daily_stats_day", "day"),)
+
+    test_name: Mapped[str] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    executions: Mapped[int] = mapped_column()
+    passed: Mapped[int] = mapped_column()
+    flips: Mapped[int] = mapped_column()
+    last_status: Mapped[str] = mapped_column()
+    duration_sum: Mapped[float] = mapped_column()
+    duration_buckets: Mapped[list[int]] = mapped_column(ARRAY(Integer))
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<TestDailyStats(test='{self.test_name}', day={self.day})>"
+
+
+class Run(Base):
+    """
+    One orchestrated pytest execution requested through the API.
+    """
+
+    __tablename__ = "runs"
+    __table_args__ = (
+        Index("ix_runs_status_created_at", "status", "created_at"),
+        Index("ix_runs_test_suite_created_at", "test_suite", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    test_suite: Mapped[str] = mapped_column()
+    browser: Mapped[str] = mapped_column()
+    headless: Mapped[bool] = mapped_column()
+    priority: Mapped[str] = mapped_column()
+    shards: Mapped[int] = mapped_column(server_default="1")
+    retries: Mapped[int] = mapped_column(server_default="1")
+    timeout_seconds: Mapped[int | None] = mapped_column()
+    submitter: Mapped[str | None] = mapped_column()
+    status: Mapped[str] = mapped_column()
+    exit_code: Mapped[int | None] = mapped_column()
+    total_tests: Mapped[int | None] = mapped_column()
+    failed_tests: Mapped[int | None] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    attempts: Mapped[list["RunAttempt"]] = relationship(
+        back_populates="run",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="RunAttempt.attempt",
+        lazy="selectin",
+    )
+    request_timings: Mapped[list["RunRequestTiming"]] = relationship(
+        back_populates="run",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="(RunRequestTiming.endpoint, RunRequestTiming.method)",
+    )
+
+    def __repr__(self) -> str:
+        return f"<Run(id={self.id}, suite='{self.test_suite}', status='{self.status}')>"
+
+
+class RunAttempt(Base):
+    """
+    One pytest pass within a run: the initial execution or a failed-only rerun.
+    """
+
+    __tablename__ = "run_attempts"
+    __table_args__ = (UniqueConstraint("run_id", "attempt"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("runs.id", ondelete="CASCADE"))
+    attempt: Mapped[int] = mapped_column()
+    exit_code: Mapped[int | None] = mapped_column()
+    total_tests: Mapped[int] = mapped_column()
+    failed_tests: Mapped[int] = mapped_column()
+    duration: Mapped[float] = mapped_column()
+
+    run: Mapped[Run] = relationship(back_populates="attempts")
+
+    def __repr__(self) -> str:
+        return f"<RunAttempt(run={self.run_id}, attempt={self.attempt})>"
+
+
+class RunRequestTiming(Base):
+    """
+    Timing percentiles of a run's API requests in one phase (DNS, connect,
+    TLS, time to first byte, download) for one method and endpoint template.
+    """
+
+    __tablename__ = "run_request_timings"
+    __table_args__ = (UniqueConstraint("run_id", "method", "endpoint", "phase"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("runs.id", ondelete="CASCADE"))
+    method: Mapped[str] = mapped_column()
+    endpoint: Mapped[str] = mapped_column()
+    phase: Mapped[str] = mapped_column()
+    count: Mapped[int] = mapped_column()
+    p50: Mapped[float] = mapped_column()
+    p95: Mapped[float] = mapped_column()
+    p99: Mapped[float] = mapped_column()
+
+    run: Mapped[Run] = relationship(back_populates="request_timings")
+
+    def __repr__(self) -> str:
+        return (
+            f"<RunRequestTiming(run={self.run_id}, "
+            f"'{self.method} {self.endpoint}', phase='{self.phase}')>"
+        )
+
+
+class RunJob(Base):
+    """
+    Entry of the distributed run queue (RUNNER_QUEUE_BACKEND=postgres).
+    Unclaimed while worker_id is NULL; a claiming worker keeps heartbeat_at
+    fresh until the run finishes and the entry is deleted.
+    """
+
+    __tablename__ = "run_jobs"
+    __table_args__ = (
+        Index(
+            "ix_run_jobs_claimable",
+            "lane",
+            "id",
+            postgresql_where=text("worker_id IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    run_id: Mapped[int] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), unique=True
+    )
+    lane: Mapped[int] = mapped_column()
+    worker_id: Mapped[str | None] = mapped_column(index=True)
+    deliveries: Mapped[int] = mapped_column(server_default="0")
+    cancel_requested: Mapped[bool] = mapped_column(server_default=text("false"))
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    run: Mapped[Run] = relationship()
+
+    def __repr__(self) -> str:
+        return f"<RunJob(run={self.run_id}, worker='{self.worker_id}')>"
+
+
+class QueueWorker(Base):
+    """
+    A live `python -m app.worker` node, registered while it heartbeats.
+    """
+
+    __tablename__ = "queue_workers"
+
+    id: Mapped[str] = mapped_column(primary_key=True)
+    hostname: Mapped[str] = mapped_column()
+    pid: Mapped[int] = mapped_column()
+    slots: Mapped[int] = mapped_column()
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<QueueWorker(id='{self.id}', slots={self.slots})>"
@@ -0,0 +1,150 @@
+"""
+Monthly partitions of test_runs and their retention, run as
+`python -m app.db.partitions` (e.g. daily from cron) and once on API startup.
+
+test_runs is range-partitioned on created_at, one partition per calendar
+month named test_runs_yYYYYmMM, plus test_runs_default for rows no monthly
+partition covers. Partitions are created RESULTS_PARTITIONS_AHEAD months
+before rows arrive. Months older than RESULTS_RETENTION_MONTHS are dropped
+whole: a DROP TABLE frees their space at once, where a DELETE would write
+every row to the WAL and leave the table to vacuum.
+"""
+
+import re
+from datetime import date
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.metrics import DB_WRITE_LATENCY, timed
+from config.logger import configure_logging
+from config.settings import ResultsSettings, settings
+
+PARENT = "test_runs"
+DEFAULT_PARTITION = f"{PARENT}_default"
+COLUMNS = "id, run_id, test_name, status, duration, created_at"
+
+# Serializes maintenance across the API and cron; any constant key will do
+_LOCK_KEY = 0x7465737472756E73
+_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """First day of the month of `day`, moved by `offset` months."""
+    months = day.year * 12 + day.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def monthly_partitions(db: Session) -> dict[date, str]:
+    """Monthly partitions of test_runs by their first day."""
+    names = db.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    )
+    partitions = {}
+    for name in names:
+        if match := _NAME.match(name):
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def _create_partition(db: Session, month: date) -> str:
+    name = partition_name(month)
+    end = month_start(month, 1)
+    bounds = {"start": month, "end": end}
+    # DDL takes no bind parameters; ISO dates are safe to inline
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{month}') TO ('{end}')"
+    )
+    in_range = "created_at >= :start AND created_at < :end"
+
+    stranded = db.scalar(
+        text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+    )
+    if not stranded:
+        db.execute(create)
+        return name
+
+    # PostgreSQL refuses a partition for rows the default one holds; they
+    # are moved over while the default partition is detached
+    logger.warning(
+        f"Moving {stranded} rows of {month:%Y-%m} out of {DEFAULT_PARTITION}"
+    )
+    db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.execute(create)
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} "
+            f"RETURNING {COLUMNS}) "
+            f"INSERT INTO {PARENT} ({COLUMNS}) SELECT {COLUMNS} FROM moved"
+        ),
+        bounds,
+    )
+    db.execute(
+        text(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+    return name
+
+
+def ensure_partitions(db: Session, months_ahead: int, today: date) -> list[str]:
+    """Creates the missing partitions from this month to `months_ahead` on."""
+    existing = monthly_partitions(db)
+    return [
+        _create_partition(db, month)
+        for month in (month_start(today, offset) for offset in range(months_ahead + 1))
+        if month not in existing
+    ]
+
+
+def drop_expired_partitions(
+    db: Session, retention_months: int, today: date
+) -> list[str]:
+    """Drops the partitions of months before the last `retention_months`."""
+    cutoff = month_start(today, 1 - retention_months)
+    expired = [
+        name for month, name in sorted(monthly_partitions(db).items()) if month < cutoff
+    ]
+    for name in expired:
+        db.execute(text(f"DROP TABLE {name}"))
+    # Strays of the default partition; it holds next to nothing
+    db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+        {"cutoff": cutoff},
+    )
+    return expired
+
+
+@timed(DB_WRITE_LATENCY, operation="maintain_partitions")
+def maintain_partitions(
+    db: Session, config: ResultsSettings, today: date | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Creates upcoming partitions and drops expired ones in one transaction.
+    Returns the names of the created and of the dropped partitions.
+    """
+    today = today or date.today()
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    created = ensure_partitions(db, config.partitions_ahead, today)
+    dropped = drop_expired_partitions(db, config.retention_months, today)
+    db.commit()
+
+    if created or dropped:
+        logger.info(f"test_runs partitions created: {created}, dropped: {dropped}")
+    return created, dropped
+
+
+if __name__ == "__main__":
+    configure_logging()
+    with SessionLocal() as session:
+        maintain_partitions(session, settings.results)
@@ -0,0 +1,521 @@
+import os
+import socket
+from collections.abc import Iterable, Sequence
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import Row, Select, delete, func, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    QueueWorker,
+    Run,
+    RunAttempt,
+    RunJob,
+    RunRequestTiming,
+    TestDailyStats,
+    TestRun,
+)
+from app.metrics import DB_WRITE_LATENCY, TEST_DURATION_BUCKETS, timed
+from app.schemas import RunPriority, RunStatus, RunSummary, TestRunRequest
+
+# Claim order of the distributed queue lanes: RunPriority is declared high first
+LANES: tuple[RunPriority, ...] = tuple(RunPriority)
+
+
+@timed(DB_WRITE_LATENCY, operation="create_run")
+def create_run(
+    db: Session,
+    request: TestRunRequest,
+    submitter: str | None = None,
+    enqueue: bool = False,
+) -> Run:
+    """
+    Persists a freshly accepted run in the QUEUED state.
+    With `enqueue` it is also put on the distributed queue, in one transaction.
+    """
+    return _insert_run(db, request, submitter, enqueue)
+
+
+async def create_run_async(
+    db: AsyncSession,
+    request: TestRunRequest,
+    submitter: str | None = None,
+    enqueue: bool = False,
+) -> Run:
+    with DB_WRITE_LATENCY.time(operation="create_run"):
+        return await db.run_sync(_insert_run, request, submitter, enqueue)
+
+
+def _insert_run(
+    db: Session, request: TestRunRequest, submitter: str | None, enqueue: bool
+) -> Run:
+    """create_run, untimed for callers that time their own transaction."""
+    run = Run(
+        test_suite=request.test_suite,
+        browser=request.browser,
+        headless=request.headless,
+        priority=request.priority,
+        shards=request.shards,
+        retries=request.retries,
+        timeout_seconds=request.timeout_seconds,
+        submitter=submitter,
+        status=RunStatus.QUEUED,
+    )
+    db.add(run)
+    if enqueue:
+        db.add(RunJob(run=run, lane=LANES.index(request.priority)))
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def get_run(db: Session, run_id: int) -> Run | None:
+    return db.get(Run, run_id)
+
+
+def list_runs(
+    db: Session,
+    status: RunStatus | None = None,
+    test_suite: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Sequence[Run]:
+    """
+    Returns the most recent runs first.
+    Served by ix_runs_created_at, or ix_runs_status_created_at when filtered.
+    """
+    return db.scalars(_runs_query(status, test_suite, limit, offset)).all()
+
+
+async def get_run_async(db: AsyncSession, run_id: int) -> Run | None:
+    return await db.get(Run, run_id)
+
+
+async def list_runs_async(
+    db: AsyncSession,
+    status: RunStatus | None = None,
+    test_suite: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Sequence[Run]:
+    result = await db.scalars(_runs_query(status, test_suite, limit, offset))
+    return result.all()
+
+
+async def list_request_timings_async(
+    db: AsyncSession, run_id: int
+) -> Sequence[RunRequestTiming]:
+    """
+    Request timings of a run. Queried directly: Run.request_timings loads
+    lazily, which an AsyncSession cannot do on attribute access.
+    """
+    result = await db.scalars(
+        select(RunRequestTiming)
+        .where(RunRequestTiming.run_id == run_id)
+        .order_by(RunRequestTiming.endpoint, RunRequestTiming.method)
+    )
+    return result.all()
+
+
+async def list_test_stats_async(
+    db: AsyncSession, since: date, test_name: str | None = None
+) -> Sequence[TestDailyStats]:
+    """
+    Daily rollups from `since` on, of every test or of `test_name`, by test
+    and then day. Served by ix_test_daily_stats_day, or the primary key.
+    """
+    stmt = select(TestDailyStats).where(TestDailyStats.day >= since)
+    if test_name is not None:
+        stmt = stmt.where(TestDailyStats.test_name == test_name)
+    result = await db.scalars(
+        stmt.order_by(TestDailyStats.test_name, TestDailyStats.day)
+    )
+    return result.all()
+
+
+async def total_test_stats_async(
+    db: AsyncSession, since: date, test_name: str | None = None
+) -> Sequence[Row[Any]]:
+    """
+    Daily rollups from `since` on added up per test, of every test or of
+    `test_name`: executions, passed, flips, duration_sum, duration_buckets
+    (summed bucket by bucket), and the last_status of the test's last_day.
+    Aggregated in one scan in the database, so a window is one row per test.
+    """
+    stats = TestDailyStats
+    window = [stats.day >= since]
+    if test_name is not None:
+        window.append(stats.test_name == test_name)
+
+    # One sum per bucket, +Inf included; PostgreSQL arrays are 1-based
+    buckets = [
+        func.sum(stats.duration_buckets[bucket])
+        for bucket in range(1, len(TEST_DURATION_BUCKETS) + 2)
+    ]
+    last_status = func.array_agg(
+        aggregate_order_by(stats.last_status, stats.day.desc())
+    )[1]
+    result = await db.execute(
+        select(
+            stats.test_name,
+            func.sum(stats.executions).label("executions"),
+            func.sum(stats.passed).label("passed"),
+            func.sum(stats.flips).label("flips"),
+            func.sum(stats.duration_sum).label("duration_sum"),
+            array(buckets).label("duration_buckets"),
+            last_status.label("last_status"),
+            func.max(stats.day).label("last_day"),
+        )
+        .where(*window)
+        .group_by(stats.test_name)
+        .order_by(stats.test_name)
+    )
+    return result.all()
+
+
+def _runs_query(
+    status: RunStatus | None, test_suite: str | None, limit: int, offset: int
+) -> Select[tuple[Run]]:
+    """The query of list_runs and list_runs_async."""
+    stmt = select(Run).order_by(Run.created_at.desc(), Run.id.desc())
+
+    if status is not None:
+        stmt = stmt.where(Run.status == status)
+
+    if test_suite is not None:
+        stmt = stmt.where(Run.test_suite == test_suite)
+
+    return stmt.limit(limit).offset(offset)
+
+
+@timed(DB_WRITE_LATENCY, operation="delete_run")
+def delete_run(db: Session, run_id: int) -> None:
+    _delete_run(db, run_id)
+
+
+async def delete_run_async(db: AsyncSession, run_id: int) -> None:
+    with DB_WRITE_LATENCY.time(operation="delete_run"):
+        await db.run_sync(_delete_run, run_id)
+
+
+def _delete_run(db: Session, run_id: int) -> None:
+    run = db.get(Run, run_id)
+    if run is not None:
+        db.delete(run)
+        db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="mark_run_started")
+def mark_run_started(db: Session, run_id: int) -> None:
+    """Moves a QUEUED run to RUNNING; runs cancelled meanwhile are left alone."""
+    run = db.get(Run, run_id)
+    if run is None or run.status != RunStatus.QUEUED:
+        return
+
+    run.status = RunStatus.RUNNING
+    run.started_at = func.now()
+    db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="mark_run_finished")
+def mark_run_finished(
+    db: Session, run_id: int, status: RunStatus, summary: RunSummary
+) -> None:
+    _record_outcome(db, run_id, status, summary)
+
+
+async def mark_run_finished_async(
+    db: AsyncSession, run_id: int, status: RunStatus, summary: RunSummary
+) -> None:
+    with DB_WRITE_LATENCY.time(operation="mark_run_finished"):
+        await db.run_sync(_record_outcome, run_id, status, summary)
+
+
+def _record_outcome(
+    db: Session, run_id: int, status: RunStatus, summary: RunSummary
+) -> None:
+    """mark_run_finished, untimed for callers that time their own transaction."""
+    run = db.get(Run, run_id)
+    if run is None:
+        return
+
+    run.status = status
+    run.exit_code = summary.exit_code
+    run.total_tests = summary.total_tests
+    run.failed_tests = summary.failed_tests
+    run.attempts = [RunAttempt(**attempt.model_dump()) for attempt in summary.attempts]
+    run.request_timings = [
+        RunRequestTiming(**timing.model_dump()) for timing in summary.request_timings
+    ]
+    run.finished_at = func.now()
+    db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="fail_orphaned_runs")
+def fail_orphaned_runs(db: Session) -> list[int]:
+    """
+    Ends every QUEUED or RUNNING run as ERROR, for an API process of the
+    local backend starting up: the queue and pytest processes of those runs
+    died with the previous one. Returns the IDs of the runs ended.
+    """
+    run_ids = db.scalars(
+        update(Run)
+        .where(Run.status.in_((RunStatus.QUEUED, RunStatus.RUNNING)))
+        .values(status=RunStatus.ERROR, finished_at=func.now())
+        .returning(Run.id)
+    ).all()
+    db.commit()
+    return list(run_ids)
+
+
+@timed(DB_WRITE_LATENCY, operation="insert_test_runs")
+def insert_test_runs(db: Session, rows: Sequence[dict[str, Any]]) -> None:
+    """Stores test results in one multi-row INSERT and one transaction."""
+    if rows:
+        db.execute(insert(TestRun), rows)
+        db.commit()
+
+
+def average_durations(db: Session, test_names: Iterable[str]) -> dict[str, float]:
+    """Historical mean duration per test, from the test_runs history."""
+    names = list(test_names)
+    if not names:
+        return {}
+
+    stmt = (
+        select(TestRun.test_name, func.avg(TestRun.duration))
+        .where(TestRun.test_name.in_(names))
+        .group_by(TestRun.test_name)
+    )
+    return {name: float(duration) for name, duration in db.execute(stmt)}
+
+
+def run_request(run: Run) -> TestRunRequest:
+    """Rebuilds the request a persisted run was submitted with."""
+    return TestRunRequest.model_validate(run, from_attributes=True)
+
+
+@timed(DB_WRITE_LATENCY, operation="register_worker")
+def register_worker(db: Session, worker_id: str, slots: int) -> None:
+    """Records a live worker node, or refreshes its heartbeat if known."""
+    _upsert_worker(db, worker_id, slots)
+
+
+def _upsert_worker(db: Session, worker_id: str, slots: int) -> None:
+    stmt = insert(QueueWorker).values(
+        id=worker_id, hostname=socket.gethostname(), pid=os.getpid(), slots=slots
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[QueueWorker.id], set_={"heartbeat_at": func.now()}
+        )
+    )
+    db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="unregister_worker")
+def unregister_worker(db: Session, worker_id: str) -> None:
+    db.execute(delete(QueueWorker).where(QueueWorker.id == worker_id))
+    db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="claim_job")
+def claim_job(db: Session, worker_id: str) -> Run | None:
+    """
+    Takes the oldest unclaimed job of the highest lane for `worker_id` and
+    moves its run to RUNNING. SKIP LOCKED lets concurrent workers claim
+    different jobs without waiting on each other.
+    """
+    stmt = (
+        select(RunJob)
+        .where(RunJob.worker_id.is_(None))
+        .order_by(RunJob.lane, RunJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = db.scalars(stmt).first()
+    if job is None:
+        db.rollback()
+        return None
+
+    job.worker_id = worker_id
+    job.claimed_at = func.now()
+    job.heartbeat_at = func.now()
+    job.deliveries += 1
+    job.run.status = RunStatus.RUNNING
+    job.run.started_at = func.now()
+    db.commit()
+    return job.run
+
+
+@timed(DB_WRITE_LATENCY, operation="heartbeat")
+def heartbeat(db: Session, worker_id: str, slots: int) -> tuple[set[int], set[int]]:
+    """
+    Keeps the worker and every job it holds alive.
+    Returns the run IDs it still holds and those asked to be cancelled;
+    runs missing from the first set were re-queued away from this worker.
+    """
+    _upsert_worker(db, worker_id, slots)
+    rows = db.execute(
+        update(RunJob)
+        .where(RunJob.worker_id == worker_id)
+        .values(heartbeat_at=func.now())
+        .returning(RunJob.run_id, RunJob.cancel_requested)
+    ).all()
+    db.commit()
+
+    held = {run_id for run_id, _ in rows}
+    cancelled = {run_id for run_id, requested in rows if requested}
+    return held, cancelled
+
+
+@timed(DB_WRITE_LATENCY, operation="finish_job")
+def finish_job(
+    db: Session, run_id: int, worker_id: str, status: RunStatus, summary: RunSummary
+) -> bool:
+    """
+    Records the outcome and removes the job from the queue, but only if
+    `worker_id` still holds it. False if the run was re-queued meanwhile.
+    """
+    job = db.scalars(
+        select(RunJob)
+        .where(RunJob.run_id == run_id, RunJob.worker_id == worker_id)
+        .with_for_update()
+    ).first()
+    if job is None:
+        db.rollback()
+        return False
+
+    db.delete(job)
+    _record_outcome(db, run_id, status, summary)
+    return True
+
+
+@timed(DB_WRITE_LATENCY, operation="release_job")
+def release_job(db: Session, run_id: int, worker_id: str) -> None:
+    """Hands a job held by `worker_id` back to the queue, e.g. on shutdown."""
+    job = db.scalars(
+        select(RunJob)
+        .where(RunJob.run_id == run_id, RunJob.worker_id == worker_id)
+        .with_for_update()
+    ).first()
+    if job is not None:
+        _requeue(db, job)
+    db.commit()
+
+
+@timed(DB_WRITE_LATENCY, operation="requeue_stale_jobs")
+def requeue_stale_jobs(db: Session, timeout: float, max_deliveries: int) -> list[int]:
+    """
+    Re-queues jobs whose worker stopped heartbeating for `timeout` seconds,
+    and forgets such workers. Jobs already delivered `max_deliveries` times
+    are given up as ERROR instead, and jobs asked to be cancelled end as
+    CANCELLED. Returns the affected run IDs.
+    """
+    cutoff = func.now() - timedelta(seconds=timeout)
+    jobs = db.scalars(
+        select(RunJob)
+        .where(RunJob.worker_id.is_not(None), RunJob.heartbeat_at < cutoff)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    for job in jobs:
+        if job.cancel_requested or job.deliveries < max_deliveries:
+            _requeue(db, job)
+        else:
+            _give_up(db, job, RunStatus.ERROR)
+
+    db.execute(delete(QueueWorker).where(QueueWorker.heartbeat_at < cutoff))
+    db.commit()
+    return [job.run_id for job in jobs]
+
+
+@timed(DB_WRITE_LATENCY, operation="cancel_job")
+def cancel_job(db: Session, run_id: int) -> bool:
+    """
+    Withdraws a queued job, or flags a claimed one for its worker to cancel.
+    True if a worker holds the run and will record the cancellation itself.
+    """
+    return _cancel_job(db, run_id)
+
+
+async def cancel_job_async(db: AsyncSession, run_id: int) -> bool:
+    with DB_WRITE_LATENCY.time(operation="cancel_job"):
+        return await db.run_sync(_cancel_job, run_id)
+
+
+def _cancel_job(db: Session, run_id: int) -> bool:
+    job = db.scalars(
+        select(RunJob).where(RunJob.run_id == run_id).with_for_update()
+    ).first()
+    if job is None:
+        db.rollback()
+        return False
+
+    if job.worker_id is None:
+        db.delete(job)
+        db.commit()
+        return False
+
+    job.cancel_requested = True
+    db.commit()
+    return True
+
+
+def queue_load(db: Session) -> dict[str, Any]:
+    """Depth, lanes, running jobs and live workers of the distributed queue."""
+    lane_rows = db.execute(
+        select(RunJob.lane, func.count())
+        .where(RunJob.worker_id.is_(None))
+        .group_by(RunJob.lane)
+    ).all()
+    lanes = {lane.value: 0 for lane in LANES}
+    lanes.update({LANES[lane].value: count for lane, count in lane_rows})
+
+    workers, slots = db.execute(
+        select(func.count(), func.coalesce(func.sum(QueueWorker.slots), 0))
+    ).one()
+    active = db.scalar(
+        select(func.count()).select_from(RunJob).where(RunJob.worker_id.is_not(None))
+    )
+
+    return {
+        "workers": int(slots),
+        "nodes": int(workers),
+        "active": int(active or 0),
+        "queued": sum(lanes.values()),
+        "lanes": lanes,
+    }
+
+
+def in_flight_runs(db: Session) -> list[tuple[int, str | None, str]]:
+    """(run ID, submitter, browser) of every queued or running run."""
+    stmt = select(Run.id, Run.submitter, Run.browser).where(
+        Run.status.in_((RunStatus.QUEUED, RunStatus.RUNNING))
+    )
+    return list(db.execute(stmt).tuples())
+
+
+def _requeue(db: Session, job: RunJob) -> None:
+    """
+    Puts a job its worker let go of back in the queue. A job that was asked
+    to be cancelled meanwhile ends as CANCELLED instead of running again.
+    """
+    if job.cancel_requested:
+        _give_up(db, job, RunStatus.CANCELLED)
+        return
+
+    job.worker_id = None
+    job.claimed_at = None
+    job.heartbeat_at = None
+    job.run.status = RunStatus.QUEUED
+    job.run.started_at = None
+
+
+def _give_up(db: Session, job: RunJob, status: RunStatus) -> None:
+    db.delete(job)
+    job.run.status = status
+    job.run.finished_at = func.now()
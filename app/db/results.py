@@ -0,0 +1,98 @@
+"""
+Batched recording of test results into test_runs.
+
+Tests hand their result to ResultWriter and carry on; a background thread
+stores the queued rows in multi-row INSERTs, one transaction per batch,
+once `batch_size` rows are waiting or the oldest has waited
+`flush_interval` seconds. `close()` drains what is left. Rows are tagged
+with `run_id` when the results belong to an orchestrated run.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.db import repository
+from app.db.session import SessionLocal
+
+_STOP = object()
+
+
+class ResultWriter:
+    """Thread-safe, non-blocking sink of TestRun rows."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        run_id: int | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.run_id = run_id
+        self.session_factory = session_factory
+        self.written = 0
+        self.flushes = 0
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="result-writer", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, test_name: str, status: str, duration: float) -> None:
+        self._queue.put(
+            {
+                "run_id": self.run_id,
+                "test_name": test_name,
+                "status": status,
+                "duration": duration,
+            }
+        )
+
+    def close(self) -> None:
+        """Stores every queued row, then stops the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        batch: list[dict[str, Any]] = []
+        deadline: float | None = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                row = None
+
+            if row is _STOP:
+                self._flush(batch)
+                return
+            if row is not None:
+                batch.append(row)
+                deadline = deadline or time.monotonic() + self.flush_interval
+
+            if len(batch) >= self.batch_size or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                self._flush(batch)
+                batch, deadline = [], None
+
+    def _flush(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        session = self.session_factory()
+        try:
+            repository.insert_test_runs(session, batch)
+            self.written += len(batch)
+            self.flushes += 1
+            logger.debug(f"Saved {len(batch)} test results")
+        except Exception as e:
+            logger.error(f"Failed to save {len(batch)} test results to DB: {e}")
+        finally:
+            session.close()
@@ -0,0 +1,162 @@
+"""
+Incremental refresh of the test_daily_stats rollup from test_runs.
+
+Each refresh recomputes the days from the last rolled-up one, minus
+OVERLAP_DAYS for results committed late, up to today, and upserts one row
+per test and day. Earlier days are never read again, so a refresh costs a
+couple of days of results however long the history is; the first one
+backfills everything test_runs still holds. Rolled-up days outlive the
+test_runs partitions that app.db.partitions drops.
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.db.models import TestDailyStats, TestRun
+from app.metrics import DB_WRITE_LATENCY, timed
+
+# Outcomes that count as executions; skipped tests say nothing about flakiness
+EXECUTED = ("PASSED", "FAILED")
+OVERLAP_DAYS = 1
+
+# Serializes refreshes across API processes; any constant key will do
+_LOCK_KEY = 0x726F6C6C757073
+
+
+def duration_histogram() -> metrics.Histogram:
+    """Unregistered histogram with the buckets test_daily_stats counts in."""
+    return metrics.Histogram(
+        "qa_test_duration_seconds",
+        "Duration of single tests",
+        ["test_name"],
+        buckets=metrics.TEST_DURATION_BUCKETS,
+    )
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time(), tzinfo=UTC)
+    return start, start + timedelta(days=1)
+
+
+def _previous_statuses(db: Session, before: date) -> dict[str, str]:
+    """Last rolled-up outcome of every test before `before`."""
+    stmt = (
+        select(TestDailyStats.test_name, TestDailyStats.last_status)
+        .where(TestDailyStats.day < before)
+        .distinct(TestDailyStats.test_name)
+        .order_by(TestDailyStats.test_name, TestDailyStats.day.desc())
+    )
+    return dict(db.execute(stmt).tuples().all())
+
+
+def _first_stale_day(db: Session) -> date | None:
+    """The first day to recompute; None while test_runs has never had rows."""
+    last = db.scalar(select(func.max(TestDailyStats.day)))
+    if last is not None:
+        return last - timedelta(days=OVERLAP_DAYS)
+    oldest = db.scalar(select(func.min(TestRun.created_at)))
+    return None if oldest is None else oldest.astimezone(UTC).date()
+
+
+def summarize_day(
+    results: Iterable[tuple[str, str, float]], day: date, previous: dict[str, str]
+) -> list[dict[str, Any]]:
+    """
+    Rollup rows of one day from its (test name, status, duration) results in
+    chronological order. `previous` holds each test's last outcome so far
+    and is brought up to the end of the day.
+    """
+    durations = duration_histogram()
+    rows: dict[str, dict[str, Any]] = {}
+    for name, status, duration in results:
+        row = rows.get(name)
+        if row is None:
+            row = rows[name] = {
+                "test_name": name,
+                "day": day,
+                "executions": 0,
+                "passed": 0,
+                "flips": 0,
+            }
+        row["executions"] += 1
+        row["passed"] += status == "PASSED"
+        row["flips"] += previous.get(name, status) != status
+        row["last_status"] = previous[name] = status
+        durations.observe(duration, test_name=name)
+
+    for series in durations.snapshot():
+        row = rows[series["labels"][0]]
+        row["duration_sum"] = series["sum"]
+        row["duration_buckets"] = series["counts"]
+    return list(rows.values())
+
+
+def _refresh_day(db: Session, day: date, previous: dict[str, str]) -> int:
+    start, end = _day_bounds(day)
+    results = db.execute(
+        select(TestRun.test_name, TestRun.status, TestRun.duration)
+        .where(
+            TestRun.created_at >= start,
+            TestRun.created_at < end,
+            TestRun.status.in_(EXECUTED),
+        )
+        .order_by(TestRun.test_name, TestRun.created_at, TestRun.id)
+    ).tuples()
+    rows = summarize_day(results, day, previous)
+    if rows:
+        stmt = insert(TestDailyStats).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TestDailyStats.test_name, TestDailyStats.day],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in (
+                        "executions",
+                        "passed",
+                        "flips",
+                        "last_status",
+                        "duration_sum",
+                        "duration_buckets",
+                    )
+                }
+                | {"refreshed_at": func.now()},
+            )
+        )
+    return len(rows)
+
+
+@timed(DB_WRITE_LATENCY, operation="refresh_test_stats")
+def refresh_test_stats(
+    db: Session, today: date | None = None, since: date | None = None
+) -> int:
+    """
+    Brings test_daily_stats up to date in one transaction. Returns the
+    number of rollup rows written; 0 as well if another process is already
+    refreshing. `since` recomputes from that day on, for results that were
+    imported or arrived later than OVERLAP_DAYS.
+    """
+    locked = db.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}
+    )
+    day = (since or _first_stale_day(db)) if locked else None
+    if day is None:
+        db.rollback()
+        return 0
+
+    today = today or datetime.now(UTC).date()
+    previous = _previous_statuses(db, day)
+    written = 0
+    while day <= today:
+        written += _refresh_day(db, day, previous)
+        day += timedelta(days=1)
+    db.commit()
+
+    logger.debug(f"Refreshed {written} test_daily_stats rows")
+    return written
@@ -1,17 +1,66 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from config.settings import settings
 
-engine = create_engine(settings.db.url, echo=False)
+engine = create_engine(settings.db.url, echo=False, **settings.db.engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class AsyncDatabase:
+    """
+    The async engine serving the API endpoints without tying up threadpool
+    threads. Created by open() in the API lifespan rather than on import:
+    worker nodes, pytest processes and prewarmed zygotes import this module
+    too and never use it. Its connections belong to the event loop that
+    opened them, so close() it before that loop ends.
+    """
+
+    def __init__(self) -> None:
+        self._engine: AsyncEngine | None = None
+        self._sessions: async_sessionmaker[AsyncSession] | None = None
+
+    def open(self) -> None:
+        if self._sessions is not None:
+            return
+        self._engine = create_async_engine(
+            settings.db.async_url, echo=False, **settings.db.engine_options()
+        )
+        self._sessions = async_sessionmaker(
+            self._engine, autoflush=False, expire_on_commit=False
+        )
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+        self._engine = None
+        self._sessions = None
+
+    def session(self) -> AsyncSession:
+        if self._sessions is None:
+            raise RuntimeError("The async database is not open; call open() first")
+        return self._sessions()
+
+
+async_db = AsyncDatabase()
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_db.session() as db:
+        yield db
@@ -25,3 +25,34 @@ class APIClientError(QAOrchestratorError):
         self.status_code = status_code
         self.payload = payload
         super().__init__(message)
+
+
+class CircuitOpenError(APIClientError):
+    """
+    Raised without contacting the target API while its circuit breaker is
+    open, i.e. after repeated failures, so tests fail fast when it is down.
+    """
+
+
+class CassetteMissError(APIClientError):
+    """
+    Raised in replay mode when the cassette holds no response for a request,
+    i.e. the test sends something the recording run did not.
+    """
+
+
+class QueueFullError(QAOrchestratorError):
+    """Raised when the run queue has reached its configured depth limit."""
+
+
+class AdmissionRejectedError(QAOrchestratorError):
+    """
+    Raised when a run is refused to protect the orchestrator from overload.
+    Carries the HTTP status to answer with and a Retry-After hint in seconds.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(message)
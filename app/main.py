@@ -1,99 +1,434 @@
-import shlex
-import subprocess
-from typing import Any
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Annotated, Any
 
 import uvicorn
-from fastapi import BackgroundTasks, FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import TestRunRequest
+from app import metrics
+from app.analytics import RollupRefresher, SortKey, TTLCache, detail, rank, window_start
+from app.db import SessionLocal, async_db, get_async_db, repository
+from app.db.models import Run, RunRequestTiming
+from app.db.partitions import maintain_partitions
+from app.exceptions import AdmissionRejectedError, QueueFullError
+from app.runner import (
+    AdmissionController,
+    ClusterQueue,
+    ColdLauncher,
+    Job,
+    JobQueue,
+    Launcher,
+    LogBuffer,
+    LogHub,
+    RunOutcome,
+    ShardLauncher,
+    WarmPool,
+    WorkerPool,
+    run_pytest_worker,
+)
+from app.runner.executor import TERMINATE_GRACE
+from app.schemas import (
+    RequestTimingSummary,
+    RunRead,
+    RunStatus,
+    TestRunRequest,
+    TestStatsDetail,
+    TestStatsSummary,
+)
 from config.logger import configure_logging
 from config.settings import settings
 
 configure_logging()
 
-app = FastAPI(
-    title="QA Orchestrator API",
-    version="1.0.0",
-    description="Microservice for automated test execution management.",
-)
+# Endpoints await the database instead of occupying a threadpool thread
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
 
+ACTIVE_STATUSES = (RunStatus.QUEUED, RunStatus.RUNNING)
+
+
+def _mark_started(run_id: int) -> None:
+    with SessionLocal() as db:
+        repository.mark_run_started(db, run_id)
 
-def run_pytest_worker(request: TestRunRequest) -> None:
-    """
-    Executes pytest in a subprocess based on the provided configuration.
-    Runs in the background to prevent blocking the API response.
-    """
-    logger.info(
-        f"START: Test run sequence | Suite: {request.test_suite} | "
-        f"Browser: {request.browser}"
-    )
 
-    command = [
-        "pytest",
-        request.test_suite,
-        "--alluredir",
-        "allure-results",
-    ]
+def _mark_finished(run_id: int, outcome: RunOutcome) -> None:
+    with SessionLocal() as db:
+        repository.mark_run_finished(db, run_id, outcome.status, outcome.summary())
 
-    command.extend(["--browser", request.browser])
 
-    if not request.headless:
-        command.append("--headed")
+def _fail_orphaned_runs() -> None:
+    """Closes out the runs a previous API process left queued or running."""
+    with SessionLocal() as db:
+        run_ids = repository.fail_orphaned_runs(db)
+    if run_ids:
+        logger.warning(f"Marked runs orphaned by a restart as error: {run_ids}")
 
-    logger.debug(f"EXEC: {shlex.join(command)}")
 
+def _maintain_partitions() -> None:
+    """test_runs housekeeping; a failure must not keep the API from starting."""
     try:
-        process = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=False,
+        with SessionLocal() as db:
+            maintain_partitions(db, settings.results)
+    except Exception as e:
+        logger.error(f"test_runs partition maintenance failed: {e}")
+
+
+async def execute_job(job: Job) -> None:
+    log = log_hub.open(job.run_id)
+    outcome = RunOutcome(exit_code=None)
+    try:
+        await asyncio.to_thread(_mark_started, job.run_id)
+        await run_pytest_worker(
+            job.request, log, launcher, job.run_id, shard_launcher, outcome
         )
+    except asyncio.CancelledError:
+        outcome.interrupted = RunStatus.CANCELLED
+        raise
+    finally:
+        admission.release(job.run_id)
+        await log.close()
+        await asyncio.to_thread(_mark_finished, job.run_id, outcome)
 
-        if process.returncode == 0:
-            logger.info("FINISH: All tests passed successfully.")
-        elif process.returncode == 1:
-            logger.warning("FINISH: Test execution completed with failures.")
-        else:
-            logger.error(
-                f"FINISH: Execution interrupted. Error code: {process.returncode}"
-            )
-            logger.debug(f"STDERR: {process.stderr}")
 
-    except Exception as e:
-        logger.critical(f"INFRA ERROR: Subprocess failure: {e}")
+# With the postgres backend runs are only queued here and executed by
+# `python -m app.worker` nodes; the local pool stays idle.
+distributed = settings.runner.queue_backend == "postgres"
+
+log_hub = LogHub(
+    max_lines=settings.runner.log_buffer_lines,
+    retained_runs=settings.runner.log_retained_runs,
+)
+# A process per run slot, plus the shard processes of sharded runs
+processes = settings.runner.workers + settings.runner.shard_processes
+warm_pool = (
+    WarmPool(processes, settings.runner.prewarm_max_runs)
+    if settings.runner.prewarm and not distributed
+    else None
+)
+launcher: Launcher = warm_pool or ColdLauncher(processes)
+shard_launcher = ShardLauncher(launcher, settings.runner.shard_processes)
+job_queue = JobQueue(max_depth=settings.runner.max_queue_depth)
+worker_pool = WorkerPool(job_queue, settings.runner.workers, execute_job)
+cluster_queue = (
+    ClusterQueue(settings.runner.max_queue_depth, settings.runner.poll_interval)
+    if distributed
+    else None
+)
+admission = AdmissionController(cluster_queue or job_queue, settings.admission)
+rollup_refresher = RollupRefresher(settings.analytics.refresh_interval)
+test_stats: TTLCache[tuple[Any, ...], Any] = TTLCache(
+    settings.analytics.cache_size, settings.analytics.cache_ttl
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    async_db.open()
+    await asyncio.to_thread(_maintain_partitions)
+    await rollup_refresher.start()
+
+    if cluster_queue is not None:
+        await cluster_queue.start(on_refresh=admission.sync)
+        yield
+        await cluster_queue.stop()
+        await rollup_refresher.stop()
+        await async_db.close()
+        return
+
+    # Worker nodes requeue the jobs of a dead process; the local queue cannot
+    await asyncio.to_thread(_fail_orphaned_runs)
+    if warm_pool is not None:
+        await warm_pool.start()
+    await worker_pool.start()
+    yield
+    await worker_pool.stop()
+    if warm_pool is not None:
+        await warm_pool.stop()
+    await rollup_refresher.stop()
+    await async_db.close()
+
+
+app = FastAPI(
+    title="QA Orchestrator API",
+    version="1.0.0",
+    description="Microservice for automated test execution management.",
+    lifespan=lifespan,
+)
+
+
+def _rejection(error: AdmissionRejectedError | QueueFullError) -> HTTPException:
+    if isinstance(error, QueueFullError):
+        error = AdmissionRejectedError(str(error), 503, admission.retry_after)
+
+    return HTTPException(
+        status_code=error.status_code,
+        detail=error.message,
+        headers={"Retry-After": str(error.retry_after)},
+    )
 
 
 @app.post("/run", status_code=202)
 async def trigger_test_run(
-    request: TestRunRequest, background_tasks: BackgroundTasks
+    request: TestRunRequest,
+    db: AsyncDbSession,
+    http_request: Request,
+    x_submitter: Annotated[str | None, Header()] = None,
 ) -> dict[str, Any]:
     """
-    Initiates an asynchronous test run.
+    Persists a run record and queues it for execution by the worker pool,
+    or by worker nodes with the postgres queue backend.
+    Under overload the run is refused up front with 429 or 503 and a
+    Retry-After header, before anything is written.
+    Submitters are told apart by X-Submitter, or by client address.
     """
-    background_tasks.add_task(run_pytest_worker, request)
+    client_host = http_request.client.host if http_request.client else "unknown"
+    submitter = x_submitter or client_host
+
+    try:
+        admission.check(submitter, request.browser)
+    except AdmissionRejectedError as e:
+        raise _rejection(e) from e
+
+    if request.timeout_seconds is None:
+        request = request.model_copy(
+            update={"timeout_seconds": settings.runner.default_timeout}
+        )
+
+    run = await repository.create_run_async(db, request, submitter, distributed)
+
+    try:
+        admission.admit(run.id, submitter, request.browser)
+        if not distributed:
+            job_queue.submit(run.id, request)
+    except (AdmissionRejectedError, QueueFullError) as e:
+        admission.release(run.id)
+        await repository.delete_run_async(db, run.id)
+        raise _rejection(e) from e
 
     return {
         "status": "accepted",
-        "message": "Test execution initiated in background.",
-        "request_id": id(request),
+        "message": "Test execution queued.",
+        "run_id": run.id,
         "details": {
             "suite": request.test_suite,
             "browser": request.browser,
+            "priority": request.priority,
+            "shards": request.shards,
+            "timeout_seconds": request.timeout_seconds,
+            "queue_depth": admission.queue.depth,
         },
     }
 
 
+@app.get("/runs/{run_id}", response_model=RunRead)
+async def get_run(run_id: int, db: AsyncDbSession) -> Run:
+    """Returns the current state of a single run."""
+    run = await repository.get_run_async(db, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
+
+
+@app.get("/runs/{run_id}/timings", response_model=list[RequestTimingSummary])
+async def get_run_timings(run_id: int, db: AsyncDbSession) -> list[RunRequestTiming]:
+    """
+    Timing breakdown of the API requests a finished run sent: count and
+    p50/p95/p99 seconds per method, endpoint template and phase. Slow `ttfb`
+    points at the target server, slow `dns`/`connect`/`tls` at the network.
+    """
+    if await repository.get_run_async(db, run_id) is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return list(await repository.list_request_timings_async(db, run_id))
+
+
+@app.delete("/runs/{run_id}", response_model=RunRead)
+async def cancel_run(run_id: int, db: AsyncDbSession) -> Run:
+    """
+    Cancels a queued or running run. A running run has its pytest process
+    groups, browsers included, killed before the response is returned, so its
+    worker slot is already free again. Runs on worker nodes are waited for
+    until their next heartbeat has picked the cancellation up.
+    """
+    run = await repository.get_run_async(db, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+
+    if run.status not in ACTIVE_STATUSES:
+        raise HTTPException(
+            status_code=409, detail=f"Run {run_id} already finished ({run.status})"
+        )
+
+    # A running job records its own cancellation; anything else is either
+    # still queued or was orphaned by a restart and is closed out here.
+    if not await _stop_run(db, run_id):
+        admission.release(run_id)
+        cancelled = RunOutcome(exit_code=None, interrupted=RunStatus.CANCELLED)
+        await repository.mark_run_finished_async(
+            db, run_id, cancelled.status, cancelled.summary()
+        )
+    elif distributed:
+        await _wait_for_worker(db, run)
+
+    await db.refresh(run)
+    return run
+
+
+async def _stop_run(db: AsyncSession, run_id: int) -> bool:
+    """True if the run is executing and its executor records the cancellation."""
+    if distributed:
+        return await repository.cancel_job_async(db, run_id)
+    if job_queue.cancel(run_id):
+        return False
+    return await worker_pool.cancel(run_id)
+
+
+async def _wait_for_worker(db: AsyncSession, run: Run) -> None:
+    deadline = time.monotonic() + (
+        settings.runner.heartbeat_interval
+        + settings.runner.poll_interval
+        + TERMINATE_GRACE
+    )
+    while run.status in ACTIVE_STATUSES and time.monotonic() < deadline:
+        await asyncio.sleep(settings.runner.poll_interval)
+        await db.refresh(run)
+
+
+async def _sse_events(log: LogBuffer, start: int) -> AsyncIterator[str]:
+    async for seq, line in log.follow(start):
+        yield f"id: {seq}\ndata: {line}\n\n"
+
+    yield "event: end\ndata: \n\n"
+
+
+@app.get("/runs/{run_id}/logs")
+async def stream_run_logs(
+    run_id: int,
+    last_event_id: Annotated[int | None, Header()] = None,
+) -> StreamingResponse:
+    """
+    Streams run output as Server-Sent Events while the run executes.
+    Reconnecting clients resume after the Last-Event-ID they received.
+    """
+    log = log_hub.get(run_id)
+    if log is None:
+        raise HTTPException(
+            status_code=404, detail=f"No logs retained for run {run_id}"
+        )
+
+    start = 0 if last_event_id is None else last_event_id + 1
+
+    return StreamingResponse(
+        _sse_events(log, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/runs", response_model=list[RunRead])
+async def list_runs(
+    db: AsyncDbSession,
+    status: RunStatus | None = None,
+    suite: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[Run]:
+    """Lists runs, newest first, optionally filtered by status or suite."""
+    return list(await repository.list_runs_async(db, status, suite, limit, offset))
+
+
+async def _ranked_tests(
+    since: date, sort: SortKey, min_executions: int, limit: int
+) -> list[TestStatsSummary]:
+    # Own session: the result is shared by every request waiting on the cache
+    async with async_db.session() as db:
+        totals = await repository.total_test_stats_async(db, since)
+    return rank(totals, sort, min_executions, limit)
+
+
+async def _test_detail(since: date, test_name: str) -> TestStatsDetail | None:
+    async with async_db.session() as db:
+        totals = await repository.total_test_stats_async(db, since, test_name)
+        if not totals:
+            return None
+        days = await repository.list_test_stats_async(db, since, test_name)
+    return detail(totals[0], days)
+
+
+@app.get("/analytics/tests", response_model=list[TestStatsSummary])
+async def list_test_stats(
+    days: Annotated[int, Query(ge=1, le=366)] = 30,
+    sort: SortKey = "flip_rate",
+    min_executions: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> list[TestStatsSummary]:
+    """
+    Per-test pass rate, flip rate and p50/p95 duration over the last `days`
+    days (UTC, today included), worst first by `sort`: flip_rate, p95 and
+    executions descending, pass_rate ascending.
+    Served from daily rollups refreshed every ANALYTICS_REFRESH_INTERVAL
+    seconds and cached for ANALYTICS_CACHE_TTL seconds.
+    """
+    since = window_start(days)
+    result: list[TestStatsSummary] = await test_stats.get(
+        ("list", since, sort, min_executions, limit),
+        lambda: _ranked_tests(since, sort, min_executions, limit),
+    )
+    return result
+
+
+@app.get("/analytics/tests/{test_name:path}", response_model=TestStatsDetail)
+async def get_test_stats(
+    test_name: str, days: Annotated[int, Query(ge=1, le=366)] = 30
+) -> TestStatsDetail:
+    """Window statistics of one test, with a breakdown per day."""
+    since = window_start(days)
+    result: TestStatsDetail | None = await test_stats.get(
+        ("detail", since, test_name), lambda: _test_detail(since, test_name)
+    )
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No results for {test_name} in the last {days} days",
+        )
+    return result
+
+
 @app.get("/health")
-async def health_check() -> dict[str, Any]:
-    """System health check endpoint."""
+async def health_check(response: Response) -> dict[str, Any]:
+    """
+    System health check endpoint.
+    Answers 503 while saturated, so load balancers route new runs elsewhere.
+    """
+    if admission.saturated:
+        response.status_code = 503
+
     return {
-        "status": "online",
+        "status": "saturated" if admission.saturated else "online",
         "environment": settings.app_env,
         "api_version": "1.0.0",
+        "workers": cluster_queue.stats() if cluster_queue else worker_pool.stats(),
+        "load": admission.stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def export_metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint; queue gauges are sampled on every scrape."""
+    stats = cluster_queue.stats() if cluster_queue else worker_pool.stats()
+    metrics.QUEUE_DEPTH.set(stats["queued"])
+    for lane, depth in stats.get("lanes", {}).items():
+        metrics.QUEUE_LANE_DEPTH.set(depth, lane=lane)
+    metrics.WORKERS_ACTIVE.set(stats.get("active", 0))
+    metrics.WORKERS_TOTAL.set(stats.get("workers", 0))
+
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
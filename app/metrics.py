@@ -0,0 +1,402 @@
+"""
+In-process metrics served by GET /metrics in the Prometheus text format.
+
+Counters, gauges and histograms keep plain floats per label set behind one
+lock per metric, so instrumenting a hot path costs a lock, a dict lookup and
+an addition; nothing is formatted until a scrape renders the registry.
+
+Each process has its own registry. pytest processes ship the HTTP client
+histogram back to the orchestrator through their JSON report (see
+app.runner.plugin), so client latency of every run shows up on /metrics.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, ParamSpec, TypeVar
+
+from loguru import logger
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, for latencies from sub-millisecond to a few seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PHASE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+RUN_DURATION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+# Durations of single tests, as rolled up per day in test_daily_stats
+TEST_DURATION_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: dict[str, str] | None = None) -> str:
+        pairs = [*zip(self.labelnames, key, strict=True), *(extra or {}).items()]
+        if not pairs:
+            return ""
+        inner = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return f"{{{inner}}}"
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Sample lines of every series, in the Prometheus text format."""
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Monotonically increasing total, e.g. finished runs per status."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Value that goes up and down, set when it is known, e.g. at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class _Buckets:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int) -> None:
+        # One count per upper bound, the last one being +Inf; not cumulative
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.bounds = (*sorted(buckets), math.inf)
+        self._series: dict[LabelValues, _Buckets] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Buckets(len(self.bounds))
+            series.counts[index] += 1
+            series.sum += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observes the wall time spent in the block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series.counts) if series else 0
+
+    def labelsets(self) -> list[dict[str, str]]:
+        """Labels of every series observed so far."""
+        with self._lock:
+            return [
+                dict(zip(self.labelnames, key, strict=True)) for key in self._series
+            ]
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """
+        Estimates the q-quantile of a series like Prometheus'
+        histogram_quantile(): linearly within the bucket it falls in, capped
+        at the highest finite bound. 0.0 for an empty series.
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            counts = list(series.counts) if series else []
+
+        rank = q * sum(counts)
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                if math.isinf(upper):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return 0.0
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """JSON-serializable copy of every series, for merge() in another process."""
+        with self._lock:
+            return [
+                {"labels": list(key), "counts": list(series.counts), "sum": series.sum}
+                for key, series in self._series.items()
+            ]
+
+    def merge(self, snapshot: list[dict[str, Any]]) -> None:
+        """
+        Adds series taken by snapshot() of a histogram with the same buckets.
+        Series with a different number of buckets cannot be added up; they
+        are dropped with a warning.
+        """
+        with self._lock:
+            for entry in snapshot:
+                counts = entry["counts"]
+                if len(counts) != len(self.bounds):
+                    logger.warning(
+                        f"Dropped {self.name} series {entry['labels']}: "
+                        f"{len(counts)} buckets instead of {len(self.bounds)}"
+                    )
+                    continue
+                key = tuple(entry["labels"])
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Buckets(len(self.bounds))
+                series.counts = [
+                    a + b for a, b in zip(series.counts, counts, strict=True)
+                ]
+                series.sum += entry["sum"]
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = [
+                (key, list(buckets.counts), buckets.sum)
+                for key, buckets in self._series.items()
+            ]
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.bounds, counts, strict=True):
+                cumulative += count
+                labels = self._labels(key, {"le": _format_value(bound)})
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+
+class LabelLimit:
+    """
+    Caps the distinct values of a label fed from user input, which would
+    otherwise grow the number of series without bound. The first
+    `max_values` values are kept as they are, any later one becomes
+    `overflow`.
+    """
+
+    def __init__(self, max_values: int, overflow: str = "other") -> None:
+        self.max_values = max_values
+        self.overflow = overflow
+        self._values: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        with self._lock:
+            if value in self._values:
+                return value
+            if len(self._values) < self.max_values:
+                self._values.add(value)
+                return value
+        return self.overflow
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def timed(
+    histogram: Histogram, **labels: str
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator observing the wall time of every call of a function."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+QUEUE_DEPTH = Gauge("qa_queue_depth", "Runs waiting for a worker slot")
+QUEUE_LANE_DEPTH = Gauge(
+    "qa_queue_lane_depth", "Runs waiting for a worker slot per priority", ["lane"]
+)
+WORKERS_ACTIVE = Gauge("qa_workers_active", "Worker slots executing a run")
+WORKERS_TOTAL = Gauge("qa_workers_total", "Worker slots available")
+
+RUNS = Counter("qa_runs_total", "Finished runs by final status", ["status"])
+TESTS = Counter("qa_tests_total", "Tests of finished runs by outcome", ["outcome"])
+RUN_DURATION = Histogram(
+    "qa_run_duration_seconds",
+    "Wall time of a run, retries and shards included",
+    ["suite", "browser"],
+    buckets=RUN_DURATION_BUCKETS,
+)
+# Suites are paths sent by API clients; the rest are reported as "other"
+RUN_DURATION_SUITES = LabelLimit(50)
+SPAWN_LATENCY = Histogram(
+    "qa_pytest_spawn_seconds",
+    "Time until a pytest process for a run is started",
+    ["launcher"],
+)
+DB_WRITE_LATENCY = Histogram(
+    "qa_db_write_seconds", "Duration of a database write transaction", ["operation"]
+)
+HTTP_CLIENT_LATENCY = Histogram(
+    "qa_http_client_request_seconds",
+    "Duration of HTTP requests sent by the API clients",
+    ["method", "status"],
+)
+
+HTTP_CLIENT_PHASES = Histogram(
+    "qa_http_client_phase_seconds",
+    "Time HTTP requests of the API clients spent per phase (app.clients.timing)",
+    ["method", "endpoint", "phase"],
+    buckets=PHASE_BUCKETS,
+)
+
+for _metric in (
+    QUEUE_DEPTH,
+    QUEUE_LANE_DEPTH,
+    WORKERS_ACTIVE,
+    WORKERS_TOTAL,
+    RUNS,
+    TESTS,
+    RUN_DURATION,
+    SPAWN_LATENCY,
+    DB_WRITE_LATENCY,
+    HTTP_CLIENT_LATENCY,
+    HTTP_CLIENT_PHASES,
+):
+    REGISTRY.register(_metric)
@@ -0,0 +1,43 @@
+from app.runner.admission import AdmissionController, TokenBucket
+from app.runner.cluster import ClusterQueue
+from app.runner.executor import (
+    ColdLauncher,
+    Launcher,
+    RunOutcome,
+    ShardLauncher,
+    build_pytest_args,
+    merge_exit_codes,
+    run_pytest_worker,
+    status_from_exit_code,
+)
+from app.runner.logs import LogBuffer, LogHub
+from app.runner.prewarm import WarmPool, WarmWorker, ZygoteError
+from app.runner.queue import Job, JobQueue, WorkerPool
+from app.runner.report import NodeResult, PytestReport, load_report
+from app.runner.sharding import plan_shards
+
+__all__ = [
+    "AdmissionController",
+    "ClusterQueue",
+    "ColdLauncher",
+    "Job",
+    "JobQueue",
+    "Launcher",
+    "LogBuffer",
+    "LogHub",
+    "NodeResult",
+    "PytestReport",
+    "RunOutcome",
+    "ShardLauncher",
+    "TokenBucket",
+    "WarmPool",
+    "WarmWorker",
+    "WorkerPool",
+    "ZygoteError",
+    "build_pytest_args",
+    "load_report",
+    "merge_exit_codes",
+    "plan_shards",
+    "run_pytest_worker",
+    "status_from_exit_code",
+]
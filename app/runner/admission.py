@@ -0,0 +1,171 @@
+import math
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+from app.exceptions import AdmissionRejectedError
+from config.settings import AdmissionSettings
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVICE_UNAVAILABLE = 503
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens per second up to `burst`.
+    Not thread-safe; used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def consume(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens` if the bucket holds them and returns 0.
+        Otherwise takes nothing and returns the seconds until it would.
+        """
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class QueueGauge(Protocol):
+    """Depth view of a run queue: the in-process JobQueue or the cluster's."""
+
+    max_depth: int
+
+    @property
+    def depth(self) -> int: ...
+
+    @property
+    def is_full(self) -> bool: ...
+
+
+class AdmissionController:
+    """
+    Decides whether a new run is accepted before any work is done for it.
+
+    A run is refused with 503 while the queue or its browser is at capacity,
+    and with 429 while its submitter is at their cap or the submission rate
+    is exceeded. Caps count runs in flight, queued or executing, from
+    admission until release.
+    """
+
+    def __init__(self, queue: QueueGauge, limits: AdmissionSettings) -> None:
+        self.queue = queue
+        self.max_per_submitter = limits.max_per_submitter
+        self.max_per_browser = limits.max_per_browser
+        self.retry_after = limits.retry_after
+        self._bucket = TokenBucket(limits.rate, limits.burst)
+        self._per_submitter: Counter[str] = Counter()
+        self._per_browser: Counter[str] = Counter()
+        self._inflight: dict[int, tuple[str, str]] = {}
+
+    @property
+    def saturated(self) -> bool:
+        return self.queue.is_full
+
+    def check(self, submitter: str, browser: str) -> None:
+        """
+        Fast pre-check, done before the run is persisted.
+        Takes a rate limit token; raises AdmissionRejectedError when refused.
+        """
+        if self.queue.is_full:
+            raise AdmissionRejectedError(
+                "Run queue is full", HTTP_SERVICE_UNAVAILABLE, self.retry_after
+            )
+
+        self._check_caps(submitter, browser)
+
+        wait = self._bucket.consume()
+        if wait:
+            raise AdmissionRejectedError(
+                "Run submission rate limit exceeded",
+                HTTP_TOO_MANY_REQUESTS,
+                math.ceil(wait),
+            )
+
+    def admit(self, run_id: int, submitter: str, browser: str) -> None:
+        """
+        Counts the run against its caps until release(). The caps are checked
+        again: other submissions may have been admitted since check().
+        """
+        self._check_caps(submitter, browser)
+        self._inflight[run_id] = (submitter, browser)
+        self._per_submitter[submitter] += 1
+        self._per_browser[browser] += 1
+
+    def release(self, run_id: int) -> None:
+        """Frees the run's share of the caps. No-op for unknown runs."""
+        entry = self._inflight.pop(run_id, None)
+        if entry is None:
+            return
+
+        submitter, browser = entry
+        for counter, key in (
+            (self._per_submitter, submitter),
+            (self._per_browser, browser),
+        ):
+            counter[key] -= 1
+            # Keeps the counters from growing with every submitter ever seen
+            if counter[key] <= 0:
+                del counter[key]
+
+    def sync(self, in_flight: Iterable[tuple[int, str | None, str]]) -> None:
+        """
+        Replaces the tracked runs with (run ID, submitter, browser) rows read
+        from the database, when runs are executed by other processes.
+        """
+        self._inflight = {
+            run_id: (submitter or "", browser)
+            for run_id, submitter, browser in in_flight
+        }
+        self._per_submitter = Counter(entry[0] for entry in self._inflight.values())
+        self._per_browser = Counter(entry[1] for entry in self._inflight.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "saturated": self.saturated,
+            "in_flight": len(self._inflight),
+            "queue_utilization": round(self.queue.depth / self.queue.max_depth, 3),
+            "browsers": dict(self._per_browser),
+            "submitters": len(self._per_submitter),
+            "rate_tokens": round(self._bucket.available, 2),
+        }
+
+    def _check_caps(self, submitter: str, browser: str) -> None:
+        if self._per_browser[browser] >= self.max_per_browser:
+            raise AdmissionRejectedError(
+                f"Too many {browser} runs in flight ({self.max_per_browser})",
+                HTTP_SERVICE_UNAVAILABLE,
+                self.retry_after,
+            )
+
+        if self._per_submitter[submitter] >= self.max_per_submitter:
+            raise AdmissionRejectedError(
+                f"Submitter '{submitter}' has {self.max_per_submitter} runs in flight",
+                HTTP_TOO_MANY_REQUESTS,
+                self.retry_after,
+            )
@@ -0,0 +1,67 @@
+import asyncio
+import contextlib
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+from app.db import SessionLocal, repository
+
+InFlightHandler = Callable[[list[tuple[int, str | None, str]]], None]
+
+
+class ClusterQueue:
+    """
+    API-side view of the distributed run queue (RUNNER_QUEUE_BACKEND=postgres).
+    Refreshed from the database every `interval` seconds, it stands in for
+    the in-process JobQueue in admission control and /health.
+    """
+
+    def __init__(self, max_depth: int, interval: float) -> None:
+        self.max_depth = max_depth
+        self.interval = interval
+        self._load: dict[str, Any] = {"queued": 0}
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def depth(self) -> int:
+        return int(self._load["queued"])
+
+    @property
+    def is_full(self) -> bool:
+        return self.depth >= self.max_depth
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._load, "max_queue_depth": self.max_depth}
+
+    async def refresh(self) -> list[tuple[int, str | None, str]]:
+        """Reloads the queue load; returns the runs currently in flight."""
+        load, in_flight = await asyncio.to_thread(self._read)
+        self._load = load
+        return in_flight
+
+    async def start(self, on_refresh: InFlightHandler) -> None:
+        on_refresh(await self.refresh())
+        self._task = asyncio.create_task(self._watch(on_refresh), name="cluster-queue")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    @staticmethod
+    def _read() -> tuple[dict[str, Any], list[tuple[int, str | None, str]]]:
+        with SessionLocal() as db:
+            return repository.queue_load(db), repository.in_flight_runs(db)
+
+    async def _watch(self, on_refresh: InFlightHandler) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                on_refresh(await self.refresh())
+            except Exception as e:
+                logger.error(f"Failed to refresh distributed queue load: {e}")
@@ -0,0 +1,519 @@
+import asyncio
+import os
+import shlex
+import signal
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol, cast
+
+from loguru import logger
+
+from app import metrics
+from app.db import SessionLocal, repository
+from app.runner.logs import LogBuffer, LogSink, PrefixedLog
+from app.runner.report import REPORT_OPTION, NodeResult, load_report, node_target
+from app.runner.sharding import plan_shards
+from app.schemas import (
+    AttemptSummary,
+    RequestTimingSummary,
+    RunStatus,
+    RunSummary,
+    TestRunRequest,
+)
+
+# pytest.ExitCode values, kept local so the API process never imports pytest
+PYTEST_EXIT_OK = 0
+PYTEST_EXIT_TESTS_FAILED = 1
+PYTEST_EXIT_NO_TESTS = 5
+
+# Longest single output line accepted from pytest before the stream errors out
+STREAM_LINE_LIMIT = 1024 * 1024
+
+# Output lines of the collection pass replayed into the run log if it fails
+COLLECT_LOG_TAIL = 50
+
+# Tells the pytest processes of a run which run their results belong to
+RUN_ID_ENV = "QA_RUN_ID"
+
+# Seconds a killed run gets to exit on SIGTERM before its group is SIGKILLed
+TERMINATE_GRACE = 5.0
+TERMINATE_POLL_INTERVAL = 0.1
+
+
+def build_pytest_args(
+    request: TestRunRequest,
+    targets: Sequence[str] | None = None,
+    rootdir: str | None = None,
+) -> list[str]:
+    """
+    Translates a run request into pytest command line arguments.
+    `targets` replaces the suite path, e.g. with the node IDs of one shard;
+    `rootdir` pins node IDs to those of the run that produced the targets.
+    """
+    args = [
+        *(targets if targets is not None else [request.test_suite]),
+        "--alluredir",
+        "allure-results",
+    ]
+
+    args.extend(["--browser", request.browser])
+
+    if not request.headless:
+        args.append("--headed")
+
+    if rootdir:
+        args.append(f"--rootdir={rootdir}")
+
+    return args
+
+
+def report_args(path: Path) -> list[str]:
+    """
+    Arguments every pytest process of a run gets from the orchestrator: the
+    plugin writing its report to `path`, and coverage off. Processes started
+    from this checkout inherit its `--cov` addopts, and concurrent ones
+    would corrupt each other's .coverage data file.
+    """
+    return ["-p", "app.runner.plugin", f"{REPORT_OPTION}={path}", "--no-cov"]
+
+
+def signal_process_group(pgid: int, sig: int) -> bool:
+    """Sends `sig` to every process in a group. False if the group is gone."""
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def terminate_process_group(pgid: int, grace: float = TERMINATE_GRACE) -> None:
+    """
+    Stops pytest together with everything it spawned, browsers included:
+    SIGTERM to the whole group, then SIGKILL for whatever outlives `grace`.
+    """
+    if not signal_process_group(pgid, signal.SIGTERM):
+        return
+
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        await asyncio.sleep(TERMINATE_POLL_INTERVAL)
+        if not signal_process_group(pgid, 0):
+            return
+
+    logger.warning(f"Process group {pgid} ignored SIGTERM, killing it")
+    signal_process_group(pgid, signal.SIGKILL)
+
+
+class Launcher(Protocol):
+    """Strategy that executes one pytest invocation and streams its output."""
+
+    async def run(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        """Runs pytest with `args` and returns its exit code."""
+        ...
+
+
+class ColdLauncher:
+    """
+    Spawns a fresh `pytest` interpreter for every invocation.
+    `max_concurrency` caps simultaneous processes, shards included.
+    Each interpreter leads its own process group, torn down as a whole.
+    """
+
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def run(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        if self._slots is None:
+            return await self._spawn(args, env, log)
+
+        async with self._slots:
+            return await self._spawn(args, env, log)
+
+    async def _spawn(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        # `-m` puts the working directory on sys.path, so the orchestrator's
+        # own plugin (app.runner.plugin) imports for suites anywhere on disk.
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "pytest",
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env={**os.environ, **env, "PYTHONUNBUFFERED": "1"},
+            limit=STREAM_LINE_LIMIT,
+            start_new_session=True,
+        )
+        metrics.SPAWN_LATENCY.observe(time.perf_counter() - started, launcher="cold")
+
+        try:
+            stdout = cast(asyncio.StreamReader, process.stdout)
+            async for raw_line in stdout:
+                await log.append(raw_line.decode(errors="replace").rstrip("\r\n"))
+
+            return await process.wait()
+        finally:
+            # pytest is still running if the run was cancelled or timed out,
+            # and browsers it launched can outlive it even on a normal exit.
+            await terminate_process_group(process.pid)
+
+
+class ShardLauncher:
+    """
+    Runs the shard processes of sharded runs through `launcher`, at most
+    `max_processes` at a time across all runs. Shards thus have processes
+    of their own instead of queueing for the RUNNER_WORKERS run slots; the
+    launcher must have room for both.
+    """
+
+    def __init__(self, launcher: Launcher, max_processes: int) -> None:
+        self.launcher = launcher
+        self.max_processes = max_processes
+        self._slots = asyncio.Semaphore(max_processes)
+
+    async def run(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        async with self._slots:
+            return await self.launcher.run(args, env, log)
+
+
+@dataclass(slots=True)
+class RunOutcome:
+    """Merged result of every pytest process that made up one run."""
+
+    exit_code: int | None
+    results: dict[str, NodeResult] = field(default_factory=dict)
+    rootdir: str = ""
+    attempts: list[AttemptSummary] = field(default_factory=list)
+    # metrics.HTTP_CLIENT_PHASES snapshots of every pytest process of the run
+    client_phases: list[dict[str, Any]] = field(default_factory=list)
+    # CANCELLED or TIMED_OUT when the run was stopped before pytest finished
+    interrupted: RunStatus | None = None
+
+    @property
+    def status(self) -> RunStatus:
+        return self.interrupted or status_from_exit_code(self.exit_code)
+
+    @property
+    def total_tests(self) -> int:
+        return len(self.results)
+
+    @property
+    def failed_tests(self) -> list[str]:
+        return [
+            nodeid
+            for nodeid, result in self.results.items()
+            if result.outcome == "failed"
+        ]
+
+    def failed_targets(self) -> list[str]:
+        return [node_target(self.rootdir, nodeid) for nodeid in self.failed_tests]
+
+    def summary(self) -> RunSummary:
+        return RunSummary(
+            exit_code=self.exit_code,
+            total_tests=self.total_tests,
+            failed_tests=len(self.failed_tests),
+            attempts=list(self.attempts),
+            request_timings=summarize_phases(self.client_phases),
+        )
+
+    def add_attempt(self, attempt: int, result: "RunOutcome", started: float) -> None:
+        """Merges the outcome of one attempt, which supersedes earlier ones."""
+        self.exit_code = result.exit_code
+        self.rootdir = result.rootdir or self.rootdir
+        self.results.update(result.results)
+        self.client_phases.extend(result.client_phases)
+        self.attempts.append(
+            AttemptSummary(
+                attempt=attempt,
+                exit_code=result.exit_code,
+                total_tests=result.total_tests,
+                failed_tests=len(result.failed_tests),
+                duration=time.monotonic() - started,
+            )
+        )
+
+
+def status_from_exit_code(exit_code: int | None) -> RunStatus:
+    """Maps a pytest exit code onto the run lifecycle."""
+    if exit_code == PYTEST_EXIT_OK:
+        return RunStatus.PASSED
+    if exit_code == PYTEST_EXIT_TESTS_FAILED:
+        return RunStatus.FAILED
+    return RunStatus.ERROR
+
+
+def summarize_phases(snapshots: list[dict[str, Any]]) -> list[RequestTimingSummary]:
+    """Count and percentiles per method, endpoint and phase over the snapshots."""
+    phases = metrics.Histogram(
+        metrics.HTTP_CLIENT_PHASES.name,
+        metrics.HTTP_CLIENT_PHASES.documentation,
+        metrics.HTTP_CLIENT_PHASES.labelnames,
+        buckets=metrics.PHASE_BUCKETS,
+    )
+    phases.merge(snapshots)
+
+    return [
+        RequestTimingSummary(
+            **labels,
+            count=phases.count(**labels),
+            p50=phases.quantile(0.5, **labels),
+            p95=phases.quantile(0.95, **labels),
+            p99=phases.quantile(0.99, **labels),
+        )
+        for labels in phases.labelsets()
+    ]
+
+
+def merge_exit_codes(codes: Sequence[int | None]) -> int | None:
+    """Worst-of merge: infra errors, then interruptions, then failures."""
+    if any(code is None for code in codes):
+        return None
+
+    present = [cast(int, code) for code in codes]
+    errors = [
+        code
+        for code in present
+        if code not in (PYTEST_EXIT_OK, PYTEST_EXIT_TESTS_FAILED, PYTEST_EXIT_NO_TESTS)
+    ]
+    if errors:
+        return errors[0]
+    if PYTEST_EXIT_TESTS_FAILED in present:
+        return PYTEST_EXIT_TESTS_FAILED
+    if PYTEST_EXIT_OK in present:
+        return PYTEST_EXIT_OK
+    return PYTEST_EXIT_NO_TESTS
+
+
+def suite_label(test_suite: str) -> str:
+    """The suite path of `test_suite`, without node ID selectors."""
+    return os.path.normpath(test_suite.partition("::")[0])
+
+
+def _record_metrics(
+    request: TestRunRequest, outcome: RunOutcome, duration: float
+) -> None:
+    metrics.RUNS.inc(status=outcome.status)
+    suite = metrics.RUN_DURATION_SUITES(suite_label(request.test_suite))
+    metrics.RUN_DURATION.observe(duration, suite=suite, browser=request.browser)
+    for result in outcome.results.values():
+        metrics.TESTS.inc(outcome=result.outcome)
+
+
+def _load_durations(node_names: dict[str, str]) -> dict[str, float]:
+    with SessionLocal() as db:
+        by_name = repository.average_durations(db, set(node_names.values()))
+
+    return {
+        nodeid: by_name[name] for nodeid, name in node_names.items() if name in by_name
+    }
+
+
+async def _run_once(
+    args: list[str],
+    log: LogSink,
+    launcher: Launcher,
+    report_path: Path,
+    env: dict[str, str],
+) -> RunOutcome:
+    exit_code = await launcher.run([*args, *report_args(report_path)], env, log)
+    report = load_report(report_path)
+    if report is None:
+        return RunOutcome(exit_code)
+    metrics.HTTP_CLIENT_LATENCY.merge(report.client_latency)
+    metrics.HTTP_CLIENT_PHASES.merge(report.client_phases)
+    return RunOutcome(
+        exit_code, report.results, report.rootdir, client_phases=report.client_phases
+    )
+
+
+async def _run_sharded(
+    request: TestRunRequest,
+    log: LogSink,
+    shard_launcher: ShardLauncher,
+    workdir: Path,
+    env: dict[str, str],
+) -> RunOutcome:
+    collect_log = LogBuffer(max_lines=COLLECT_LOG_TAIL)
+    collect_path = workdir / "collect.json"
+    exit_code = await shard_launcher.launcher.run(
+        [*build_pytest_args(request), "--collect-only", *report_args(collect_path)],
+        env,
+        collect_log,
+    )
+    collection = load_report(collect_path)
+
+    if exit_code != PYTEST_EXIT_OK or collection is None:
+        for _, line in collect_log.snapshot():
+            await log.append(f"[collect] {line}")
+        return RunOutcome(exit_code)
+
+    names = {nodeid: nodeid.rpartition("::")[2] for nodeid in collection.collected}
+    durations = await asyncio.to_thread(_load_durations, names)
+    # More shards than processes would run in waves, the last one serially
+    shards = request.shards
+    if shards > shard_launcher.max_processes:
+        shards = shard_launcher.max_processes
+        await log.append(
+            f"[orchestrator] {request.shards} shards requested, "
+            f"capped at {shards} shard processes"
+        )
+    groups = plan_shards(collection.collected, durations, shards)
+
+    await log.append(
+        f"[orchestrator] {len(collection.collected)} tests split into "
+        f"{len(groups)} shards by historical duration"
+    )
+
+    outcomes = await asyncio.gather(
+        *(
+            _run_once(
+                build_pytest_args(
+                    request,
+                    targets=[node_target(collection.rootdir, node) for node in group],
+                    rootdir=collection.rootdir,
+                ),
+                PrefixedLog(log, f"[shard {index}] "),
+                shard_launcher,
+                workdir / f"shard-{index}.json",
+                env,
+            )
+            for index, group in enumerate(groups)
+        )
+    )
+
+    merged = RunOutcome(
+        merge_exit_codes([outcome.exit_code for outcome in outcomes]),
+        rootdir=collection.rootdir,
+    )
+    for outcome in outcomes:
+        merged.results.update(outcome.results)
+        merged.client_phases.extend(outcome.client_phases)
+    return merged
+
+
+async def _run_with_retries(  # noqa: PLR0913
+    request: TestRunRequest,
+    log: LogSink,
+    shard_launcher: ShardLauncher,
+    workdir: Path,
+    env: dict[str, str],
+    outcome: RunOutcome,
+) -> None:
+    """
+    Runs the suite, then reruns only the tests that failed in the previous
+    attempt, up to `request.retries` times, in one process each through the
+    launcher behind `shard_launcher`. Every finished attempt is merged into
+    `outcome` at once, so it survives the run being stopped later on.
+    """
+    launcher = shard_launcher.launcher
+    started = time.monotonic()
+    if request.shards > 1:
+        first = await _run_sharded(request, log, shard_launcher, workdir, env)
+    else:
+        first = await _run_once(
+            build_pytest_args(request), log, launcher, workdir / "attempt-1.json", env
+        )
+    outcome.add_attempt(1, first, started)
+
+    for attempt in range(2, request.retries + 2):
+        failed = outcome.failed_tests
+        if outcome.exit_code != PYTEST_EXIT_TESTS_FAILED or not failed:
+            break
+
+        await log.append(
+            f"[orchestrator] attempt {attempt}: rerunning {len(failed)} failed tests"
+        )
+        started = time.monotonic()
+        rerun = await _run_once(
+            build_pytest_args(
+                request, targets=outcome.failed_targets(), rootdir=outcome.rootdir
+            ),
+            PrefixedLog(log, f"[attempt {attempt}] "),
+            launcher,
+            workdir / f"attempt-{attempt}.json",
+            env,
+        )
+        outcome.add_attempt(attempt, rerun, started)
+
+
+async def run_pytest_worker(  # noqa: PLR0913
+    request: TestRunRequest,
+    log: LogBuffer,
+    launcher: Launcher,
+    run_id: int | None = None,
+    shard_launcher: ShardLauncher | None = None,
+    outcome: RunOutcome | None = None,
+) -> RunOutcome:
+    """
+    Executes pytest for the request through the given launcher, split across
+    `request.shards` parallel processes when asked to, retrying failed tests.
+    Output is read incrementally into the run's log buffer as it is produced.
+    The exit code is None if the run failed for infra reasons.
+
+    Past `request.timeout_seconds` every pytest process group of the run is
+    killed and the outcome is TIMED_OUT, with the attempts finished before.
+    Cancelling the calling task kills them the same way before
+    CancelledError propagates; pass in `outcome` to keep the attempts
+    finished before, as attempts are merged into it as they finish.
+
+    With `run_id` the test results the processes store are tagged with it.
+    Shard processes go through `shard_launcher` when given, and a run gets
+    no more shards than it has processes.
+    """
+    logger.info(
+        f"START: Test run sequence | Suite: {request.test_suite} | "
+        f"Browser: {request.browser} | Shards: {request.shards}"
+    )
+
+    logger.debug(f"EXEC: pytest {shlex.join(build_pytest_args(request))}")
+
+    env = {} if run_id is None else {RUN_ID_ENV: str(run_id)}
+    shard_launcher = shard_launcher or ShardLauncher(launcher, request.shards)
+    started = time.monotonic()
+    outcome = outcome or RunOutcome(exit_code=None)
+    deadline = asyncio.timeout(request.timeout_seconds)
+    try:
+        with tempfile.TemporaryDirectory(prefix="qa-run-") as tmp:
+            async with deadline:
+                await _run_with_retries(
+                    request, log, shard_launcher, Path(tmp), env, outcome
+                )
+    except asyncio.CancelledError:
+        logger.warning("CANCELLED: Run stopped, pytest processes killed.")
+        await log.append("[orchestrator] run cancelled")
+        # Attempts that finished before stay in the caller's outcome; the run
+        # itself has no exit code
+        outcome.exit_code = None
+        outcome.interrupted = RunStatus.CANCELLED
+        raise
+    except Exception as e:
+        if deadline.expired():
+            logger.error(f"TIMEOUT: Run exceeded {request.timeout_seconds}s.")
+            await log.append(
+                f"[orchestrator] run killed after {request.timeout_seconds}s timeout"
+            )
+            outcome.exit_code = None
+            outcome.interrupted = RunStatus.TIMED_OUT
+            return outcome
+
+        logger.critical(f"INFRA ERROR: Subprocess failure: {e}")
+        outcome.exit_code = None
+        return outcome
+    finally:
+        await log.close()
+        _record_metrics(request, outcome, time.monotonic() - started)
+
+    if outcome.exit_code == PYTEST_EXIT_OK:
+        logger.info("FINISH: All tests passed successfully.")
+    elif outcome.exit_code == PYTEST_EXIT_TESTS_FAILED:
+        logger.warning("FINISH: Test execution completed with failures.")
+    else:
+        logger.error(f"FINISH: Execution interrupted. Error code: {outcome.exit_code}")
+
+    return outcome
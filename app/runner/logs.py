@@ -0,0 +1,115 @@
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from functools import partial
+from itertools import islice
+from typing import Protocol
+
+
+class LogSink(Protocol):
+    """Anything run output lines can be written to."""
+
+    async def append(self, line: str) -> None: ...
+
+
+class LogBuffer:
+    """
+    Bounded ring buffer of output lines for one run.
+    Memory stays flat regardless of suite length: only the newest
+    `max_lines` lines are retained, older ones are dropped.
+    """
+
+    def __init__(self, max_lines: int) -> None:
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._next_seq = 0
+        self._changed = asyncio.Condition()
+        self.closed = False
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest line still held in the buffer."""
+        return self._next_seq - len(self._lines)
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    async def append(self, line: str) -> None:
+        async with self._changed:
+            self._lines.append(line)
+            self._next_seq += 1
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        async with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+    def _readable(self, cursor: int) -> bool:
+        return self.closed or self._next_seq > cursor
+
+    def snapshot(self, start: int = 0) -> list[tuple[int, str]]:
+        """Returns buffered (seq, line) pairs with seq >= start."""
+        first = self.first_seq
+        offset = max(start - first, 0)
+        return [
+            (first + offset + index, line)
+            for index, line in enumerate(islice(self._lines, offset, None))
+        ]
+
+    async def follow(self, start: int = 0) -> AsyncIterator[tuple[int, str]]:
+        """
+        Yields (seq, line) pairs from `start` onwards, waiting for new output
+        until the buffer is closed. Lines evicted before being read are skipped.
+        """
+        cursor = start
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(partial(self._readable, cursor))
+                pending = self.snapshot(cursor)
+                finished = self.closed
+
+            for entry in pending:
+                yield entry
+
+            if pending:
+                cursor = pending[-1][0] + 1
+            elif finished:
+                return
+
+
+class PrefixedLog:
+    """Tags every line written through it, e.g. with the shard it came from."""
+
+    def __init__(self, sink: LogSink, prefix: str) -> None:
+        self._sink = sink
+        self._prefix = prefix
+
+    async def append(self, line: str) -> None:
+        await self._sink.append(f"{self._prefix}{line}")
+
+
+class LogHub:
+    """
+    Registry of live and recently finished run log buffers.
+    Finished buffers beyond `retained_runs` are evicted oldest-first.
+    """
+
+    def __init__(self, max_lines: int, retained_runs: int) -> None:
+        self.max_lines = max_lines
+        self.retained_runs = retained_runs
+        self._buffers: OrderedDict[int, LogBuffer] = OrderedDict()
+
+    def open(self, run_id: int) -> LogBuffer:
+        buffer = LogBuffer(self.max_lines)
+        self._buffers[run_id] = buffer
+        self._evict()
+        return buffer
+
+    def get(self, run_id: int) -> LogBuffer | None:
+        return self._buffers.get(run_id)
+
+    def _evict(self) -> None:
+        finished = [run_id for run_id, buf in self._buffers.items() if buf.closed]
+        for run_id in finished[: max(len(finished) - self.retained_runs, 0)]:
+            del self._buffers[run_id]
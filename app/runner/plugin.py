@@ -0,0 +1,83 @@
+"""
+pytest plugin injected by the orchestrator into every run (-p app.runner.plugin).
+
+With --qa-report=PATH it writes the collected node IDs and the final outcome
+and duration of every test to PATH as JSON when the session finishes. The
+orchestrator reads it back to plan shards, merge shard results and pick the
+failed tests to retry. Latency of the requests the API clients sent during
+the session is included, overall and per phase, for the orchestrator's
+/metrics and the run's timing breakdown.
+"""
+
+import json
+from collections.abc import Generator
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app import metrics
+from app.runner.report import REPORT_OPTION, NodeResult, PytestReport
+
+
+def portable_nodeid(item: pytest.Item) -> str:
+    """
+    The item's node ID, with the file part rebuilt from its path when pytest
+    left it empty (it does for files outside rootdir). Such IDs could not be
+    selected again on a rerun, and would collide across files.
+    """
+    path, separator, names = item.nodeid.partition("::")
+    return f"{path or item.path}{separator}{names}"
+
+
+class ReportCollector:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.report = PytestReport()
+
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        self.report.rootdir = str(session.config.rootpath)
+        self.report.collected = [portable_nodeid(item) for item in session.items]
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_runtest_makereport(
+        self, item: pytest.Item, call: pytest.CallInfo[None]
+    ) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+        report = yield
+        nodeid = portable_nodeid(item)
+        result = self.report.results.setdefault(nodeid, NodeResult(name=item.name))
+        result.duration += report.duration
+
+        if report.failed:
+            result.outcome = "failed"
+        elif report.skipped and result.outcome == "passed":
+            result.outcome = "skipped"
+
+        return report
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        payload: dict[str, Any] = {
+            "rootdir": self.report.rootdir,
+            "collected": self.report.collected,
+            "results": {
+                nodeid: asdict(result) for nodeid, result in self.report.results.items()
+            },
+            "client_latency": metrics.HTTP_CLIENT_LATENCY.snapshot(),
+            "client_phases": metrics.HTTP_CLIENT_PHASES.snapshot(),
+        }
+        self.path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        REPORT_OPTION,
+        default=None,
+        help="Write collected node IDs and outcomes as JSON to this path",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption(REPORT_OPTION)
+    if path:
+        config.pluginmanager.register(ReportCollector(Path(path)), "qa-report")
@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import cast
+
+from loguru import logger
+
+from app import metrics
+from app.runner.executor import STREAM_LINE_LIMIT, terminate_process_group
+from app.runner.logs import LogSink
+
+# Marks zygote control lines on its stdout (see app.runner.zygote)
+CONTROL_PREFIX = "\x1eqa-zygote:"
+
+ZYGOTE_START_TIMEOUT = 60.0
+ZYGOTE_STOP_TIMEOUT = 5.0
+RESPAWN_MAX_DELAY = 30.0
+
+
+class ZygoteError(RuntimeError):
+    """Raised when a pre-warmed runner process dies or breaks protocol."""
+
+
+class WarmWorker:
+    """
+    Orchestrator-side handle of one pre-warmed pytest runner process.
+    Jobs are sent over the process stdin pipe; output and control messages
+    come back over its stdout pipe.
+    """
+
+    def __init__(self, max_runs: int) -> None:
+        self.max_runs = max_runs
+        self.runs = 0
+        self.child_pid: int | None = None
+        self._process: asyncio.subprocess.Process | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.runs >= self.max_runs
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "app.runner.zygote",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+            limit=STREAM_LINE_LIMIT,
+        )
+
+        kind, _ = await asyncio.wait_for(
+            self._read_control(), timeout=ZYGOTE_START_TIMEOUT
+        )
+        if kind != "ready":
+            raise ZygoteError(f"Unexpected zygote handshake: {kind}")
+
+    async def run(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        process = self._require_process()
+        stdin = cast(asyncio.StreamWriter, process.stdin)
+
+        self.runs += 1
+        sent = time.perf_counter()
+        stdin.write(json.dumps({"args": args, "env": env}).encode() + b"\n")
+        await stdin.drain()
+
+        try:
+            return await self._follow_job(process, log, sent)
+        except asyncio.CancelledError:
+            await self._abort_job(process)
+            raise
+
+    async def _follow_job(
+        self, process: asyncio.subprocess.Process, log: LogSink, sent: float
+    ) -> int:
+        stdout = cast(asyncio.StreamReader, process.stdout)
+        async for raw_line in stdout:
+            line = raw_line.decode(errors="replace").rstrip("\r\n")
+
+            if not line.startswith(CONTROL_PREFIX):
+                await log.append(line)
+                continue
+
+            kind, value = self._parse_control(line)
+            if kind == "pid":
+                self.child_pid = value
+                metrics.SPAWN_LATENCY.observe(
+                    time.perf_counter() - sent, launcher="warm"
+                )
+            elif kind == "exit":
+                # As with cold runs, browsers the suite launched can outlive it
+                if self.child_pid is not None:
+                    await terminate_process_group(self.child_pid)
+                self.child_pid = None
+                return value
+
+        raise ZygoteError("Zygote process exited in the middle of a run")
+
+    async def _abort_job(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Kills the running job's process group (the forked child leads it).
+        The zygote is killed too: its stdout is mid-job and cannot be reused.
+        """
+        if self.child_pid is None and process.returncode is None:
+            # Cancelled before the zygote reported the child it forked
+            with contextlib.suppress(TimeoutError, ZygoteError):
+                kind, value = await asyncio.wait_for(
+                    self._read_control(), timeout=ZYGOTE_STOP_TIMEOUT
+                )
+                if kind == "pid":
+                    self.child_pid = value
+
+        if self.child_pid is not None:
+            await terminate_process_group(self.child_pid)
+            self.child_pid = None
+
+        if process.returncode is None:
+            process.kill()
+
+    async def close(self) -> None:
+        process = self._process
+        if process is None or process.returncode is not None:
+            return
+
+        cast(asyncio.StreamWriter, process.stdin).close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=ZYGOTE_STOP_TIMEOUT)
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+
+    def _require_process(self) -> asyncio.subprocess.Process:
+        if self._process is None or not self.alive:
+            raise ZygoteError("Zygote process is not running")
+        return self._process
+
+    async def _read_control(self) -> tuple[str, int]:
+        stdout = cast(asyncio.StreamReader, self._require_process().stdout)
+        async for raw_line in stdout:
+            line = raw_line.decode(errors="replace").rstrip("\r\n")
+            if line.startswith(CONTROL_PREFIX):
+                return self._parse_control(line)
+            logger.debug(f"Zygote: {line}")
+
+        raise ZygoteError("Zygote process exited during startup")
+
+    @staticmethod
+    def _parse_control(line: str) -> tuple[str, int]:
+        kind, _, value = line.removeprefix(CONTROL_PREFIX).partition(" ")
+        return kind, int(value)
+
+
+class WarmPool:
+    """
+    Pool of pre-warmed pytest runners, one per concurrent pytest process.
+    Each runner is recycled after `max_runs` jobs, as soon as it dies or when
+    its job is cancelled, and replaced by a fresh one warming up in the
+    background.
+    """
+
+    def __init__(self, size: int, max_runs: int) -> None:
+        self.size = size
+        self.max_runs = max_runs
+        self._idle: asyncio.Queue[WarmWorker] = asyncio.Queue()
+        self._workers: set[WarmWorker] = set()
+        self._spawning: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        await asyncio.gather(*(self._spawn() for _ in range(self.size)))
+        logger.info(f"Warm pool started with {self.size} pre-warmed pytest runners")
+
+    async def stop(self) -> None:
+        for task in self._spawning:
+            task.cancel()
+
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        await asyncio.gather(*(worker.close() for worker in self._workers))
+        self._workers.clear()
+
+    async def run(self, args: list[str], env: dict[str, str], log: LogSink) -> int:
+        worker = await self._idle.get()
+        completed = False
+        try:
+            exit_code = await worker.run(args, env, log)
+            completed = True
+            return exit_code
+        finally:
+            if completed and worker.alive and not worker.exhausted:
+                self._idle.put_nowait(worker)
+            else:
+                await self._retire(worker)
+
+    async def _spawn(self) -> None:
+        worker = WarmWorker(self.max_runs)
+        await worker.start()
+        self._workers.add(worker)
+        self._idle.put_nowait(worker)
+
+    async def _retire(self, worker: WarmWorker) -> None:
+        self._workers.discard(worker)
+        await worker.close()
+
+        task = asyncio.create_task(self._respawn())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _respawn(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._spawn()
+                return
+            except Exception as e:
+                logger.error(f"Failed to start pre-warmed runner: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RESPAWN_MAX_DELAY)
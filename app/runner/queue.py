@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from loguru import logger
+
+from app.exceptions import QueueFullError
+from app.schemas import RunPriority, TestRunRequest
+
+LANE_ORDER: tuple[RunPriority, ...] = (
+    RunPriority.HIGH,
+    RunPriority.NORMAL,
+    RunPriority.LOW,
+)
+
+JobHandler = Callable[["Job"], Coroutine[Any, Any, None]]
+
+
+@dataclass(slots=True)
+class Job:
+    """A queued test run together with its scheduling metadata."""
+
+    run_id: int
+    request: TestRunRequest
+    enqueued_at: float = field(default_factory=time.monotonic)
+    cancelled: bool = False
+
+    @property
+    def priority(self) -> RunPriority:
+        return self.request.priority
+
+
+class JobQueue:
+    """
+    Bounded multi-lane queue of pending test runs.
+    Jobs are served strictly by lane (high -> normal -> low), FIFO within a lane.
+    Cancelled jobs stop counting towards the depth at once and are skipped
+    when they reach the head of their lane.
+    """
+
+    def __init__(self, max_depth: int) -> None:
+        self.max_depth = max_depth
+        self._queue: asyncio.PriorityQueue[tuple[int, int, Job]] = (
+            asyncio.PriorityQueue()
+        )
+        self._sequence = itertools.count()
+        self._lane_depth: Counter[RunPriority] = Counter()
+        self._pending: dict[int, Job] = {}
+        self._depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def lane_depths(self) -> dict[str, int]:
+        return {lane.value: self._lane_depth[lane] for lane in LANE_ORDER}
+
+    @property
+    def is_full(self) -> bool:
+        return self._depth >= self.max_depth
+
+    def submit(self, run_id: int, request: TestRunRequest) -> Job:
+        """Enqueues a run without waiting. Raises QueueFullError at capacity."""
+        if self.is_full:
+            raise QueueFullError(f"Run queue is full ({self.max_depth} pending runs)")
+
+        job = Job(run_id=run_id, request=request)
+        self._queue.put_nowait(
+            (LANE_ORDER.index(job.priority), next(self._sequence), job)
+        )
+        self._pending[run_id] = job
+        self._lane_depth[job.priority] += 1
+        self._depth += 1
+        return job
+
+    def cancel(self, run_id: int) -> bool:
+        """Withdraws a pending run. False if it is not waiting in the queue."""
+        job = self._pending.pop(run_id, None)
+        if job is None:
+            return False
+
+        job.cancelled = True
+        self._lane_depth[job.priority] -= 1
+        self._depth -= 1
+        return True
+
+    async def next_job(self) -> Job:
+        while True:
+            _, _, job = await self._queue.get()
+            if not job.cancelled:
+                break
+            self._queue.task_done()
+
+        if self._pending.get(job.run_id) is job:
+            del self._pending[job.run_id]
+        self._lane_depth[job.priority] -= 1
+        self._depth -= 1
+        return job
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        """Blocks until every submitted job has been processed."""
+        await self._queue.join()
+
+
+class WorkerPool:
+    """
+    Fixed number of asyncio workers draining a JobQueue.
+    The worker count is the hard cap on concurrently executing test runs.
+    Every job runs in its own task, so a single run can be cancelled while
+    its worker moves straight on to the next job.
+    """
+
+    def __init__(self, queue: JobQueue, workers: int, handler: JobHandler) -> None:
+        self.queue = queue
+        self.size = workers
+        self._handler = handler
+        self._tasks: list[asyncio.Task[None]] = []
+        self._running: dict[int, asyncio.Task[None]] = {}
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.size,
+            "active": self._active,
+            "queued": self.queue.depth,
+            "max_queue_depth": self.queue.max_depth,
+            "lanes": self.queue.lane_depths(),
+        }
+
+    async def cancel(self, run_id: int) -> bool:
+        """
+        Cancels a run that is currently executing and waits until its handler
+        has finished tearing it down. False if no worker is running it.
+        """
+        task = self._running.get(run_id)
+        if task is None:
+            return False
+
+        task.cancel()
+        await asyncio.wait({task})
+        return True
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"run-worker-{index}")
+            for index in range(self.size)
+        ]
+        logger.info(f"Worker pool started with {self.size} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Worker pool stopped")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self.queue.next_job()
+            self._active += 1
+            wait = time.monotonic() - job.enqueued_at
+            logger.debug(f"Worker {index} picked up job after {wait:.2f}s in queue")
+
+            task = asyncio.create_task(self._handler(job), name=f"run-{job.run_id}")
+            self._running[job.run_id] = task
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Stopping the pool cancels the job with it; a cancelled job
+                # alone leaves this worker free for the next one.
+                if cast(asyncio.Task[None], asyncio.current_task()).cancelling():
+                    raise
+                logger.info(f"Worker {index} cancelled run {job.run_id}")
+            except Exception as e:
+                logger.critical(f"INFRA ERROR: Worker {index} job failure: {e}")
+            finally:
+                if self._running.get(job.run_id) is task:
+                    del self._running[job.run_id]
+                self._active -= 1
+                self.queue.task_done()
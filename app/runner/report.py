@@ -0,0 +1,63 @@
+"""
+JSON report exchanged between app.runner.plugin (inside pytest) and the
+orchestrator. Kept free of pytest imports so the API process stays light.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+REPORT_OPTION = "--qa-report"
+
+
+@dataclass(slots=True)
+class NodeResult:
+    """Final outcome of one test node across its setup/call/teardown phases."""
+
+    name: str
+    outcome: str = "passed"
+    duration: float = 0.0
+
+
+@dataclass(slots=True)
+class PytestReport:
+    rootdir: str = ""
+    collected: list[str] = field(default_factory=list)
+    results: dict[str, NodeResult] = field(default_factory=dict)
+    # metrics.HTTP_CLIENT_LATENCY snapshot of the pytest process
+    client_latency: list[dict[str, Any]] = field(default_factory=list)
+    # metrics.HTTP_CLIENT_PHASES snapshot of the pytest process
+    client_phases: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> list[str]:
+        return [
+            nodeid
+            for nodeid, result in self.results.items()
+            if result.outcome == "failed"
+        ]
+
+
+def load_report(path: Path) -> PytestReport | None:
+    """Reads a report written by app.runner.plugin; None if none was written."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    return PytestReport(
+        rootdir=data["rootdir"],
+        collected=data["collected"],
+        results={
+            nodeid: NodeResult(**result) for nodeid, result in data["results"].items()
+        },
+        client_latency=data.get("client_latency", []),
+        client_phases=data.get("client_phases", []),
+    )
+
+
+def node_target(rootdir: str, nodeid: str) -> str:
+    """Turns a rootdir-relative node ID into a target usable from any cwd."""
+    path, separator, rest = nodeid.partition("::")
+    return f"{Path(rootdir, path)}{separator}{rest}"
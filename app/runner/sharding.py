@@ -0,0 +1,39 @@
+import heapq
+import statistics
+from collections.abc import Mapping, Sequence
+
+# Weight for tests with no history when nothing else is known either
+DEFAULT_TEST_DURATION = 1.0
+
+
+def plan_shards(
+    node_ids: Sequence[str],
+    durations: Mapping[str, float],
+    shards: int,
+) -> list[list[str]]:
+    """
+    Splits tests into at most `shards` groups of near-equal expected runtime.
+
+    Longest-processing-time-first bin packing: tests are placed, slowest
+    first, on the currently lightest shard. Tests without history are
+    weighted with the median known duration.
+    """
+    shards = min(shards, len(node_ids))
+    if shards <= 0:
+        return []
+
+    known = [duration for duration in durations.values() if duration > 0]
+    fallback = statistics.median(known) if known else DEFAULT_TEST_DURATION
+
+    def weight(node_id: str) -> float:
+        return durations.get(node_id) or fallback
+
+    groups: list[list[str]] = [[] for _ in range(shards)]
+    loads = [(0.0, index) for index in range(shards)]
+
+    for node_id in sorted(node_ids, key=lambda node: (-weight(node), node)):
+        load, index = heapq.heappop(loads)
+        groups[index].append(node_id)
+        heapq.heappush(loads, (load + weight(node_id), index))
+
+    return groups
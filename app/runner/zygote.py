@@ -0,0 +1,120 @@
+"""
+Pre-warmed pytest runner ("zygote") process.
+
+Started by the orchestrator as `python -m app.runner.zygote`. It imports the
+heavy test stack once, then accepts jobs as JSON lines on stdin. Every job is
+executed in a forked child, so each run gets a clean interpreter state while
+skipping the import and configuration cost of a cold `pytest` start.
+
+Protocol (stdout, one line each, prefixed with CONTROL_PREFIX):
+    ready <zygote pid>   - imports done, accepting jobs
+    pid <child pid>      - job started; the child leads its own process group
+    exit <exit code>     - job finished; all child output precedes this line
+Any other stdout/stderr line is output of the running job.
+"""
+
+import importlib
+import json
+import os
+import sys
+import traceback
+from typing import Any
+
+from app.runner.prewarm import CONTROL_PREFIX
+
+# pytest.ExitCode.INTERNAL_ERROR
+INTERNAL_ERROR_EXIT_CODE = 3
+
+PREWARM_MODULES = (
+    "pytest",
+    "_pytest.python",
+    "_pytest.terminal",
+    "pydantic",
+    "pydantic_settings",
+    "sqlalchemy",
+    "sqlalchemy.orm",
+    "psycopg2",
+    "requests",
+    "urllib3",
+    "allure",
+    "allure_pytest.plugin",
+    "loguru",
+    "playwright.sync_api",
+    "pytest_playwright.pytest_playwright",
+    "pytest_cov.plugin",
+    "config.settings",
+    "app.db",
+    "app.clients",
+    "app.schemas",
+)
+
+
+def _emit(kind: str, value: int) -> None:
+    sys.stdout.write(f"{CONTROL_PREFIX}{kind} {value}\n")
+    sys.stdout.flush()
+
+
+def _prewarm() -> None:
+    for module in PREWARM_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+
+
+def _run_child(job: dict[str, Any]) -> int:
+    os.setsid()
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.environ.update(job.get("env", {}))
+
+    # Settings were loaded before fork(), without the job's environment
+    from config.settings import ResultsSettings, settings
+
+    settings.results = ResultsSettings()
+
+    # Connections must never be shared across fork(); the pool starts empty.
+    from app.db import engine
+
+    engine.dispose(close=False)
+
+    import pytest
+
+    return int(pytest.main(job["args"]))
+
+
+def _run_job(job: dict[str, Any]) -> int:
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        code = INTERNAL_ERROR_EXIT_CODE
+        try:
+            code = _run_child(job)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else INTERNAL_ERROR_EXIT_CODE
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    _emit("pid", pid)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+def serve() -> None:
+    _prewarm()
+    _emit("ready", os.getpid())
+
+    for line in sys.stdin:
+        if line.strip():
+            _emit("exit", _run_job(json.loads(line)))
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,16 +1,43 @@
+from app.schemas.analytics import TestDayStats, TestStatsDetail, TestStatsSummary
 from app.schemas.auth import AuthRequest, AuthResponse
-from app.schemas.booking import Booking, BookingDates, BookingResponse
+from app.schemas.booking import (
+    BOOKING_IDS_ADAPTER,
+    Booking,
+    BookingDates,
+    BookingIdEntry,
+    BookingResponse,
+)
 from app.schemas.common import ContentType, HttpMethod
-from app.schemas.run_test import BrowserType, TestRunRequest
+from app.schemas.run_test import (
+    AttemptSummary,
+    BrowserType,
+    RequestTimingSummary,
+    RunPriority,
+    RunRead,
+    RunStatus,
+    RunSummary,
+    TestRunRequest,
+)
 
 __all__ = [
     "HttpMethod",
     "ContentType",
     "TestRunRequest",
+    "AttemptSummary",
     "BrowserType",
+    "RequestTimingSummary",
+    "RunPriority",
+    "RunRead",
+    "RunStatus",
+    "RunSummary",
+    "TestDayStats",
+    "TestStatsDetail",
+    "TestStatsSummary",
     "AuthRequest",
     "AuthResponse",
     "Booking",
     "BookingDates",
+    "BookingIdEntry",
     "BookingResponse",
+    "BOOKING_IDS_ADAPTER",
 ]
@@ -0,0 +1,46 @@
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class TestDayStats(BaseModel):
+    """Outcomes and durations of one test on one day (UTC)."""
+
+    __test__ = False
+
+    day: date
+    executions: int
+    pass_rate: float
+    flips: int
+    p50: float
+    p95: float
+
+
+class TestStatsSummary(BaseModel):
+    """
+    Outcomes and durations of one test over a window of days.
+    Executions are PASSED and FAILED results; skipped ones are left out.
+    A flip is an execution whose outcome differs from the previous one, so
+    `flip_rate` is 0 for a stable test and near 1 for one that alternates.
+    Durations are in seconds, estimated from histogram buckets.
+    """
+
+    __test__ = False
+
+    test_name: str
+    executions: int
+    passed: int
+    failed: int
+    pass_rate: float
+    flips: int
+    flip_rate: float
+    p50: float
+    p95: float
+    last_status: str
+    last_day: date
+
+
+class TestStatsDetail(TestStatsSummary):
+    """Window statistics of one test, with the days they add up from."""
+
+    daily: list[TestDayStats] = Field(default_factory=list)
@@ -1,6 +1,7 @@
 from datetime import date
+from typing import TypedDict
 
-from pydantic import Field, model_validator
+from pydantic import Field, TypeAdapter, model_validator
 
 from app.schemas.common import BaseSchema
 
@@ -28,3 +29,11 @@ class Booking(BaseSchema):
 class BookingResponse(BaseSchema):
     bookingid: int
     booking: Booking
+
+
+class BookingIdEntry(TypedDict):
+    bookingid: int
+
+
+# Built once: a TypeAdapter compiles its validator on construction
+BOOKING_IDS_ADAPTER = TypeAdapter(list[BookingIdEntry])
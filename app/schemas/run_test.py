@@ -1,6 +1,7 @@
+from datetime import datetime
 from enum import StrEnum
 
-from pydantic import BaseModel, Field, PositiveInt
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt
 
 
 class BrowserType(StrEnum):
@@ -11,6 +12,26 @@ class BrowserType(StrEnum):
     WEBKIT = "webkit"
 
 
+class RunPriority(StrEnum):
+    """Queue lanes for pending test runs. Higher lanes are always drained first."""
+
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+class RunStatus(StrEnum):
+    """Lifecycle states of an orchestrated test run."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    PASSED = "passed"
+    FAILED = "failed"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+
 class TestRunRequest(BaseModel):
     """
     Schema representing a request to run automated tests.
@@ -35,5 +56,88 @@ class TestRunRequest(BaseModel):
     retries: PositiveInt = Field(
         default=1,
         le=5,
-        description="Max retries per failed test. Must be positive and <= 5",
+        description=(
+            "Max retries per failed test. Must be positive and <= 5. "
+            "Only tests that failed in the previous attempt are rerun"
+        ),
+    )
+    priority: RunPriority = Field(
+        default=RunPriority.NORMAL,
+        description="Queue lane used to schedule the run",
     )
+    shards: PositiveInt = Field(
+        default=1,
+        le=16,
+        description="Parallel pytest processes the suite is split across",
+    )
+    timeout_seconds: PositiveInt | None = Field(
+        default=None,
+        le=86400,
+        description=(
+            "Wall-clock limit for the whole run, retries included. "
+            "Defaults to RUNNER_DEFAULT_TIMEOUT"
+        ),
+    )
+
+
+class AttemptSummary(BaseModel):
+    """One pytest pass of a run: the initial execution or a rerun of failures."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    attempt: int
+    exit_code: int | None
+    total_tests: int
+    failed_tests: int
+    duration: float
+
+
+class RequestTimingSummary(BaseModel):
+    """
+    Seconds the API requests of a run spent in one phase, per method and
+    endpoint template. Percentiles are estimated from histogram buckets.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    method: str
+    endpoint: str
+    phase: str
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class RunSummary(BaseModel):
+    """Outcome figures recorded on a run once it finishes."""
+
+    exit_code: int | None
+    total_tests: int | None = None
+    failed_tests: int | None = None
+    attempts: list[AttemptSummary] = Field(default_factory=list)
+    request_timings: list[RequestTimingSummary] = Field(default_factory=list)
+
+
+class RunRead(BaseModel):
+    """Public representation of a persisted test run."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    test_suite: str
+    browser: BrowserType
+    headless: bool
+    priority: RunPriority
+    shards: int
+    retries: int
+    timeout_seconds: int | None
+    submitter: str | None
+    status: RunStatus
+    exit_code: int | None
+    total_tests: int | None
+    failed_tests: int | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    attempts: list[AttemptSummary] = Field(default_factory=list)
@@ -0,0 +1,227 @@
+"""
+Distributed worker node, started as `python -m app.worker`.
+
+Claims runs from the Postgres queue that the API fills when
+RUNNER_QUEUE_BACKEND=postgres, and executes them with the same launchers as
+the API process, up to RUNNER_WORKERS at a time. Any number of nodes can
+point at the database configured in DatabaseSettings.
+
+Every node heartbeats the runs it holds. Nodes also reap each other: runs of
+a node silent for RUNNER_HEARTBEAT_TIMEOUT go back to the queue. On SIGTERM
+a node hands its running runs back to the queue before it exits.
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import uuid
+from collections.abc import Callable
+from typing import TypeVar
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, repository
+from app.runner import (
+    ColdLauncher,
+    Launcher,
+    LogHub,
+    RunOutcome,
+    ShardLauncher,
+    WarmPool,
+    run_pytest_worker,
+)
+from app.schemas import RunStatus, TestRunRequest
+from config.logger import configure_logging
+from config.settings import RunnerSettings, settings
+
+T = TypeVar("T")
+
+
+def _in_session(operation: Callable[[Session], T]) -> T:
+    with SessionLocal() as db:
+        return operation(db)
+
+
+class Worker:
+    """One worker node: claims, executes and heartbeats distributed runs."""
+
+    def __init__(self, config: RunnerSettings) -> None:
+        self.config = config
+        self.id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        # A process per run slot, plus the shard processes of sharded runs
+        processes = config.workers + config.shard_processes
+        self.warm_pool = (
+            WarmPool(processes, config.prewarm_max_runs) if config.prewarm else None
+        )
+        self.launcher: Launcher = self.warm_pool or ColdLauncher(processes)
+        self.shard_launcher = ShardLauncher(self.launcher, config.shard_processes)
+        self.log_hub = LogHub(max_lines=config.log_buffer_lines, retained_runs=0)
+        self._running: dict[int, asyncio.Task[None]] = {}
+        # Runs cancelled for another reason than a user asking for it
+        self._handed_back: set[int] = set()
+        self._lost: set[int] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        await self._db(lambda db: repository.register_worker(db, self.id, self.slots))
+        if self.warm_pool is not None:
+            await self.warm_pool.start()
+        logger.info(f"Worker {self.id} serving {self.slots} run slots")
+
+        background = [
+            asyncio.create_task(self._heartbeat(), name="worker-heartbeat"),
+            asyncio.create_task(self._reap(), name="worker-reaper"),
+        ]
+        try:
+            await self._dispatch()
+        finally:
+            await self._hand_back_running()
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+
+            await self._db(lambda db: repository.unregister_worker(db, self.id))
+            if self.warm_pool is not None:
+                await self.warm_pool.stop()
+            logger.info(f"Worker {self.id} stopped")
+
+    @property
+    def slots(self) -> int:
+        return self.config.workers
+
+    async def _db(self, operation: Callable[[Session], T]) -> T:
+        return await asyncio.to_thread(_in_session, operation)
+
+    async def _pause(self, seconds: float) -> None:
+        """Sleeps for `seconds`, waking up early when the node is stopping."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+
+    def _claim(self, db: Session) -> tuple[int, TestRunRequest] | None:
+        run = repository.claim_job(db, self.id)
+        if run is None:
+            return None
+        return run.id, repository.run_request(run)
+
+    async def _next_slot(self, free: asyncio.Semaphore) -> bool:
+        """Waits for a free run slot. False once the node is stopping."""
+        acquire = asyncio.ensure_future(free.acquire())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        await asyncio.wait({acquire, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+
+        if not self._stopping.is_set():
+            return True
+
+        if acquire.cancel():
+            return False
+        free.release()
+        return False
+
+    async def _dispatch(self) -> None:
+        free = asyncio.Semaphore(self.slots)
+        while await self._next_slot(free):
+            try:
+                claimed = await self._db(self._claim)
+            except Exception as e:
+                logger.error(f"Worker {self.id} failed to claim a run: {e}")
+                claimed = None
+
+            if claimed is None:
+                free.release()
+                await self._pause(self.config.poll_interval)
+                continue
+
+            run_id, request = claimed
+            logger.info(f"Worker {self.id} claimed run {run_id}")
+            task = asyncio.create_task(self._execute(run_id, request))
+            self._running[run_id] = task
+            task.add_done_callback(lambda _: free.release())
+
+    async def _execute(self, run_id: int, request: TestRunRequest) -> None:
+        log = self.log_hub.open(run_id)
+        outcome = RunOutcome(exit_code=None)
+        try:
+            await run_pytest_worker(
+                request, log, self.launcher, run_id, self.shard_launcher, outcome
+            )
+        except asyncio.CancelledError:
+            outcome.interrupted = RunStatus.CANCELLED
+            raise
+        finally:
+            del self._running[run_id]
+            await self._settle(run_id, outcome)
+
+    async def _settle(self, run_id: int, outcome: RunOutcome) -> None:
+        if run_id in self._lost:
+            self._lost.discard(run_id)
+            logger.warning(f"Run {run_id} was re-queued away from worker {self.id}")
+        elif run_id in self._handed_back:
+            self._handed_back.discard(run_id)
+            await self._db(lambda db: repository.release_job(db, run_id, self.id))
+        else:
+            await self._db(
+                lambda db: repository.finish_job(
+                    db, run_id, self.id, outcome.status, outcome.summary()
+                )
+            )
+
+    async def _hand_back_running(self) -> None:
+        tasks = list(self._running.items())
+        for run_id, task in tasks:
+            self._handed_back.add(run_id)
+            task.cancel()
+
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.heartbeat_interval)
+            # Only runs claimed before the heartbeat can be judged by it
+            running = set(self._running)
+            try:
+                held, cancelled = await self._db(
+                    lambda db: repository.heartbeat(db, self.id, self.slots)
+                )
+            except Exception as e:
+                logger.error(f"Worker {self.id} heartbeat failed: {e}")
+                continue
+
+            for run_id in running - held:
+                if task := self._running.get(run_id):
+                    self._lost.add(run_id)
+                    task.cancel()
+            for run_id in running & cancelled:
+                if task := self._running.get(run_id):
+                    task.cancel()
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.heartbeat_interval)
+            try:
+                reaped = await self._db(
+                    lambda db: repository.requeue_stale_jobs(
+                        db, self.config.heartbeat_timeout, self.config.max_deliveries
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Worker {self.id} failed to reap stale runs: {e}")
+                continue
+
+            if reaped:
+                logger.warning(f"Re-queued runs of unresponsive workers: {reaped}")
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(Worker(settings.runner).run())
@@ -1,6 +1,8 @@
-from typing import Literal
+import tempfile
+from pathlib import Path
+from typing import Any, Literal
 
-from pydantic import AnyHttpUrl, Field, SecretStr, computed_field
+from pydantic import AnyHttpUrl, Field, SecretStr, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.exceptions import ConfigurationError
@@ -18,6 +20,21 @@ class DatabaseSettings(BaseSettings):
     db_name: str = Field(default="qa_orchestrator_db", validation_alias="POSTGRES_DB")
     host: str = Field(default="localhost", validation_alias="POSTGRES_HOST")
     port: int = Field(default=5432, validation_alias="POSTGRES_PORT")
+    # Per engine, and so per process: the sync and, in the API, the async
+    # engine each hold up to pool_size + max_overflow connections
+    pool_size: int = Field(default=5, ge=1, validation_alias="POSTGRES_POOL_SIZE")
+    max_overflow: int = Field(
+        default=10, ge=0, validation_alias="POSTGRES_MAX_OVERFLOW"
+    )
+    pool_timeout: float = Field(
+        default=30.0, gt=0, validation_alias="POSTGRES_POOL_TIMEOUT"
+    )
+    # Connections older than this are replaced before the server or a
+    # proxy drops them; -1 keeps them forever
+    pool_recycle: int = Field(
+        default=1800, ge=-1, validation_alias="POSTGRES_POOL_RECYCLE"
+    )
+    pool_pre_ping: bool = Field(default=True, validation_alias="POSTGRES_POOL_PRE_PING")
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -31,6 +48,22 @@ class DatabaseSettings(BaseSettings):
             f"@{self.host}:{self.port}/{self.db_name}"
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def async_url(self) -> str:
+        """The same database through the asyncpg driver."""
+        return self.url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    def engine_options(self) -> dict[str, Any]:
+        """Pool keyword arguments shared by the sync and the async engine."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
     model_config = COMMON_CONFIG
 
 
@@ -41,6 +74,168 @@ class BookerSettings(BaseSettings):
     model_config = COMMON_CONFIG
 
 
+class ClientSettings(BaseSettings):
+    connect_timeout: float = Field(
+        default=10.0, gt=0, validation_alias="CLIENT_CONNECT_TIMEOUT"
+    )
+    read_timeout: float = Field(
+        default=30.0, gt=0, validation_alias="CLIENT_READ_TIMEOUT"
+    )
+    max_connections: int = Field(
+        default=100, ge=1, validation_alias="CLIENT_MAX_CONNECTIONS"
+    )
+    max_keepalive: int = Field(
+        default=20, ge=0, validation_alias="CLIENT_MAX_KEEPALIVE"
+    )
+    keepalive_expiry: float = Field(
+        default=5.0, ge=0, validation_alias="CLIENT_KEEPALIVE_EXPIRY"
+    )
+    concurrency: int = Field(default=50, ge=1, validation_alias="CLIENT_CONCURRENCY")
+    pool_connections: int = Field(
+        default=10, ge=1, validation_alias="CLIENT_POOL_CONNECTIONS"
+    )
+    pool_maxsize: int = Field(default=10, ge=1, validation_alias="CLIENT_POOL_MAXSIZE")
+    pool_block: bool = Field(default=False, validation_alias="CLIENT_POOL_BLOCK")
+    thread_safe: bool = Field(default=False, validation_alias="CLIENT_THREAD_SAFE")
+    reporting: Literal["full", "sampled", "off"] = Field(
+        default="full", validation_alias="CLIENT_REPORTING"
+    )
+    reporting_sample_every: int = Field(
+        default=100, ge=1, validation_alias="CLIENT_REPORTING_SAMPLE_EVERY"
+    )
+    cache_size: int = Field(default=0, ge=0, validation_alias="CLIENT_CACHE_SIZE")
+    cache_ttl: float = Field(default=30.0, gt=0, validation_alias="CLIENT_CACHE_TTL")
+    breaker_threshold: int = Field(
+        default=5, ge=1, validation_alias="CLIENT_BREAKER_THRESHOLD"
+    )
+    breaker_reset_timeout: float = Field(
+        default=30.0, gt=0, validation_alias="CLIENT_BREAKER_RESET_TIMEOUT"
+    )
+    retry_budget_ratio: float = Field(
+        default=0.2, ge=0, le=1, validation_alias="CLIENT_RETRY_BUDGET_RATIO"
+    )
+    retry_budget_reserve: int = Field(
+        default=10, ge=0, validation_alias="CLIENT_RETRY_BUDGET_RESERVE"
+    )
+    token_ttl: float = Field(default=1800.0, gt=0, validation_alias="CLIENT_TOKEN_TTL")
+    token_cache: Path | None = Field(
+        default=Path(tempfile.gettempdir()) / "qa_orchestrator_tokens.json",
+        validation_alias="CLIENT_TOKEN_CACHE",
+    )
+    validate_listings: bool = Field(
+        default=True, validation_alias="CLIENT_VALIDATE_LISTINGS"
+    )
+    cassette_mode: Literal["passthrough", "record", "replay"] = Field(
+        default="passthrough", validation_alias="CLIENT_CASSETTE_MODE"
+    )
+    # Not committed: written by `make test-record` against a live target
+    cassette: Path = Field(
+        default=Path("tests/cassettes/booker.json"),
+        validation_alias="CLIENT_CASSETTE",
+    )
+
+    model_config = COMMON_CONFIG
+
+    @field_validator("token_cache", mode="before")
+    @classmethod
+    def _empty_token_cache(cls, value: Any) -> Any:
+        """An empty CLIENT_TOKEN_CACHE turns the file off."""
+        return value or None
+
+    @property
+    def shared_token_cache(self) -> Path | None:
+        """
+        The token cache, or None while recording or replaying a cassette:
+        a cached token would keep POST /auth out of the recording, and the
+        synthetic tokens of a replay would be handed to live runs.
+        """
+        return self.token_cache if self.cassette_mode == "passthrough" else None
+
+
+class RunnerSettings(BaseSettings):
+    workers: int = Field(default=2, ge=1, validation_alias="RUNNER_WORKERS")
+    # pytest processes for the shards of sharded runs, on top of `workers`
+    shard_processes: int = Field(
+        default=4, ge=1, le=16, validation_alias="RUNNER_SHARD_PROCESSES"
+    )
+    max_queue_depth: int = Field(
+        default=100, ge=1, validation_alias="RUNNER_MAX_QUEUE_DEPTH"
+    )
+    prewarm: bool = Field(default=True, validation_alias="RUNNER_PREWARM")
+    prewarm_max_runs: int = Field(
+        default=20, ge=1, validation_alias="RUNNER_PREWARM_MAX_RUNS"
+    )
+    default_timeout: int = Field(
+        default=3600, ge=1, le=86400, validation_alias="RUNNER_DEFAULT_TIMEOUT"
+    )
+    log_buffer_lines: int = Field(
+        default=5000, ge=1, validation_alias="RUNNER_LOG_BUFFER_LINES"
+    )
+    log_retained_runs: int = Field(
+        default=50, ge=0, validation_alias="RUNNER_LOG_RETAINED_RUNS"
+    )
+    queue_backend: Literal["local", "postgres"] = Field(
+        default="local", validation_alias="RUNNER_QUEUE_BACKEND"
+    )
+    poll_interval: float = Field(
+        default=1.0, gt=0, validation_alias="RUNNER_POLL_INTERVAL"
+    )
+    heartbeat_interval: float = Field(
+        default=5.0, gt=0, validation_alias="RUNNER_HEARTBEAT_INTERVAL"
+    )
+    heartbeat_timeout: float = Field(
+        default=30.0, gt=0, validation_alias="RUNNER_HEARTBEAT_TIMEOUT"
+    )
+    max_deliveries: int = Field(
+        default=3, ge=1, validation_alias="RUNNER_MAX_DELIVERIES"
+    )
+
+    model_config = COMMON_CONFIG
+
+
+class AdmissionSettings(BaseSettings):
+    rate: float = Field(default=5.0, gt=0, validation_alias="ADMISSION_RATE")
+    burst: int = Field(default=20, ge=1, validation_alias="ADMISSION_BURST")
+    max_per_submitter: int = Field(
+        default=20, ge=1, validation_alias="ADMISSION_MAX_PER_SUBMITTER"
+    )
+    max_per_browser: int = Field(
+        default=50, ge=1, validation_alias="ADMISSION_MAX_PER_BROWSER"
+    )
+    retry_after: int = Field(default=10, ge=1, validation_alias="ADMISSION_RETRY_AFTER")
+
+    model_config = COMMON_CONFIG
+
+
+class ResultsSettings(BaseSettings):
+    batch_size: int = Field(default=500, ge=1, validation_alias="RESULTS_BATCH_SIZE")
+    flush_interval: float = Field(
+        default=2.0, gt=0, validation_alias="RESULTS_FLUSH_INTERVAL"
+    )
+    # Monthly test_runs partitions kept, the current one included
+    retention_months: int = Field(
+        default=6, ge=1, validation_alias="RESULTS_RETENTION_MONTHS"
+    )
+    partitions_ahead: int = Field(
+        default=2, ge=1, validation_alias="RESULTS_PARTITIONS_AHEAD"
+    )
+    # Set by the orchestrator for the pytest processes of a run
+    run_id: int | None = Field(default=None, validation_alias="QA_RUN_ID")
+
+    model_config = COMMON_CONFIG
+
+
+class AnalyticsSettings(BaseSettings):
+    # Seconds between incremental refreshes of the test_daily_stats rollup
+    refresh_interval: float = Field(
+        default=60.0, gt=0, validation_alias="ANALYTICS_REFRESH_INTERVAL"
+    )
+    cache_ttl: float = Field(default=30.0, ge=0, validation_alias="ANALYTICS_CACHE_TTL")
+    cache_size: int = Field(default=256, ge=1, validation_alias="ANALYTICS_CACHE_SIZE")
+
+    model_config = COMMON_CONFIG
+
+
 class Settings(BaseSettings):
     app_env: Literal["dev", "test", "prod"] = Field(default="dev")
     base_url: AnyHttpUrl = Field(..., description="Base URL for the target API")
@@ -50,6 +245,11 @@ class Settings(BaseSettings):
 
     db: DatabaseSettings = Field(default_factory=DatabaseSettings)
     booker: BookerSettings = Field(default_factory=BookerSettings)  # type: ignore[arg-type]
+    client: ClientSettings = Field(default_factory=ClientSettings)
+    runner: RunnerSettings = Field(default_factory=RunnerSettings)
+    admission: AdmissionSettings = Field(default_factory=AdmissionSettings)
+    results: ResultsSettings = Field(default_factory=ResultsSettings)
+    analytics: AnalyticsSettings = Field(default_factory=AnalyticsSettings)
 
     model_config = COMMON_CONFIG
 
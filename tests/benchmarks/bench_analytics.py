@@ -0,0 +1,143 @@
+"""
+Latency of per-test analytics, computed on the fly vs served from rollups.
+
+Seeds `results` results of `tests` synthetic tests, spread over the last 30
+days, into test_runs and refreshes test_daily_stats. Then times the same
+statistics three ways: one aggregate query over test_runs (window
+functions and percentile_cont), GET /analytics/tests with a cold cache,
+which reads the rollups, and GET /analytics/tests from the cache. The seeded
+rows are deleted afterwards.
+
+Usage:
+    python -m tests.benchmarks.bench_analytics [results] [tests] [repeats]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlalchemy import delete, insert, text
+
+from app.db import SessionLocal, async_db
+from app.db.models import TestDailyStats, TestRun
+from app.db.rollups import refresh_test_stats
+from app.main import app, test_stats
+from config.logger import configure_logging
+
+WINDOW_DAYS = 30
+
+ON_THE_FLY = text(
+    """
+    SELECT test_name,
+           count(*) AS executions,
+           avg((status = 'PASSED')::int) AS pass_rate,
+           avg((status <> previous)::int) AS flip_rate,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY duration) AS p50,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY duration) AS p95
+    FROM (
+        SELECT test_name, status, duration,
+               lag(status) OVER (PARTITION BY test_name ORDER BY created_at) AS previous
+        FROM test_runs
+        WHERE created_at >= :since AND status IN ('PASSED', 'FAILED')
+    ) AS results
+    GROUP BY test_name
+    ORDER BY flip_rate DESC
+    LIMIT 100
+    """
+)
+
+
+def seed(prefix: str, results: int, tests: int) -> None:
+    now = datetime.now(UTC)
+    first_day = (now - timedelta(days=WINDOW_DAYS - 1)).date()
+    step = timedelta(days=WINDOW_DAYS - 1) / results
+    rows = [
+        {
+            "test_name": f"{prefix}{i % tests}",
+            "status": "FAILED" if i % 7 == 0 else "PASSED",
+            "duration": 0.05 + (i % 50) / 10,
+            "created_at": now - step * i,
+        }
+        for i in range(results)
+    ]
+    with SessionLocal() as db:
+        for start in range(0, results, 10_000):
+            db.execute(insert(TestRun), rows[start : start + 10_000])
+        db.commit()
+        # Older than the last refresh, so rolled up explicitly
+        refresh_test_stats(db, since=first_day)
+
+
+def on_the_fly(repeats: int) -> list[float]:
+    since = datetime.now(UTC) - timedelta(days=WINDOW_DAYS)
+    latencies = []
+    with SessionLocal() as db:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            db.execute(ON_THE_FLY, {"since": since}).all()
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def endpoint(repeats: int, cached: bool) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    async_db.open()
+    latencies = []
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        # Opens a pooled connection and, if cached, fills the cache
+        await client.get(f"/analytics/tests?days={WINDOW_DAYS}")
+        for _ in range(repeats):
+            if not cached:
+                test_stats.clear()
+            started = time.perf_counter()
+            response = await client.get(f"/analytics/tests?days={WINDOW_DAYS}")
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await async_db.close()
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    print(
+        f"{label:<12} median {statistics.median(latencies) * 1000:9.2f}ms  "
+        f"max {max(latencies) * 1000:9.2f}ms"
+    )
+
+
+def main(results: int, tests: int, repeats: int) -> None:
+    # Per-request DEBUG lines would dominate the timings
+    configure_logging()
+    prefix = f"bench_analytics_{uuid.uuid4().hex[:8]}::test_"
+    seed(prefix, results, tests)
+    try:
+        scan = on_the_fly(repeats)
+        rollups = asyncio.run(endpoint(repeats, cached=False))
+        cache = asyncio.run(endpoint(repeats, cached=True))
+    finally:
+        test_stats.clear()
+        with SessionLocal() as db:
+            pattern = f"{prefix}%"
+            db.execute(delete(TestRun).where(TestRun.test_name.like(pattern)))
+            db.execute(
+                delete(TestDailyStats).where(TestDailyStats.test_name.like(pattern))
+            )
+            db.commit()
+
+    print(f"results={results} tests={tests} days={WINDOW_DAYS} repeats={repeats}")
+    report("on the fly", scan)
+    report("rollups", rollups)
+    report("cached", cache)
+
+
+if __name__ == "__main__":
+    main(
+        results=int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        tests=int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+        repeats=int(sys.argv[3]) if len(sys.argv) > 3 else 20,
+    )
@@ -0,0 +1,96 @@
+"""
+Throughput of the sync BookerClient vs. AsyncBookerClient.
+
+Both clients fetch the same booking from a local stub server that runs in
+its own process and adds a fixed latency per request, standing in for the
+network round trip. The sync client issues one request at a time; the async
+client keeps up to `concurrency` requests in flight over its pool.
+
+Usage:
+    python -m tests.benchmarks.bench_async_client [requests] [concurrency] [latency]
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+from typing import IO, cast
+
+from app.clients import AsyncBookerClient, BookerClient
+from config.logger import configure_logging
+from config.settings import ClientSettings
+
+
+def start_stub(latency: float) -> tuple[subprocess.Popen[str], str]:
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "tests.stubs", str(latency)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    return stub, cast(IO[str], stub.stdout).readline().strip()
+
+
+def seed(url: str) -> int:
+    client = BookerClient(url)
+    try:
+        response = client.post("/booking", payload={"firstname": "Bench"})
+        return int(response.json()["bookingid"])
+    finally:
+        client.close()
+
+
+def measure_sync(url: str, booking_id: int, requests: int) -> float:
+    client = BookerClient(url)
+    try:
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get(f"/booking/{booking_id}")
+        return time.perf_counter() - started
+    finally:
+        client.close()
+
+
+async def measure_async(
+    url: str, booking_id: int, requests: int, concurrency: int
+) -> float:
+    config = ClientSettings.model_validate(
+        {"CLIENT_CONCURRENCY": concurrency, "CLIENT_MAX_KEEPALIVE": concurrency}
+    )
+    async with AsyncBookerClient(url, config) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client.get(f"/booking/{booking_id}") for _ in range(requests))
+        )
+        return time.perf_counter() - started
+
+
+def report(label: str, requests: int, elapsed: float) -> None:
+    print(f"{label:<6} {requests / elapsed:8.1f} req/s  ({elapsed:.2f}s)")
+
+
+def main(requests: int, concurrency: int, latency: float) -> None:
+    # Per-request DEBUG lines would dominate the timings
+    configure_logging()
+    stub, url = start_stub(latency)
+    try:
+        booking_id = seed(url)
+        sync_elapsed = measure_sync(url, booking_id, requests)
+        async_elapsed = asyncio.run(
+            measure_async(url, booking_id, requests, concurrency)
+        )
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print(f"requests={requests} concurrency={concurrency} latency={latency}s")
+    report("sync", requests, sync_elapsed)
+    report("async", requests, async_elapsed)
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        requests=int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        concurrency=int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+        latency=float(sys.argv[3]) if len(sys.argv) > 3 else 0.05,
+    )
@@ -0,0 +1,89 @@
+"""
+Response decoding paths of BookerClient for bulk reads.
+
+Decodes canned booking bodies the way the client used to
+(`response.json()`, then `Booking(**data)`) and with `model_validate_json`,
+and one /booking listing the old way, with the TypeAdapter, and unvalidated
+(CLIENT_VALIDATE_LISTINGS off). The old listing path validated nothing.
+
+Usage:
+    python -m tests.benchmarks.bench_decoding [bookings]
+"""
+
+import json
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.clients.decoding import decode_booking_ids
+from app.schemas import Booking
+
+
+def booking_body(index: int) -> bytes:
+    return json.dumps(
+        {
+            "firstname": f"Bench{index}",
+            "lastname": "Mark",
+            "totalprice": 100 + index,
+            "depositpaid": True,
+            "bookingdates": {"checkin": "2024-01-01", "checkout": "2024-01-10"},
+            "additionalneeds": "Breakfast",
+        }
+    ).encode()
+
+
+def measure(decode_all: Callable[[], Any], rounds: int = 5) -> float:
+    """Best of `rounds`, in seconds."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        decode_all()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(title: str, count: int, paths: dict[str, Callable[[], Any]]) -> None:
+    print(title)
+    baseline = None
+    for name, decode_all in paths.items():
+        elapsed = measure(decode_all)
+        baseline = baseline or elapsed
+        print(
+            f"  {name:<22} {elapsed / count * 1e6:8.2f} us/item"
+            f"  ({baseline / elapsed:.1f}x vs old)"
+        )
+
+
+def main(bookings: int) -> None:
+    bodies = [booking_body(index) for index in range(bookings)]
+    listing = json.dumps([{"bookingid": index} for index in range(bookings)]).encode()
+
+    print(f"bookings={bookings}")
+    report(
+        "Booking bodies",
+        bookings,
+        {
+            "json() + Booking(**)": lambda: [
+                Booking(**json.loads(body)) for body in bodies
+            ],
+            "model_validate_json": lambda: [
+                Booking.model_validate_json(body) for body in bodies
+            ],
+        },
+    )
+    report(
+        "Booking ID listing",
+        bookings,
+        {
+            "json() + comprehension": lambda: [
+                item["bookingid"] for item in json.loads(listing)
+            ],
+            "TypeAdapter": lambda: decode_booking_ids(listing),
+            "unvalidated": lambda: decode_booking_ids(listing, validate=False),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main(bookings=int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
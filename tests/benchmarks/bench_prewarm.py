@@ -0,0 +1,66 @@
+"""
+Per-run startup latency: cold `pytest` process vs. pre-warmed runner.
+
+Runs the same short suite repeatedly through both launchers and reports
+wall-clock time from job submission to pytest exit.
+
+Usage:
+    python -m tests.benchmarks.bench_prewarm [iterations] [suite]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from app.runner import ColdLauncher, Launcher, LogBuffer, WarmPool, build_pytest_args
+from app.schemas import TestRunRequest
+
+DEFAULT_SUITE = "tests/test_run_logs.py"
+
+
+async def measure(launcher: Launcher, args: list[str], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await launcher.run(args, {}, LogBuffer(max_lines=1000))
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<8} mean={statistics.mean(samples):.3f}s "
+        f"p50={statistics.median(samples):.3f}s "
+        f"min={min(samples):.3f}s max={max(samples):.3f}s"
+    )
+
+
+async def main(iterations: int, suite: str) -> None:
+    args = build_pytest_args(TestRunRequest(test_suite=suite))
+
+    cold = await measure(ColdLauncher(), args, iterations)
+
+    pool = WarmPool(size=1, max_runs=iterations + 1)
+    started = time.perf_counter()
+    await pool.start()
+    warmup = time.perf_counter() - started
+    try:
+        warm = await measure(pool, args, iterations)
+    finally:
+        await pool.stop()
+
+    print(f"suite={suite} iterations={iterations}")
+    report("cold", cold)
+    report("warm", warm)
+    print(f"one-off runner warm-up: {warmup:.3f}s")
+    print(f"speedup (p50): {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            iterations=int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+            suite=sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SUITE,
+        )
+    )
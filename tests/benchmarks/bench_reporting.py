@@ -0,0 +1,77 @@
+"""
+Per-request overhead of BaseAPIClient reporting modes.
+
+Requests are answered by an in-process transport adapter with a canned
+response, so the timings cover only the client: payload serialization,
+reporting and error mapping, without any network round trip.
+
+Usage:
+    python -m tests.benchmarks.bench_reporting [requests] [sample_every]
+"""
+
+import sys
+import time
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from app.clients import BookerClient
+from app.clients.reporting import ReportingMode
+from config.logger import configure_logging
+from config.settings import ClientSettings
+
+BOOKING = b'{"firstname": "Bench", "lastname": "Mark", "totalprice": 100}'
+
+
+class CannedAdapter(BaseAdapter):
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        response = Response()
+        response.status_code = 200
+        response._content = BOOKING
+        response.headers["Content-Type"] = "application/json"
+        response.request = request
+        response.url = request.url or ""
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def measure(mode: ReportingMode, requests: int, sample_every: int) -> float:
+    config = ClientSettings.model_validate(
+        {"CLIENT_REPORTING": mode, "CLIENT_REPORTING_SAMPLE_EVERY": sample_every}
+    )
+    client = BookerClient("http://bench.invalid", config)
+    client.session.mount("http://", CannedAdapter())
+    payload = {"firstname": "Bench", "lastname": "Mark", "totalprice": 100}
+    try:
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.post("/booking", payload=payload)
+        return time.perf_counter() - started
+    finally:
+        client.close()
+
+
+def main(requests: int, sample_every: int) -> None:
+    # DEBUG lines are dropped by the default handler, as in a normal run
+    configure_logging()
+
+    print(f"requests={requests} sample_every={sample_every}")
+    baseline = None
+    for mode in ("full", "sampled", "off"):
+        elapsed = measure(mode, requests, sample_every)
+        per_request = elapsed / requests * 1e6
+        baseline = baseline or per_request
+        print(
+            f"{mode:<8} {per_request:8.1f} us/request"
+            f"  ({baseline / per_request:.1f}x vs full)"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        requests=int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        sample_every=int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
@@ -0,0 +1,109 @@
+"""
+Throughput of the run status endpoint under concurrent clients.
+
+Serves GET /runs/{id} the way the API used to, a sync endpoint on the
+threadpool with the sync engine, and through app.main, where it awaits the
+async engine. Both run in process over httpx.ASGITransport against the
+database from the POSTGRES_* settings, with `concurrency` requests in
+flight, so the numbers cover the application and the pool rather than the
+network. Keep `concurrency` within POSTGRES_POOL_SIZE + POSTGRES_MAX_OVERFLOW
+unless pool waits are what you are after.
+
+Usage:
+    python -m tests.benchmarks.bench_status_endpoints [requests] [concurrency]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Annotated
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, async_db, get_db, repository
+from app.db.models import Run
+from app.main import app as async_app
+from app.schemas import RunRead, TestRunRequest
+from config.logger import configure_logging
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/runs/{run_id}", response_model=RunRead)
+def get_run(run_id: int, db: Annotated[Session, Depends(get_db)]) -> Run:
+    run = repository.get_run(db, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
+
+
+async def measure(
+    app: FastAPI, run_id: int, requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Total seconds, and the latency of every request."""
+    transport = httpx.ASGITransport(app=app)
+    async_db.open()
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    async with client:
+
+        async def fetch() -> None:
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(f"/runs/{run_id}")
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        # Opens the pool's connections before the clock starts
+        await asyncio.gather(*(fetch() for _ in range(concurrency)))
+        latencies.clear()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    await async_db.close()
+    return elapsed, latencies
+
+
+def report(label: str, requests: int, elapsed: float, latencies: list[float]) -> None:
+    p50, p95 = (q * 1000 for q in statistics.quantiles(latencies, n=20)[9::9])
+    print(
+        f"{label:<6} {requests / elapsed:8.1f} req/s  "
+        f"p50 {p50:6.1f}ms  p95 {p95:6.1f}ms"
+    )
+
+
+def main(requests: int, concurrency: int) -> None:
+    # Per-request DEBUG lines would dominate the timings
+    configure_logging()
+    with SessionLocal() as db:
+        run = repository.create_run(db, TestRunRequest(test_suite="bench"))
+    try:
+        sync_elapsed, sync_latencies = asyncio.run(
+            measure(sync_app, run.id, requests, concurrency)
+        )
+        async_elapsed, async_latencies = asyncio.run(
+            measure(async_app, run.id, requests, concurrency)
+        )
+    finally:
+        with SessionLocal() as db:
+            repository.delete_run(db, run.id)
+
+    print(f"requests={requests} concurrency={concurrency}")
+    report("sync", requests, sync_elapsed, sync_latencies)
+    report("async", requests, async_elapsed, async_latencies)
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        requests=int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        concurrency=int(sys.argv[2]) if len(sys.argv) > 2 else 15,
+    )
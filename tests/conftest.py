@@ -7,11 +7,31 @@ from loguru import logger
 from sqlalchemy.orm import Session
 
 from app.clients import BookerClient
-from app.db import SessionLocal
-from app.db.models import TestRun
+from app.db import ResultWriter, SessionLocal
 from app.exceptions import APIClientError
 from app.schemas import Booking, BookingDates, BookingResponse
 from config.settings import settings
+from tests.stubs import StubBooker
+
+RESULT_WRITER = pytest.StashKey[ResultWriter]()
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    # Results are stored in batches off the test thread; see app.db.results
+    session.config.stash[RESULT_WRITER] = ResultWriter(
+        settings.results.batch_size,
+        settings.results.flush_interval,
+        settings.results.run_id,
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    writer = session.config.stash.get(RESULT_WRITER, None)
+    if writer is not None:
+        writer.close()
+        logger.debug(
+            f"Saved {writer.written} test results in {writer.flushes} transactions"
+        )
 
 
 @pytest.fixture
@@ -23,18 +43,26 @@ def db_session() -> Generator[Session, None, None]:
         session.close()
 
 
+@pytest.fixture
+def stub_booker() -> Generator[StubBooker, None, None]:
+    """In-memory Restful-Booker served on a free local port."""
+    with StubBooker() as server:
+        yield server
+
+
 @pytest.fixture(scope="session")
 def client() -> Generator[BookerClient, None, None]:
     client_instance = BookerClient(base_url=str(settings.base_url))
 
     yield client_instance
 
-    client_instance.session.close()
+    client_instance.close()
 
 
 @pytest.fixture(scope="session")
 def auth_token(client: BookerClient) -> str:
-    token = client.create_auth_token(
+    # Shared with the other pytest processes through the token cache
+    token = client.authenticate(
         username=settings.booker.username,
         password=settings.booker.password,
     )
@@ -79,21 +107,8 @@ def pytest_runtest_makereport(
     report = outcome.get_result()
 
     if report.when == "call":
-        test_name = item.name
-        status = report.outcome.upper()
-        duration = report.duration
-
-        session = SessionLocal()
-        try:
-            test_run = TestRun(
-                test_name=test_name,
-                status=status,
-                duration=duration,
-            )
-            session.add(test_run)
-            session.commit()
-            logger.debug(f"Saved test result: {test_name} [{status}]")
-        except Exception as e:
-            logger.error(f"Failed to save test result to DB: {e}")
-        finally:
-            session.close()
+        item.config.stash[RESULT_WRITER].add(
+            test_name=item.name,
+            status=report.outcome.upper(),
+            duration=report.duration,
+        )
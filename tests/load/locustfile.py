@@ -1,7 +1,9 @@
 from datetime import date
+from typing import ClassVar
 
 from locust import HttpUser, between, task
 
+from app.clients.auth import TokenProvider
 from app.schemas.auth import AuthRequest, AuthResponse
 from app.schemas.booking import Booking, BookingDates
 from config.logger import logger
@@ -11,24 +13,42 @@ from config.settings import settings
 class BookerUser(HttpUser):
     wait_time = between(1, 2)
     token: str | None = None
+    # One provider per locust process; processes share the token file
+    tokens: ClassVar[TokenProvider | None] = None
 
     def on_start(self) -> None:
+        if BookerUser.tokens is None:
+            BookerUser.tokens = TokenProvider(
+                self.request_token,
+                key=f"{self.host}|{settings.booker.username}",
+                ttl=settings.client.token_ttl,
+                path=settings.client.shared_token_cache,
+            )
+
+        try:
+            self.token = BookerUser.tokens.get()
+            logger.info(f"VUser authenticated: {self.token[:8]}...")
+        except Exception as e:
+            logger.error(f"Authentication failed: {e}")
+
+    def request_token(self) -> str:
         payload = AuthRequest(
             username=settings.booker.username,
             password=settings.booker.password,
         ).to_payload()
 
         with self.client.post("/auth", json=payload, catch_response=True) as response:
-            if response.status_code == 200:
-                try:
-                    self.token = AuthResponse(**response.json()).token
-                    logger.info(f"VUser authenticated: {self.token[:8]}...")
-                except Exception as e:
-                    logger.error(f"Token parsing failed: {e}")
-                    response.failure(f"Auth response parsing error: {e}")
-            else:
+            if response.status_code != 200:
                 logger.error(f"Auth failed. Status: {response.status_code}")
                 response.failure("Authentication handshake failed")
+                raise RuntimeError(f"Auth failed: {response.status_code}")
+
+            try:
+                return AuthResponse.model_validate_json(response.content).token
+            except Exception as e:
+                logger.error(f"Token parsing failed: {e}")
+                response.failure(f"Auth response parsing error: {e}")
+                raise
 
     @task(3)
     def get_bookings(self) -> None:
@@ -65,6 +85,9 @@ class BookerUser(HttpUser):
         ) as response:
             if response.status_code == 200:
                 pass
+            elif response.status_code == 403 and self.token and BookerUser.tokens:
+                self.token = BookerUser.tokens.refresh(rejected=self.token)
+                response.failure("Token rejected, refreshed")
             else:
                 logger.error(f"Payload: {booking_payload}")
                 logger.error(f"Response: {response.text}")
@@ -0,0 +1,187 @@
+"""
+In-memory stand-in for the Restful-Booker API, for tests and benchmarks
+that must not depend on the real service.
+
+Speaks HTTP/1.1 with keep-alive, and counts accepted connections and
+concurrent requests, so connection reuse and concurrency limits of the
+clients can be observed from the outside. Successful GETs carry an ETag
+and are answered with 304 Not Modified when If-None-Match matches it.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+
+STUB_TOKEN = "stub-token"
+
+BOOKING_PATH = re.compile(r"^/booking/(\d+)$")
+
+
+class StubBooker(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once
+    request_queue_size = 1024
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.bookings: dict[int, dict[str, Any]] = {}
+        # Status codes to answer with instead, by request path, consumed in order
+        self.faults: dict[str, list[int]] = {}
+        self.connections = 0
+        self.requests = 0
+        # Requests by "METHOD /path"
+        self.hits: Counter[str] = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def __enter__(self) -> Self:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def add_booking(self, booking: dict[str, Any]) -> int:
+        with self._lock:
+            booking_id = self._next_id
+            self._next_id += 1
+            self.bookings[booking_id] = booking
+        return booking_id
+
+    def enter(self, method: str, path: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.hits[f"{method} {path}"] += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def take_fault(self, path: str) -> int | None:
+        with self._lock:
+            queued = self.faults.get(path)
+            return queued.pop(0) if queued else None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, delayed ACKs
+    # stall every keep-alive request by tens of milliseconds
+    disable_nagle_algorithm = True
+    server: StubBooker
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._handle()
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._handle()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        self._handle()
+
+    def do_PATCH(self) -> None:  # noqa: N802
+        self._handle()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._handle()
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        path = self.path.partition("?")[0]
+        self.server.enter(self.command, path)
+        try:
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            fault = self.server.take_fault(path)
+            if fault is not None:
+                self._reply(fault, {"reason": "injected fault"})
+            else:
+                self._reply(*self._route(path, body))
+        finally:
+            self.server.leave()
+
+    def _route(self, path: str, body: Any) -> tuple[int, Any]:
+        if self.command == "POST" and path == "/auth":
+            return 200, {"token": STUB_TOKEN}
+
+        if path == "/booking":
+            if self.command == "POST":
+                booking_id = self.server.add_booking(body)
+                return 200, {"bookingid": booking_id, "booking": body}
+            ids = list(self.server.bookings)
+            return 200, [{"bookingid": booking_id} for booking_id in ids]
+
+        match = BOOKING_PATH.match(path)
+        if match is None or int(match.group(1)) not in self.server.bookings:
+            return 404, "Not Found"
+        return self._route_booking(int(match.group(1)), body)
+
+    def _route_booking(self, booking_id: int, body: Any) -> tuple[int, Any]:
+        bookings = self.server.bookings
+        if self.command == "GET":
+            return 200, bookings[booking_id]
+        if self.headers.get("Cookie") != f"token={STUB_TOKEN}":
+            return 403, "Forbidden"
+        if self.command == "DELETE":
+            bookings.pop(booking_id, None)
+            return 201, "Created"
+
+        if self.command == "PATCH":
+            bookings[booking_id] = {**bookings[booking_id], **body}
+        else:
+            bookings[booking_id] = body
+        return 200, bookings[booking_id]
+
+    def _reply(self, status: int, payload: Any) -> None:
+        is_text = isinstance(payload, str)
+        data = (payload if is_text else json.dumps(payload)).encode()
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        cacheable = self.command == "GET" and status == 200
+        if cacheable and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+
+        self.send_response(status)
+        if cacheable:
+            self.send_header("ETag", etag)
+        self.send_header(
+            "Content-Type", "text/plain" if is_text else "application/json"
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+if __name__ == "__main__":
+    # Serves until killed; prints its URL first, for benchmarks in other processes
+    import sys
+
+    with StubBooker(latency=float(sys.argv[1]) if len(sys.argv) > 1 else 0.0) as stub:
+        print(stub.url, flush=True)
+        threading.Event().wait()
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.exceptions import AdmissionRejectedError
+from app.runner import AdmissionController, JobQueue, TokenBucket
+from app.schemas import TestRunRequest
+from config.settings import AdmissionSettings
+
+
+def make_controller(
+    queue: JobQueue | None = None, **limits: float
+) -> AdmissionController:
+    settings = AdmissionSettings.model_validate(
+        {
+            "ADMISSION_RATE": 100.0,
+            "ADMISSION_BURST": 100,
+            "ADMISSION_RETRY_AFTER": 7,
+            **{f"ADMISSION_{name.upper()}": value for name, value in limits.items()},
+        }
+    )
+    return AdmissionController(queue or JobQueue(max_depth=10), settings)
+
+
+def rejection(controller: AdmissionController, submitter: str, browser: str) -> int:
+    with pytest.raises(AdmissionRejectedError) as error:
+        controller.check(submitter, browser)
+    return error.value.status_code
+
+
+def test_token_bucket_refills_over_time() -> None:
+    now = 0.0
+    bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now)
+
+    assert bucket.consume() == 0
+    assert bucket.consume() == 0
+    assert bucket.consume() == 0.5
+
+    now = 0.5
+    assert bucket.consume() == 0
+    assert bucket.available == 0
+
+
+def test_caps_count_runs_until_released() -> None:
+    controller = make_controller(max_per_submitter=1, max_per_browser=2)
+
+    controller.check("alice", "chromium")
+    controller.admit(1, "alice", "chromium")
+    assert rejection(controller, "alice", "firefox") == 429
+
+    controller.admit(2, "bob", "chromium")
+    assert rejection(controller, "carol", "chromium") == 503
+
+    controller.release(1)
+    controller.check("alice", "chromium")
+    assert controller.stats()["browsers"] == {"chromium": 1}
+
+
+def test_rate_limit_rejects_bursts_with_retry_after() -> None:
+    controller = make_controller(rate=0.5, burst=1)
+
+    controller.check("alice", "chromium")
+    with pytest.raises(AdmissionRejectedError) as error:
+        controller.check("bob", "chromium")
+
+    assert error.value.status_code == 429
+    assert error.value.retry_after == 2
+
+
+def test_full_queue_marks_controller_saturated() -> None:
+    queue = JobQueue(max_depth=1)
+    controller = make_controller(queue)
+
+    async def fill() -> None:
+        queue.submit(1, TestRunRequest(test_suite="tests/smoke"))
+
+    asyncio.run(fill())
+
+    assert controller.saturated
+    assert rejection(controller, "alice", "chromium") == 503
@@ -0,0 +1,154 @@
+import asyncio
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+
+import httpx
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.analytics import TTLCache
+from app.db import async_db
+from app.db.models import TestDailyStats, TestRun
+from app.db.rollups import refresh_test_stats, summarize_day
+from app.main import app, test_stats
+
+
+def test_day_summary_counts_flips_across_days() -> None:
+    results = [
+        ("a", "PASSED", 0.2),
+        ("a", "FAILED", 0.3),
+        ("a", "FAILED", 0.3),
+        ("b", "PASSED", 1.5),
+    ]
+    previous = {"b": "FAILED"}
+    rows = {
+        row["test_name"]: row for row in summarize_day(results, date.today(), previous)
+    }
+
+    assert rows["a"]["executions"] == 3
+    assert rows["a"]["passed"] == 1
+    assert rows["a"]["flips"] == 1
+    assert rows["a"]["last_status"] == "FAILED"
+    assert sum(rows["a"]["duration_buckets"]) == 3
+    # b failed on an earlier day
+    assert rows["b"]["flips"] == 1
+    assert previous == {"a": "FAILED", "b": "PASSED"}
+
+
+def test_cache_shares_concurrent_loads() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl=60.0)
+    loads = 0
+
+    async def load() -> int:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return loads
+
+    async def scenario() -> None:
+        values = await asyncio.gather(*(cache.get("a", load) for _ in range(5)))
+        assert values == [1] * 5
+        assert await cache.get("a", load) == 1
+        await cache.get("b", load)
+        await cache.get("c", load)
+
+    asyncio.run(scenario())
+    assert loads == 3
+    assert cache.hits == 5
+    assert len(cache) == 2
+
+
+def test_cache_forgets_failed_loads() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=8, ttl=60.0)
+
+    async def fail() -> int:
+        raise RuntimeError("database unavailable")
+
+    async def succeed() -> int:
+        return 1
+
+    async def scenario() -> int:
+        try:
+            await cache.get("a", fail)
+        except RuntimeError:
+            pass
+        return await cache.get("a", succeed)
+
+    assert asyncio.run(scenario()) == 1
+
+
+async def fetch(*paths: str) -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=app)
+    # Opened by the API lifespan, which ASGITransport does not run
+    async_db.open()
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://orchestrator"
+        ) as client:
+            return [await client.get(path) for path in paths]
+    finally:
+        # Pooled asyncpg connections are bound to this event loop
+        await async_db.close()
+
+
+def test_analytics_are_served_from_rollups(db_session: Session) -> None:
+    name = f"tests/test_analytics.py::flaky_{uuid.uuid4().hex}"
+    today = datetime.now(UTC).date()
+    results = {
+        today - timedelta(days=1): [("PASSED", 0.2), ("FAILED", 0.3)],
+        today: [("PASSED", 0.2), ("PASSED", 0.3), ("FAILED", 4.0)],
+    }
+    for day, outcomes in results.items():
+        start = datetime.combine(day, time(), tzinfo=UTC)
+        db_session.add_all(
+            TestRun(
+                test_name=name,
+                status=status,
+                duration=duration,
+                created_at=start + timedelta(minutes=i),
+            )
+            for i, (status, duration) in enumerate(outcomes)
+        )
+    db_session.commit()
+
+    try:
+        refresh_test_stats(db_session, today)
+        rollups = db_session.scalars(
+            select(TestDailyStats)
+            .where(TestDailyStats.test_name == name)
+            .order_by(TestDailyStats.day)
+        ).all()
+        assert [(r.executions, r.passed, r.flips) for r in rollups] == [
+            (2, 1, 1),
+            (3, 2, 2),
+        ]
+
+        test_stats.clear()
+        listing, single, missing = asyncio.run(
+            fetch(
+                "/analytics/tests?days=2&limit=1000",
+                f"/analytics/tests/{name}?days=2",
+                f"/analytics/tests/{name}_missing",
+            )
+        )
+        assert listing.status_code == 200
+        summary = next(s for s in listing.json() if s["test_name"] == name)
+        assert summary["executions"] == 5
+        assert summary["failed"] == 2
+        assert summary["pass_rate"] == 0.6
+        assert summary["flip_rate"] == 0.6
+        assert summary["last_status"] == "FAILED"
+        assert 0.25 < summary["p50"] <= 0.5
+        assert 2.5 < summary["p95"] <= 5.0
+
+        assert single.status_code == 200
+        assert [day["executions"] for day in single.json()["daily"]] == [2, 3]
+        assert missing.status_code == 404
+    finally:
+        test_stats.clear()
+        db_session.rollback()
+        db_session.execute(
+            delete(TestDailyStats).where(TestDailyStats.test_name == name)
+        )
+        db_session.execute(delete(TestRun).where(TestRun.test_name == name))
+        db_session.commit()
@@ -0,0 +1,94 @@
+import asyncio
+import socket
+
+import pytest
+
+from app.clients import AsyncBookerClient
+from app.exceptions import APIClientError
+from app.schemas import Booking
+from config.settings import ClientSettings
+from tests.stubs import STUB_TOKEN, StubBooker
+
+
+def client_settings(**values: float) -> ClientSettings:
+    return ClientSettings.model_validate(
+        {f"CLIENT_{name.upper()}": value for name, value in values.items()}
+    )
+
+
+def test_booking_lifecycle(stub_booker: StubBooker, test_booking_data: Booking) -> None:
+    async def scenario() -> None:
+        async with AsyncBookerClient(stub_booker.url) as client:
+            token = await client.create_auth_token("admin", "secret")
+            created = await client.create_booking(test_booking_data)
+            booking_id = created.bookingid
+
+            assert await client.get_booking(booking_id) == test_booking_data
+            assert await client.get_booking_ids() == [booking_id]
+
+            patched = await client.partial_update_booking(
+                booking_id, {"firstname": "Sam"}, token
+            )
+            assert patched.first_name == "Sam"
+
+            await client.delete_booking(booking_id, token)
+            with pytest.raises(APIClientError) as error:
+                await client.get_booking(booking_id)
+            assert error.value.status_code == 404
+
+    asyncio.run(scenario())
+    assert stub_booker.connections == 1
+
+
+def test_concurrency_limit_and_connection_reuse(
+    stub_booker: StubBooker, test_booking_data: Booking
+) -> None:
+    stub_booker.latency = 0.05
+    booking_id = stub_booker.add_booking(test_booking_data.to_payload())
+    config = client_settings(concurrency=5, max_connections=20)
+
+    async def scenario() -> list[Booking]:
+        async with AsyncBookerClient(stub_booker.url, config) as client:
+            return await asyncio.gather(
+                *(client.get_booking(booking_id) for _ in range(40))
+            )
+
+    bookings = asyncio.run(scenario())
+
+    assert bookings == [test_booking_data] * 40
+    assert stub_booker.peak_in_flight == 5
+    # Eight waves of five requests share the first wave's connections
+    assert stub_booker.connections == 5
+
+
+def test_error_mapping_matches_sync_client(stub_booker: StubBooker) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    path = f"/booking/{booking_id}"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+
+    async def scenario() -> tuple[APIClientError, APIClientError]:
+        async with AsyncBookerClient(stub_booker.url) as client:
+            # Transient server errors are retried like the sync client does
+            stub_booker.faults[path] = [503, 502]
+            response = await client.get(path)
+            assert response.json() == {"firstname": "Alex"}
+
+            stub_booker.faults[path] = [403]
+            with pytest.raises(APIClientError) as http_error:
+                await client.delete(path, headers={"Cookie": f"token={STUB_TOKEN}"})
+
+        async with AsyncBookerClient(f"http://127.0.0.1:{closed_port}") as client:
+            with pytest.raises(APIClientError) as network_error:
+                await client.get("/booking")
+
+        return http_error.value, network_error.value
+
+    http_error, network_error = asyncio.run(scenario())
+
+    assert http_error.status_code == 403
+    assert http_error.payload == {"reason": "injected fault"}
+    assert network_error.status_code is None
+    assert network_error.message.startswith("Network error during GET")
@@ -0,0 +1,60 @@
+from collections.abc import Generator
+
+import pytest
+
+from app.clients import BookerClient
+from app.exceptions import APIClientError
+from app.schemas import Booking
+from tests.stubs import STUB_TOKEN, StubBooker
+
+
+@pytest.fixture
+def stub_client(stub_booker: StubBooker) -> Generator[BookerClient, None, None]:
+    client = BookerClient(stub_booker.url)
+    yield client
+    client.close()
+
+
+def test_bulk_operations_report_partial_failures(
+    stub_booker: StubBooker, stub_client: BookerClient, test_booking_data: Booking
+) -> None:
+    # One create is rejected; the rest of the batch goes through
+    stub_booker.faults["/booking"] = [400]
+    created = list(stub_client.create_bookings([test_booking_data] * 12))
+
+    assert sorted(result.index for result in created) == list(range(12))
+    failed = [result for result in created if not result.ok]
+    assert len(failed) == 1
+    assert isinstance(failed[0].error, APIClientError)
+    assert failed[0].error.status_code == 400
+
+    booking_ids = [result.value.bookingid for result in created if result.value]
+    missing_id = max(booking_ids) + 1
+    fetched = list(stub_client.get_bookings([*booking_ids, missing_id]))
+
+    assert {r.item: r.value for r in fetched if r.ok} == dict.fromkeys(
+        booking_ids, test_booking_data
+    )
+    assert [r.item for r in fetched if not r.ok] == [missing_id]
+
+    deleted = list(stub_client.delete_bookings(booking_ids, STUB_TOKEN))
+
+    assert all(result.ok for result in deleted)
+    assert stub_booker.bookings == {}
+
+
+def test_fan_out_is_bounded_and_streams(
+    stub_booker: StubBooker, stub_client: BookerClient
+) -> None:
+    stub_booker.latency = 0.05
+    booking_ids = [stub_booker.add_booking({"firstname": "Alex"}) for _ in range(40)]
+
+    results = stub_client.get_bookings(booking_ids, max_workers=4)
+    # Booking payloads are incomplete, so every item fails validation alone
+    first = next(results)
+    results.close()
+
+    assert not first.ok
+    assert stub_booker.peak_in_flight <= 4
+    # Items are only drawn as workers free up; the rest are never requested
+    assert stub_booker.requests <= 8
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.runner import (
+    ColdLauncher,
+    Launcher,
+    LogBuffer,
+    RunOutcome,
+    WarmPool,
+    run_pytest_worker,
+)
+from app.schemas import RunStatus, TestRunRequest
+
+# Stands in for a hung Playwright browser: a child process that never exits
+HANGING_SUITE = """
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+def test_hangs():
+    browser = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(300)"])
+    # Renamed into place, so the test never reads a half-written file
+    pending = Path(__file__).with_suffix(".pid.tmp")
+    pending.write_text(str(browser.pid))
+    pending.rename(Path(__file__).with_suffix(".pid"))
+    time.sleep(300)
+"""
+
+
+# Fails once, then hangs when the failed test is retried
+FAIL_THEN_HANG_SUITE = """
+import time
+from pathlib import Path
+
+MARKER = Path(__file__).with_suffix(".ran")
+
+
+def test_stable():
+    assert True
+
+
+def test_fails_then_hangs():
+    if MARKER.exists():
+        time.sleep(300)
+    MARKER.touch()
+    assert False
+"""
+
+
+def is_running(pid: int) -> bool:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    # Killed orphans may linger as zombies until init reaps them
+    return stat.rpartition(")")[2].split()[0] != "Z"
+
+
+async def wait_for_file(path: Path, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{path} was never written")
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.parametrize("prewarm", [False, True], ids=["cold", "warm"])
+def test_cancel_kills_whole_process_group(tmp_path: Path, prewarm: bool) -> None:
+    suite = tmp_path / "test_hanging.py"
+    suite.write_text(HANGING_SUITE)
+    pid_file = suite.with_suffix(".pid")
+
+    async def scenario() -> tuple[int, float]:
+        pool = WarmPool(size=1, max_runs=5) if prewarm else None
+        launcher: Launcher = pool or ColdLauncher()
+        if pool is not None:
+            await pool.start()
+
+        try:
+            request = TestRunRequest(test_suite=str(suite))
+            run = asyncio.create_task(
+                run_pytest_worker(request, LogBuffer(max_lines=100), launcher)
+            )
+            await wait_for_file(pid_file)
+
+            started = time.monotonic()
+            run.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run
+            return int(pid_file.read_text()), time.monotonic() - started
+        finally:
+            if pool is not None:
+                await pool.stop()
+
+    browser_pid, teardown = asyncio.run(scenario())
+
+    assert not is_running(browser_pid)
+    assert teardown < 5
+
+
+def test_timeout_marks_run_timed_out(tmp_path: Path) -> None:
+    suite = tmp_path / "test_hanging.py"
+    suite.write_text(HANGING_SUITE)
+    request = TestRunRequest(test_suite=str(suite), timeout_seconds=1)
+    log = LogBuffer(max_lines=100)
+
+    outcome: RunOutcome = asyncio.run(run_pytest_worker(request, log, ColdLauncher()))
+
+    assert outcome.status == RunStatus.TIMED_OUT
+    assert log.closed
+    assert log.snapshot()[-1][1] == "[orchestrator] run killed after 1s timeout"
+
+
+def test_timeout_keeps_finished_attempts(tmp_path: Path) -> None:
+    suite = tmp_path / "test_fail_then_hang.py"
+    suite.write_text(FAIL_THEN_HANG_SUITE)
+    request = TestRunRequest(test_suite=str(suite), retries=1, timeout_seconds=20)
+
+    outcome: RunOutcome = asyncio.run(
+        run_pytest_worker(request, LogBuffer(max_lines=100), ColdLauncher())
+    )
+
+    assert outcome.status == RunStatus.TIMED_OUT
+    assert outcome.exit_code is None
+    assert [attempt.failed_tests for attempt in outcome.attempts] == [1]
+    summary = outcome.summary()
+    assert (summary.total_tests, summary.failed_tests) == (2, 1)
+
+
+def test_cancel_keeps_finished_attempts(tmp_path: Path) -> None:
+    suite = tmp_path / "test_fail_then_hang.py"
+    suite.write_text(FAIL_THEN_HANG_SUITE)
+    request = TestRunRequest(test_suite=str(suite), retries=1)
+    log = LogBuffer(max_lines=100)
+    outcome = RunOutcome(exit_code=None)
+
+    async def scenario() -> None:
+        run = asyncio.create_task(
+            run_pytest_worker(request, log, ColdLauncher(), outcome=outcome)
+        )
+        deadline = time.monotonic() + 60
+        while not any("attempt 2" in line for _, line in log.snapshot()):
+            assert time.monotonic() < deadline, "the failed test was never rerun"
+            await asyncio.sleep(0.05)
+
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(scenario())
+
+    assert outcome.status == RunStatus.CANCELLED
+    assert [attempt.failed_tests for attempt in outcome.attempts] == [1]
+    summary = outcome.summary()
+    assert (summary.total_tests, summary.failed_tests) == (2, 1)
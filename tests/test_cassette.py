@@ -0,0 +1,193 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.clients import BookerClient
+from app.clients.cassette import Cassette, CassetteAdapter
+from app.exceptions import APIClientError, CassetteMissError
+from app.schemas import Booking
+from config.settings import ClientSettings
+from tests.stubs import STUB_TOKEN, StubBooker
+
+
+def cassette_client(url: str, tmp_path: Path, mode: str) -> BookerClient:
+    config = ClientSettings.model_validate(
+        {
+            "CLIENT_CASSETTE_MODE": mode,
+            "CLIENT_CASSETTE": tmp_path / "booker.json",
+            "CLIENT_TOKEN_CACHE": tmp_path / "tokens.json",
+        }
+    )
+    return BookerClient(url, config)
+
+
+def crud_scenario(client: BookerClient, booking: Booking) -> dict[str, Any]:
+    """Touches every kind of dynamic value: tokens, issued IDs and listings."""
+    token = client.authenticate("admin", "secret")
+    created = client.create_booking(booking)
+    before = client.get(f"/booking/{created.bookingid}").json()
+    client.partial_update_booking(created.bookingid, {"firstname": "Sam"}, token)
+    after = client.get(f"/booking/{created.bookingid}").json()
+    listed = client.get_booking_ids()
+    client.delete_booking(created.bookingid, token)
+    with pytest.raises(APIClientError) as exc_info:
+        client.get(f"/booking/{created.bookingid}")
+
+    return {
+        "before": before["firstname"],
+        "after": after["firstname"],
+        "listed": created.bookingid in listed,
+        "deleted": exc_info.value.status_code,
+    }
+
+
+def test_replay_answers_offline_like_the_recording(
+    tmp_path: Path, test_booking_data: Booking
+) -> None:
+    with StubBooker() as stub:
+        for _ in range(3):
+            stub.add_booking({"firstname": "Other"})
+        url = stub.url
+        client = cassette_client(url, tmp_path, "record")
+        try:
+            recorded = crud_scenario(client, test_booking_data)
+        finally:
+            client.close()
+
+    # The stub is gone: every answer now comes from the cassette
+    client = cassette_client(url, tmp_path, "replay")
+    try:
+        replayed = crud_scenario(client, test_booking_data)
+    finally:
+        client.close()
+
+    assert recorded == replayed
+    assert replayed == {
+        "before": "Alex",
+        "after": "Sam",
+        "listed": True,
+        "deleted": 404,
+    }
+
+
+def test_cassette_holds_placeholders_instead_of_secrets(
+    stub_booker: StubBooker, tmp_path: Path, test_booking_data: Booking
+) -> None:
+    client = cassette_client(stub_booker.url, tmp_path, "record")
+    try:
+        token = client.authenticate("admin", "secret")
+        created = client.create_booking(test_booking_data)
+        client.delete_booking(created.bookingid, token)
+    finally:
+        client.close()
+
+    text = (tmp_path / "booker.json").read_text()
+    assert STUB_TOKEN not in text
+    assert "secret" not in text
+
+    interactions = json.loads(text)["interactions"]
+    assert [i["request"]["path"] for i in interactions] == [
+        "/auth",
+        "/booking",
+        "/booking/{{bookingid#2}}",
+    ]
+    assert interactions[1]["response"]["body"].startswith(
+        '{"bookingid": {{bookingid#2}}'
+    )
+
+
+def test_replay_refuses_unrecorded_requests(
+    stub_booker: StubBooker, tmp_path: Path
+) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    client = cassette_client(stub_booker.url, tmp_path, "record")
+    try:
+        client.get(f"/booking/{booking_id}")
+    finally:
+        client.close()
+
+    client = cassette_client(stub_booker.url, tmp_path, "replay")
+    try:
+        assert client.get(f"/booking/{booking_id}").json() == {"firstname": "Alex"}
+        requests_before = stub_booker.requests
+        # Each recorded response is replayed once
+        with pytest.raises(CassetteMissError, match="No recorded response left"):
+            client.get(f"/booking/{booking_id}")
+        with pytest.raises(CassetteMissError):
+            client.get("/booking", params={"firstname": "Alex"})
+        assert stub_booker.requests == requests_before
+    finally:
+        client.close()
+
+
+def test_concurrent_recorders_merge_into_one_cassette(
+    stub_booker: StubBooker, tmp_path: Path, test_booking_data: Booking
+) -> None:
+    path = tmp_path / "booker.json"
+    booking = test_booking_data.model_dump(mode="json", by_alias=True)
+
+    def session(cassette: Cassette) -> requests.Session:
+        session = requests.Session()
+        session.mount("http://", CassetteAdapter(HTTPAdapter(), cassette))
+        return session
+
+    # Two shards recording at once, each saving when its client closes
+    shards = [Cassette(path, "record"), Cassette(path, "record")]
+    created = [
+        session(shard).post(f"{stub_booker.url}/booking", json=booking).json()
+        for shard in shards
+    ]
+    shards[0].save()
+    for shard, new in zip(shards, created, strict=True):
+        session(shard).get(f"{stub_booker.url}/booking/{new['bookingid']}")
+    shards[1].save()
+    shards[0].save()
+
+    interactions = json.loads(path.read_text())["interactions"]
+    assert [i["request"]["path"] for i in interactions] == [
+        "/booking",
+        "/booking",
+        "/booking/{{bookingid#2}}",
+        "/booking/{{bookingid#1}}",
+    ]
+
+    replay = session(Cassette(path, "replay"))
+    for _ in shards:
+        booking_id = replay.post(f"{stub_booker.url}/booking", json=booking).json()[
+            "bookingid"
+        ]
+        fetched = replay.get(f"{stub_booker.url}/booking/{booking_id}")
+        assert fetched.json()["firstname"] == booking["firstname"]
+
+
+def test_cassettes_keep_out_of_the_shared_token_cache(
+    stub_booker: StubBooker, tmp_path: Path, test_booking_data: Booking
+) -> None:
+    # A live run left a valid token in the shared cache
+    live = cassette_client(stub_booker.url, tmp_path, "passthrough")
+    try:
+        live.authenticate("admin", "secret")
+    finally:
+        live.close()
+
+    url = stub_booker.url
+    client = cassette_client(url, tmp_path, "record")
+    try:
+        recorded = crud_scenario(client, test_booking_data)
+    finally:
+        client.close()
+    assert stub_booker.hits["POST /auth"] == 2
+
+    token_cache = tmp_path / "tokens.json"
+    # Expired meanwhile: the replay must not need it
+    token_cache.unlink()
+    client = cassette_client(url, tmp_path, "replay")
+    try:
+        assert crud_scenario(client, test_booking_data) == recorded
+    finally:
+        client.close()
+    assert not token_cache.exists()
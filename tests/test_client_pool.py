@@ -0,0 +1,75 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.clients import BookerClient
+from config.settings import ClientSettings
+from tests.stubs import StubBooker
+
+THREADS = 16
+REQUESTS_PER_THREAD = 25
+POOL_FULL = "Connection pool is full"
+
+
+def hammer(client: BookerClient, booking_id: int) -> set[int]:
+    """Shares one client across THREADS threads; returns the sessions used."""
+
+    def worker(_: int) -> int:
+        for _ in range(REQUESTS_PER_THREAD):
+            client.get(f"/booking/{booking_id}")
+        return id(client.session)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return set(pool.map(worker, range(THREADS)))
+
+
+@pytest.mark.parametrize(
+    ("pool_maxsize", "pool_block", "thread_safe"),
+    [(THREADS, False, True), (4, True, True), (4, True, False)],
+    ids=["sized-pool", "blocking-pool", "shared-session"],
+)
+def test_shared_client_reuses_connections(
+    stub_booker: StubBooker,
+    caplog: pytest.LogCaptureFixture,
+    pool_maxsize: int,
+    pool_block: bool,
+    thread_safe: bool,
+) -> None:
+    stub_booker.latency = 0.002
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    config = ClientSettings.model_validate(
+        {
+            "CLIENT_POOL_MAXSIZE": pool_maxsize,
+            "CLIENT_POOL_BLOCK": pool_block,
+            "CLIENT_THREAD_SAFE": thread_safe,
+        }
+    )
+    client = BookerClient(stub_booker.url, config)
+
+    with caplog.at_level(logging.WARNING, logger="urllib3.connectionpool"):
+        sessions = hammer(client, booking_id)
+    client.close()
+
+    assert stub_booker.requests == THREADS * REQUESTS_PER_THREAD
+    assert stub_booker.connections <= pool_maxsize
+    assert POOL_FULL not in caplog.text
+    assert len(sessions) == (THREADS if thread_safe else 1)
+
+
+def test_undersized_pool_discards_connections(
+    stub_booker: StubBooker, caplog: pytest.LogCaptureFixture
+) -> None:
+    stub_booker.latency = 0.002
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    config = ClientSettings.model_validate({"CLIENT_POOL_MAXSIZE": 4})
+    client = BookerClient(stub_booker.url, config)
+
+    with caplog.at_level(logging.WARNING, logger="urllib3.connectionpool"):
+        hammer(client, booking_id)
+    client.close()
+
+    # The failure mode the pool settings exist for: surplus connections are
+    # opened per request and thrown away instead of being reused
+    assert POOL_FULL in caplog.text
+    assert stub_booker.connections > 4
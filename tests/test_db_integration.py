@@ -1,7 +1,15 @@
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.db import repository
 from app.db.models import TestRun
+from app.schemas import (
+    AttemptSummary,
+    RequestTimingSummary,
+    RunStatus,
+    RunSummary,
+    TestRunRequest,
+)
 
 
 def test_db_connection_and_write(db_session: Session) -> None:
@@ -23,3 +31,78 @@ def test_db_connection_and_write(db_session: Session) -> None:
     # Teardown: Clean up synthetic data to avoid polluting metrics
     db_session.delete(saved_run)
     db_session.commit()
+
+
+def test_run_record_lifecycle(db_session: Session) -> None:
+    request = TestRunRequest(test_suite="tests/test_crud.py")
+
+    run = repository.create_run(db_session, request)
+    assert run.id is not None
+    assert run.status == RunStatus.QUEUED
+
+    repository.mark_run_started(db_session, run.id)
+    repository.mark_run_finished(
+        db_session,
+        run.id,
+        RunStatus.FAILED,
+        RunSummary(
+            exit_code=1,
+            total_tests=3,
+            failed_tests=1,
+            attempts=[
+                AttemptSummary(
+                    attempt=1, exit_code=1, total_tests=3, failed_tests=1, duration=2.5
+                )
+            ],
+            request_timings=[
+                RequestTimingSummary(
+                    method="GET",
+                    endpoint="/booking/{id}",
+                    phase="ttfb",
+                    count=12,
+                    p50=0.02,
+                    p95=0.08,
+                    p99=0.1,
+                )
+            ],
+        ),
+    )
+
+    saved_run = repository.get_run(db_session, run.id)
+    assert saved_run is not None
+    db_session.refresh(saved_run)
+    assert saved_run.status == RunStatus.FAILED
+    assert saved_run.exit_code == 1
+    assert saved_run.failed_tests == 1
+    assert [attempt.attempt for attempt in saved_run.attempts] == [1]
+    assert [
+        (timing.endpoint, timing.phase, timing.count)
+        for timing in saved_run.request_timings
+    ] == [("/booking/{id}", "ttfb", 12)]
+    assert saved_run.started_at is not None
+    assert saved_run.finished_at is not None
+
+    failed_runs = repository.list_runs(db_session, status=RunStatus.FAILED)
+    assert run.id in [item.id for item in failed_runs]
+
+    # Teardown
+    repository.delete_run(db_session, run.id)
+    assert repository.get_run(db_session, run.id) is None
+
+
+def test_runs_orphaned_by_a_restart_end_as_errors(db_session: Session) -> None:
+    request = TestRunRequest(test_suite="tests/test_crud.py")
+    queued = repository.create_run(db_session, request)
+    running = repository.create_run(db_session, request)
+    repository.mark_run_started(db_session, running.id)
+
+    try:
+        orphans = repository.fail_orphaned_runs(db_session)
+        assert {queued.id, running.id} <= set(orphans)
+        for run in (queued, running):
+            db_session.refresh(run)
+            assert run.status == RunStatus.ERROR
+            assert run.finished_at is not None
+    finally:
+        repository.delete_run(db_session, queued.id)
+        repository.delete_run(db_session, running.id)
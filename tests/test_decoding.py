@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.clients import BookerClient
+from app.clients.decoding import decode_booking_ids
+from app.schemas import Booking
+from config.settings import ClientSettings
+from tests.stubs import StubBooker
+
+
+def test_booking_ids_are_validated_unless_trusted() -> None:
+    listing = json.dumps([{"bookingid": 7}, {"bookingid": "8"}]).encode()
+
+    assert decode_booking_ids(listing) == [7, 8]
+    # Only parsed: the ID stays as the API sent it
+    assert decode_booking_ids(listing, validate=False) == [7, "8"]
+    with pytest.raises(ValidationError):
+        decode_booking_ids(b'[{"bookingid": "seven"}]')
+
+
+def test_client_decodes_bodies_with_and_without_validation(
+    stub_booker: StubBooker, test_booking_data: Booking
+) -> None:
+    booking_id = stub_booker.add_booking(test_booking_data.to_payload())
+    for validate in (True, False):
+        config = ClientSettings.model_validate({"CLIENT_VALIDATE_LISTINGS": validate})
+        client = BookerClient(stub_booker.url, config)
+        try:
+            assert client.get_booking(booking_id) == test_booking_data
+            assert client.get_booking_ids() == [booking_id]
+        finally:
+            client.close()
+
+    stub_booker.add_booking({"firstname": ""})
+    client = BookerClient(stub_booker.url)
+    try:
+        with pytest.raises(ValidationError):
+            client.get_booking(booking_id + 1)
+    finally:
+        client.close()
@@ -0,0 +1,162 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db import QueueWorker, RunJob, SessionLocal, repository
+from app.schemas import RunStatus, TestRunRequest
+
+PASSING_SUITE = "def test_ok():\n    assert True\n"
+
+
+@pytest.fixture
+def queued_runs(db_session: Session) -> Generator[list[int], None, None]:
+    """Six runs on the distributed queue, removed again after the test."""
+    request = TestRunRequest(test_suite="tests/test_crud.py")
+    run_ids = [
+        repository.create_run(db_session, request, "pytest", enqueue=True).id
+        for _ in range(6)
+    ]
+
+    yield run_ids
+
+    for run_id in run_ids:
+        repository.delete_run(db_session, run_id)
+
+
+def claim_all(worker_id: str) -> list[int]:
+    claimed = []
+    with SessionLocal() as db:
+        while (run := repository.claim_job(db, worker_id)) is not None:
+            claimed.append(run.id)
+    return claimed
+
+
+def backdate_heartbeats(db: Session, run_ids: list[int]) -> None:
+    db.execute(
+        update(RunJob)
+        .where(RunJob.run_id.in_(run_ids))
+        .values(heartbeat_at=func.now() - func.make_interval(0, 0, 0, 0, 1))
+    )
+    db.commit()
+
+
+def test_concurrent_claims_never_overlap(queued_runs: list[int]) -> None:
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        claims = list(pool.map(claim_all, ["node-a", "node-b", "node-c"]))
+
+    claimed = [run_id for worker_claims in claims for run_id in worker_claims]
+
+    assert len(claimed) == len(set(claimed))
+    assert set(queued_runs) <= set(claimed)
+
+
+def test_jobs_of_dead_workers_are_requeued(
+    db_session: Session, queued_runs: list[int]
+) -> None:
+    run_id = queued_runs[0]
+    db_session.execute(delete(RunJob).where(RunJob.run_id.in_(queued_runs[1:])))
+    db_session.commit()
+
+    first = repository.claim_job(db_session, "dead-node")
+    assert first is not None and first.id == run_id
+    backdate_heartbeats(db_session, [run_id])
+
+    assert repository.requeue_stale_jobs(db_session, 60, max_deliveries=2) == [run_id]
+    run = repository.get_run(db_session, run_id)
+    assert run is not None and run.status == RunStatus.QUEUED
+
+    assert repository.claim_job(db_session, "second-dead-node") is not None
+    backdate_heartbeats(db_session, [run_id])
+
+    # Delivered twice already: the run is given up instead of retried forever
+    assert repository.requeue_stale_jobs(db_session, 60, max_deliveries=2) == [run_id]
+    db_session.refresh(run)
+    assert run.status == RunStatus.ERROR
+    assert db_session.scalar(select(RunJob).where(RunJob.run_id == run_id)) is None
+
+
+def test_cancelled_jobs_of_dead_workers_are_not_requeued(
+    db_session: Session, queued_runs: list[int]
+) -> None:
+    stale, released = queued_runs[:2]
+    db_session.execute(delete(RunJob).where(RunJob.run_id.in_(queued_runs[2:])))
+    db_session.commit()
+    assert sorted(claim_all("doomed-node")) == [stale, released]
+
+    # Cancelled while the worker held them, before it could act on it
+    assert repository.cancel_job(db_session, stale)
+    assert repository.cancel_job(db_session, released)
+    backdate_heartbeats(db_session, [stale])
+
+    assert repository.requeue_stale_jobs(db_session, 60, max_deliveries=3) == [stale]
+    repository.release_job(db_session, released, "doomed-node")
+
+    for run_id in (stale, released):
+        run = repository.get_run(db_session, run_id)
+        assert run is not None
+        db_session.refresh(run)
+        assert run.status == RunStatus.CANCELLED
+        assert run.finished_at is not None
+    remaining = select(func.count()).where(RunJob.run_id.in_([stale, released]))
+    assert db_session.scalar(remaining) == 0
+
+
+def test_worker_nodes_drain_shared_queue(db_session: Session, tmp_path: Path) -> None:
+    suite = tmp_path / "test_passing.py"
+    suite.write_text(PASSING_SUITE)
+    request = TestRunRequest(test_suite=str(suite), timeout_seconds=120)
+    run_ids = [
+        repository.create_run(db_session, request, "pytest", enqueue=True).id
+        for _ in range(4)
+    ]
+
+    env = {
+        **os.environ,
+        "RUNNER_WORKERS": "1",
+        "RUNNER_PREWARM": "false",
+        "RUNNER_POLL_INTERVAL": "0.2",
+        "RUNNER_HEARTBEAT_INTERVAL": "0.5",
+    }
+    nodes = [
+        subprocess.Popen([sys.executable, "-m", "app.worker"], env=env)
+        for _ in range(2)
+    ]
+    try:
+        deadline = time.monotonic() + 120
+        pending = set(run_ids)
+        peak_nodes = 0
+        while pending and time.monotonic() < deadline:
+            time.sleep(0.5)
+            with SessionLocal() as db:
+                peak_nodes = max(peak_nodes, repository.queue_load(db)["nodes"])
+                pending = {
+                    run_id
+                    for run_id in run_ids
+                    if (run := repository.get_run(db, run_id)) is not None
+                    and run.status in (RunStatus.QUEUED, RunStatus.RUNNING)
+                }
+    finally:
+        for node in nodes:
+            node.send_signal(signal.SIGTERM)
+        exit_codes = [node.wait(timeout=30) for node in nodes]
+
+    with SessionLocal() as db:
+        statuses = [repository.get_run(db, run_id).status for run_id in run_ids]  # type: ignore[union-attr]
+        nodes_left = db.scalar(select(func.count()).select_from(QueueWorker))
+
+    for run_id in run_ids:
+        repository.delete_run(db_session, run_id)
+
+    assert statuses == [RunStatus.PASSED] * 4
+    assert peak_nodes == 2
+    assert exit_codes == [0, 0]
+    assert nodes_left == 0
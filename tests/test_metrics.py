@@ -0,0 +1,162 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from app import metrics
+from app.runner import ColdLauncher, LogBuffer, run_pytest_worker
+from app.runner.executor import suite_label
+from app.schemas import TestRunRequest
+
+# Talks to its own throwaway server, so the client latency has to travel
+# back from the pytest process through the report.
+HTTP_SUITE = """
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.clients.base import HTTPClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_client_requests():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/ping"
+    try:
+        for _ in range(3):
+            assert HTTPClient(url).request("GET", url).status_code == 204
+    finally:
+        server.shutdown()
+
+
+def test_failing():
+    assert False
+"""
+
+
+def test_registry_renders_prometheus_text() -> None:
+    runs = metrics.Counter("demo_runs_total", "Runs", ["status"])
+    latency = metrics.Histogram("demo_seconds", "Latency", buckets=(0.1, 1.0))
+    registry = metrics.Registry()
+    registry.register(runs)
+    registry.register(latency)
+
+    runs.inc(status="passed")
+    runs.inc(2, status='say "hi"')
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_runs_total Runs",
+        "# TYPE demo_runs_total counter",
+        'demo_runs_total{status="passed"} 1.0',
+        'demo_runs_total{status="say \\"hi\\""} 2.0',
+        "# HELP demo_seconds Latency",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{le="0.1"} 1',
+        'demo_seconds_bucket{le="1.0"} 3',
+        'demo_seconds_bucket{le="+Inf"} 4',
+        "demo_seconds_sum 4.05",
+        "demo_seconds_count 4",
+    ]
+
+
+def test_histogram_snapshot_merges_across_processes() -> None:
+    source = metrics.Histogram("demo_client_seconds", "Latency", ["method"])
+    target = metrics.Histogram("demo_client_seconds", "Latency", ["method"])
+    source.observe(0.2, method="GET")
+    target.observe(0.3, method="GET")
+
+    target.merge(json.loads(json.dumps(source.snapshot())))
+
+    assert target.count(method="GET") == 2
+    assert target.count(method="POST") == 0
+
+
+def test_histogram_merge_drops_series_with_other_buckets() -> None:
+    source = metrics.Histogram("demo_client_seconds", "Latency", buckets=(0.1,))
+    target = metrics.Histogram("demo_client_seconds", "Latency", buckets=(0.1, 1.0))
+    source.observe(0.05)
+    warnings: list[str] = []
+    sink = logger.add(warnings.append, level="WARNING", format="{message}")
+
+    try:
+        target.merge(source.snapshot())
+    finally:
+        logger.remove(sink)
+
+    assert target.count() == 0
+    assert warnings == [
+        "Dropped demo_client_seconds series []: 2 buckets instead of 3\n"
+    ]
+
+
+def test_metrics_must_render_their_samples() -> None:
+    with pytest.raises(TypeError):
+        metrics.Metric("demo", "Abstract")  # type: ignore[abstract]
+
+
+def test_user_supplied_labels_are_capped() -> None:
+    suites = metrics.LabelLimit(2)
+
+    assert [suites(name) for name in ("a", "b", "c", "a")] == ["a", "b", "other", "a"]
+    assert suite_label("./tests/api/test_crud.py::test_create[1]") == (
+        "tests/api/test_crud.py"
+    )
+
+
+def test_histogram_quantiles_interpolate_within_buckets() -> None:
+    latency = metrics.Histogram("demo_phase_seconds", "Latency", ["phase"], (0.1, 1.0))
+    for value in (0.05,) * 50 + (0.5,) * 45 + (5.0,) * 5:
+        latency.observe(value, phase="ttfb")
+
+    assert latency.quantile(0.5, phase="ttfb") == 0.1
+    assert latency.quantile(0.95, phase="ttfb") == 1.0
+    # Beyond the last finite bound, the estimate is capped at it
+    assert latency.quantile(0.99, phase="ttfb") == 1.0
+    assert latency.quantile(0.5, phase="dns") == 0.0
+    assert latency.labelsets() == [{"phase": "ttfb"}]
+
+
+def test_run_records_outcomes_spawns_and_client_latency(tmp_path: Path) -> None:
+    suite = tmp_path / "test_http_suite.py"
+    suite.write_text(HTTP_SUITE)
+    request = TestRunRequest(test_suite=str(suite))
+
+    failed_runs = metrics.RUNS.value(status="failed")
+    failed_tests = metrics.TESTS.value(outcome="failed")
+    spawns = metrics.SPAWN_LATENCY.count(launcher="cold")
+    requests = metrics.HTTP_CLIENT_LATENCY.count(method="GET", status="204")
+
+    outcome = asyncio.run(
+        run_pytest_worker(request, LogBuffer(max_lines=500), ColdLauncher())
+    )
+
+    assert metrics.RUNS.value(status="failed") == failed_runs + 1
+    assert metrics.TESTS.value(outcome="failed") == failed_tests + 1
+    # The failing test is retried once, in a second pytest process
+    assert metrics.SPAWN_LATENCY.count(launcher="cold") == spawns + 2
+    assert metrics.HTTP_CLIENT_LATENCY.count(method="GET", status="204") == (
+        requests + 3
+    )
+    assert metrics.RUN_DURATION.count(suite=str(suite), browser="chromium") == 1
+    # Every request opened its own connection
+    timings = {
+        timing.phase: timing.count
+        for timing in outcome.summary().request_timings
+        if (timing.method, timing.endpoint) == ("GET", "/ping")
+    }
+    assert timings == {"dns": 3, "connect": 3, "ttfb": 3, "download": 3}
+    assert f'qa_run_duration_seconds_count{{suite="{suite}"' in (
+        metrics.REGISTRY.render()
+    )
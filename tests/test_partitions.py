@@ -0,0 +1,98 @@
+import uuid
+from datetime import UTC, date, datetime
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.db import ResultWriter, repository
+from app.db.models import TestRun
+from app.db.partitions import (
+    drop_expired_partitions,
+    ensure_partitions,
+    maintain_partitions,
+    month_start,
+    monthly_partitions,
+)
+from app.schemas import TestRunRequest
+from config.settings import ResultsSettings
+
+# A month long before any real results, so the tests never touch those
+PAST = date(2001, 1, 15)
+
+
+def months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def test_partitions_are_created_ahead_and_dropped_whole(db_session: Session) -> None:
+    name = f"partition_{uuid.uuid4().hex}"
+    # Lands in test_runs_default: no partition covers it yet
+    db_session.add(
+        TestRun(
+            test_name=name,
+            status="PASSED",
+            duration=0.1,
+            created_at=datetime(2001, 1, 10, tzinfo=UTC),
+        )
+    )
+    db_session.commit()
+
+    try:
+        created = ensure_partitions(db_session, months_ahead=1, today=PAST)
+        db_session.commit()
+        assert created == ["test_runs_y2001m01", "test_runs_y2001m02"]
+        assert ensure_partitions(db_session, months_ahead=1, today=PAST) == []
+
+        # The stray row was moved into its month when that was created
+        moved = db_session.scalar(
+            text("SELECT count(*) FROM test_runs_y2001m01 WHERE test_name = :name"),
+            {"name": name},
+        )
+        assert moved == 1
+
+        # Keeps every month from March 2001 on, i.e. all real partitions
+        retention = months_between(date(2001, 3, 1), date.today()) + 1
+        dropped = drop_expired_partitions(db_session, retention, date.today())
+        db_session.commit()
+        assert dropped == ["test_runs_y2001m01", "test_runs_y2001m02"]
+        assert month_start(PAST) not in monthly_partitions(db_session)
+        assert month_start(date.today()) in monthly_partitions(db_session)
+
+        remaining = select(func.count()).where(TestRun.test_name == name)
+        assert db_session.scalar(remaining) == 0
+    finally:
+        db_session.rollback()
+        for month in ("y2001m01", "y2001m02"):
+            db_session.execute(text(f"DROP TABLE IF EXISTS test_runs_{month}"))
+        db_session.execute(delete(TestRun).where(TestRun.test_name == name))
+        db_session.commit()
+
+
+def test_maintenance_keeps_upcoming_months_ready(db_session: Session) -> None:
+    config = ResultsSettings.model_validate(
+        {"RESULTS_RETENTION_MONTHS": 1200, "RESULTS_PARTITIONS_AHEAD": 2}
+    )
+    maintain_partitions(db_session, config)
+
+    partitions = monthly_partitions(db_session)
+    for offset in range(3):
+        assert month_start(date.today(), offset) in partitions
+
+
+def test_results_are_tagged_with_their_run(db_session: Session) -> None:
+    run = repository.create_run(db_session, TestRunRequest(test_suite="tests"))
+    name = f"tagged_{uuid.uuid4().hex}"
+    writer = ResultWriter(batch_size=10, flush_interval=60.0, run_id=run.id)
+    writer.add(name, "FAILED", 0.5)
+    writer.close()
+
+    stmt = select(TestRun.run_id).where(TestRun.test_name == name)
+    try:
+        assert db_session.scalar(stmt) == run.id
+
+        # Results outlive the run they came from
+        repository.delete_run(db_session, run.id)
+        assert db_session.scalar(stmt) is None
+    finally:
+        db_session.execute(delete(TestRun).where(TestRun.test_name == name))
+        db_session.commit()
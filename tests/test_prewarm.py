@@ -0,0 +1,67 @@
+import asyncio
+import os
+from pathlib import Path
+
+from app.runner import LogBuffer, WarmPool
+from tests.test_cancellation import is_running
+
+PASSING_TEST = "def test_ok():\n    assert True\n"
+FAILING_TEST = "def test_broken():\n    assert False\n"
+# Passes, leaving a stand-in for a browser behind
+LEAKING_TEST = """
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_leaks():
+    browser = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(300)"])
+    Path(__file__).with_suffix(".pid").write_text(str(browser.pid))
+"""
+
+
+def pytest_args(path: Path) -> list[str]:
+    return [str(path), "-q", "-p", "no:cacheprovider", "-c", os.devnull]
+
+
+def test_warm_pool_runs_jobs_and_recycles_runners(tmp_path: Path) -> None:
+    passing = tmp_path / "test_passing.py"
+    passing.write_text(PASSING_TEST)
+    failing = tmp_path / "test_failing.py"
+    failing.write_text(FAILING_TEST)
+
+    async def scenario() -> tuple[int, int, list[str]]:
+        pool = WarmPool(size=1, max_runs=1)
+        await pool.start()
+        try:
+            log = LogBuffer(max_lines=200)
+            passed = await pool.run(pytest_args(passing), {}, log)
+            # The only runner was retired after one job; this waits for its
+            # replacement to warm up.
+            failed = await pool.run(pytest_args(failing), {}, LogBuffer(10))
+        finally:
+            await pool.stop()
+
+        return passed, failed, [line for _, line in log.snapshot()]
+
+    passed, failed, output = asyncio.run(scenario())
+
+    assert passed == 0
+    assert failed == 1
+    assert any("1 passed" in line for line in output)
+
+
+def test_warm_runs_leave_no_processes_behind(tmp_path: Path) -> None:
+    leaking = tmp_path / "test_leaking.py"
+    leaking.write_text(LEAKING_TEST)
+
+    async def scenario() -> int:
+        pool = WarmPool(size=1, max_runs=5)
+        await pool.start()
+        try:
+            return await pool.run(pytest_args(leaking), {}, LogBuffer(max_lines=100))
+        finally:
+            await pool.stop()
+
+    assert asyncio.run(scenario()) == 0
+    assert not is_running(int(leaking.with_suffix(".pid").read_text()))
@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from requests import Response
+
+from app.clients import BookerClient
+from app.clients.reporting import ReportingMode, ResponseRecorder
+from app.exceptions import APIClientError
+from config.settings import ClientSettings
+from tests.stubs import StubBooker
+
+
+class CountingSink:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.responses: list[int] = []
+
+    @contextmanager
+    def span(self, method: str, url: str, body: Any) -> Iterator[ResponseRecorder]:
+        self.requests += 1
+        yield self._record
+
+    def _record(self, response: Response) -> None:
+        self.responses.append(response.status_code)
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"), [("full", 10), ("sampled", 2), ("off", 0)]
+)
+def test_reporting_mode_controls_reported_requests(
+    stub_booker: StubBooker, mode: ReportingMode, expected: int
+) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    config = ClientSettings.model_validate(
+        {"CLIENT_REPORTING": mode, "CLIENT_REPORTING_SAMPLE_EVERY": 5}
+    )
+    sink = CountingSink()
+    client = BookerClient(stub_booker.url, config, sinks=[sink])
+    try:
+        for _ in range(10):
+            client.get(f"/booking/{booking_id}")
+    finally:
+        client.close()
+
+    assert sink.requests == expected
+    assert sink.responses == [200] * expected
+
+
+def test_unreported_request_errors_are_still_mapped(stub_booker: StubBooker) -> None:
+    config = ClientSettings.model_validate({"CLIENT_REPORTING": "off"})
+    sink = CountingSink()
+    client = BookerClient(stub_booker.url, config, sinks=[sink])
+    try:
+        with pytest.raises(APIClientError) as exc_info:
+            client.get("/booking/999")
+    finally:
+        client.close()
+
+    assert exc_info.value.status_code == 404
+    assert sink.requests == 0
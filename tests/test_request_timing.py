@@ -0,0 +1,46 @@
+from app import metrics
+from app.clients import BookerClient
+from app.clients.timing import endpoint_template
+from tests.stubs import StubBooker
+
+
+def ttfb_seconds(endpoint: str) -> float:
+    labels = ["GET", endpoint, "ttfb"]
+    return sum(
+        float(entry["sum"])
+        for entry in metrics.HTTP_CLIENT_PHASES.snapshot()
+        if entry["labels"] == labels
+    )
+
+
+def test_client_records_phases_per_endpoint_template(stub_booker: StubBooker) -> None:
+    booking_ids = [stub_booker.add_booking({"n": n}) for n in range(3)]
+    stub_booker.latency = 0.02
+    labels = {"method": "GET", "endpoint": "/booking/{id}"}
+    before = {
+        phase: metrics.HTTP_CLIENT_PHASES.count(**labels, phase=phase)
+        for phase in ("connect", "ttfb")
+    }
+    waited = ttfb_seconds("/booking/{id}")
+
+    client = BookerClient(stub_booker.url)
+    try:
+        for booking_id in booking_ids:
+            client.get(f"/booking/{booking_id}")
+    finally:
+        client.close()
+
+    phases = metrics.HTTP_CLIENT_PHASES
+    # One connection, kept alive for all three requests
+    assert phases.count(**labels, phase="connect") == before["connect"] + 1
+    assert phases.count(**labels, phase="ttfb") == before["ttfb"] + 3
+    # The server's latency shows up as time to first byte
+    assert ttfb_seconds("/booking/{id}") - waited >= 3 * 0.02
+
+
+def test_endpoint_template_generalizes_ids() -> None:
+    assert endpoint_template("http://host/booking/42?x=1") == "/booking/{id}"
+    assert endpoint_template("http://host/v2/booking/42/notes/7") == (
+        "/v2/booking/{id}/notes/{id}"
+    )
+    assert endpoint_template("http://host") == "/"
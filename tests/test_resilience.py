@@ -0,0 +1,162 @@
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import pytest
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from app.clients import BookerClient
+from app.clients.base import HTTPClient
+from app.clients.resilience import CircuitBreaker, CircuitState, RetryBudget
+from app.exceptions import APIClientError, CassetteMissError, CircuitOpenError
+from config.settings import ClientSettings
+from tests.stubs import StubBooker
+
+
+def test_breaker_fails_fast_until_a_probe_succeeds(stub_booker: StubBooker) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    endpoint = f"/booking/{booking_id}"
+    config = ClientSettings.model_validate(
+        {"CLIENT_BREAKER_THRESHOLD": 2, "CLIENT_BREAKER_RESET_TIMEOUT": 0.2}
+    )
+    client = BookerClient(stub_booker.url, config)
+    try:
+        stub_booker.faults[endpoint] = [503] * 8
+        for _ in range(2):
+            with pytest.raises(APIClientError) as exc_info:
+                client.get(endpoint)
+            assert exc_info.value.status_code == 503
+
+        requests_before = stub_booker.requests
+        with pytest.raises(CircuitOpenError, match="Circuit open for"):
+            client.get(endpoint)
+        assert stub_booker.requests == requests_before
+
+        time.sleep(0.25)
+        stub_booker.faults[endpoint] = []
+        # The half-open probe goes through and closes the circuit
+        assert client.get(endpoint).json() == {"firstname": "Alex"}
+        assert client._http.breaker.state == CircuitState.CLOSED
+    finally:
+        client.close()
+
+
+def test_retry_budget_caps_retries_to_a_share_of_traffic(
+    stub_booker: StubBooker,
+) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    endpoint = f"/booking/{booking_id}"
+    config = ClientSettings.model_validate(
+        {
+            "CLIENT_BREAKER_THRESHOLD": 100,
+            "CLIENT_RETRY_BUDGET_RATIO": 0.1,
+            "CLIENT_RETRY_BUDGET_RESERVE": 2,
+        }
+    )
+    client = BookerClient(stub_booker.url, config)
+    try:
+        stub_booker.faults[endpoint] = [500] * 100
+        for _ in range(10):
+            with pytest.raises(APIClientError):
+                client.get(endpoint)
+    finally:
+        client.close()
+
+    # 10 requests, the 2 reserved retries and about one earned per 10 requests,
+    # instead of 4 attempts per request
+    assert stub_booker.hits[f"GET {endpoint}"] <= 13
+
+
+def test_breaker_reopens_when_the_probe_fails() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker("http://target", 1, 10.0, clock=lambda: now[0])
+
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    now[0] = 10.0
+    breaker.before_request()
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    budget = RetryBudget(ratio=0.5, reserve=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+class BrokenAdapter(BaseAdapter):
+    """Fails every request with an error requests does not wrap."""
+
+    def send(self, *args: Any, **kwargs: Any) -> Response:
+        raise ConnectionResetError("Connection reset by peer")
+
+    def close(self) -> None:
+        pass
+
+
+def test_probe_failing_with_any_error_reopens_the_circuit() -> None:
+    config = ClientSettings.model_validate(
+        {
+            "CLIENT_BREAKER_THRESHOLD": 1,
+            "CLIENT_BREAKER_RESET_TIMEOUT": 0.05,
+            "CLIENT_THREAD_SAFE": True,
+        }
+    )
+    client = HTTPClient(f"http://{uuid.uuid4().hex}.invalid", config)
+    # Sessions of thread-safe clients are opened on first use
+    client.adapter = BrokenAdapter()
+    url = f"{client.base_url}/ping"
+    try:
+        client.breaker.record_failure()
+        for _ in range(2):
+            time.sleep(0.06)
+            # Each probe is let through, fails, and reopens the circuit
+            with pytest.raises(ConnectionResetError):
+                client.request("GET", url)
+            assert client.breaker.state == CircuitState.OPEN
+    finally:
+        client.close()
+
+
+def test_replay_misses_do_not_count_against_the_target(tmp_path: Path) -> None:
+    # Replaying an empty cassette fails every request with CassetteMissError
+    cassette = tmp_path / "empty.json"
+    cassette.write_text(json.dumps({"version": 1, "interactions": []}))
+    config = ClientSettings.model_validate(
+        {
+            "CLIENT_BREAKER_THRESHOLD": 1,
+            "CLIENT_BREAKER_RESET_TIMEOUT": 0.05,
+            "CLIENT_CASSETTE": str(cassette),
+            "CLIENT_CASSETTE_MODE": "replay",
+        }
+    )
+    client = HTTPClient(f"http://{uuid.uuid4().hex}.invalid", config)
+    url = f"{client.base_url}/ping"
+    try:
+        for _ in range(3):
+            with pytest.raises(CassetteMissError):
+                client.request("GET", url)
+        after_misses = client.breaker.state
+
+        client.breaker.record_failure()
+        time.sleep(0.06)
+        # A probe that misses is released, so the next request probes again
+        for _ in range(2):
+            with pytest.raises(CassetteMissError):
+                client.request("GET", url)
+        after_probes = client.breaker.state
+    finally:
+        client.close()
+
+    assert after_misses == CircuitState.CLOSED
+    assert after_probes == CircuitState.HALF_OPEN
@@ -0,0 +1,69 @@
+import time
+from collections.abc import Generator
+
+import pytest
+
+from app.clients import BookerClient
+from config.settings import ClientSettings
+from tests.stubs import STUB_TOKEN, StubBooker
+
+
+@pytest.fixture
+def cached_client(stub_booker: StubBooker) -> Generator[BookerClient, None, None]:
+    config = ClientSettings.model_validate(
+        {"CLIENT_CACHE_SIZE": 2, "CLIENT_CACHE_TTL": 0.2}
+    )
+    client = BookerClient(stub_booker.url, config)
+    yield client
+    client.close()
+
+
+def test_cache_serves_repeated_gets_and_drops_written_bookings(
+    stub_booker: StubBooker, cached_client: BookerClient
+) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    endpoint = f"/booking/{booking_id}"
+
+    for _ in range(5):
+        assert cached_client.get(endpoint).json() == {"firstname": "Alex"}
+    cached_client.get("/booking")
+
+    assert stub_booker.requests == 2
+    cache = cached_client.cache
+    assert cache is not None
+    assert (cache.stats.hits, cache.stats.misses) == (4, 2)
+
+    # Writing a booking drops it and the listing above it
+    cached_client.patch(
+        endpoint,
+        payload={"firstname": "Sam"},
+        headers={"Cookie": f"token={STUB_TOKEN}"},
+    )
+    assert len(cache) == 0
+    assert cached_client.get(endpoint).json() == {"firstname": "Sam"}
+    assert stub_booker.requests == 4
+
+
+def test_stale_entries_are_revalidated_and_evicted_by_recency(
+    stub_booker: StubBooker, cached_client: BookerClient
+) -> None:
+    first, second, third = (stub_booker.add_booking({"n": n}) for n in range(3))
+    cached_client.get(f"/booking/{first}")
+
+    time.sleep(0.25)
+    # Unchanged on the server, so the stale entry comes back as 304 and is renewed
+    assert cached_client.get(f"/booking/{first}").json() == {"n": 0}
+    cache = cached_client.cache
+    assert cache is not None
+    assert cache.stats.revalidations == 1
+
+    cached_client.get(f"/booking/{second}")
+    cached_client.get(f"/booking/{first}")
+    cached_client.get(f"/booking/{third}")
+
+    # Two entries fit; the least recently used one was evicted
+    assert len(cache) == 2
+    requests_before = stub_booker.requests
+    cached_client.get(f"/booking/{first}")
+    cached_client.get(f"/booking/{second}")
+    assert stub_booker.requests == requests_before + 1
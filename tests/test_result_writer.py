@@ -0,0 +1,48 @@
+import time
+import uuid
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db import ResultWriter
+from app.db.models import TestRun
+
+
+def count_rows(db_session: Session, prefix: str) -> int:
+    stmt = select(func.count()).where(TestRun.test_name.startswith(prefix))
+    return int(db_session.execute(stmt).scalar_one())
+
+
+def test_writer_batches_rows_and_drains_on_close(db_session: Session) -> None:
+    prefix = f"writer_{uuid.uuid4().hex}_"
+    writer = ResultWriter(batch_size=10, flush_interval=60.0)
+    try:
+        for index in range(25):
+            writer.add(f"{prefix}{index}", "PASSED", 0.01)
+        # Two full batches go out at once; the rest waits for the interval
+        deadline = time.monotonic() + 5
+        while writer.written < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.written == 20
+
+        writer.close()
+        assert (writer.written, writer.flushes) == (25, 3)
+        assert count_rows(db_session, prefix) == 25
+    finally:
+        db_session.execute(delete(TestRun).where(TestRun.test_name.startswith(prefix)))
+        db_session.commit()
+
+
+def test_writer_flushes_a_partial_batch_after_the_interval(
+    db_session: Session,
+) -> None:
+    prefix = f"writer_{uuid.uuid4().hex}_"
+    writer = ResultWriter(batch_size=100, flush_interval=0.1)
+    try:
+        writer.add(f"{prefix}0", "FAILED", 1.5)
+        time.sleep(0.5)
+        assert count_rows(db_session, prefix) == 1
+    finally:
+        writer.close()
+        db_session.execute(delete(TestRun).where(TestRun.test_name.startswith(prefix)))
+        db_session.commit()
@@ -0,0 +1,36 @@
+import asyncio
+from pathlib import Path
+
+from app.runner import ColdLauncher, LogBuffer, RunOutcome, run_pytest_worker
+from app.schemas import TestRunRequest
+
+FLAKY_SUITE = """
+from pathlib import Path
+
+MARKER = Path(__file__).with_suffix(".ran")
+
+
+def test_stable():
+    assert True
+
+
+def test_flaky():
+    first_run = not MARKER.exists()
+    MARKER.touch()
+    assert not first_run
+"""
+
+
+def test_retries_rerun_only_failed_tests(tmp_path: Path) -> None:
+    suite = tmp_path / "test_flaky_suite.py"
+    suite.write_text(FLAKY_SUITE)
+    request = TestRunRequest(test_suite=str(suite), retries=2)
+
+    outcome: RunOutcome = asyncio.run(
+        run_pytest_worker(request, LogBuffer(max_lines=500), ColdLauncher())
+    )
+
+    assert outcome.exit_code == 0
+    assert outcome.failed_tests == []
+    assert [attempt.total_tests for attempt in outcome.attempts] == [2, 1]
+    assert [attempt.failed_tests for attempt in outcome.attempts] == [1, 0]
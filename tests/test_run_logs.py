@@ -0,0 +1,53 @@
+import asyncio
+
+from app.runner import LogBuffer, LogHub
+
+
+def test_log_buffer_keeps_only_newest_lines() -> None:
+    async def scenario() -> LogBuffer:
+        buffer = LogBuffer(max_lines=3)
+        for index in range(5):
+            await buffer.append(f"line {index}")
+        return buffer
+
+    buffer = asyncio.run(scenario())
+
+    assert buffer.first_seq == 2
+    assert buffer.snapshot() == [(2, "line 2"), (3, "line 3"), (4, "line 4")]
+    assert buffer.snapshot(start=4) == [(4, "line 4")]
+
+
+def test_log_buffer_follow_streams_until_closed() -> None:
+    async def scenario() -> list[tuple[int, str]]:
+        buffer = LogBuffer(max_lines=100)
+        await buffer.append("collected 2 items")
+
+        async def produce() -> None:
+            for line in ("test_a PASSED", "test_b FAILED"):
+                await asyncio.sleep(0.01)
+                await buffer.append(line)
+            await buffer.close()
+
+        producer = asyncio.create_task(produce())
+        received = [entry async for entry in buffer.follow(start=1)]
+        await producer
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert received == [(1, "test_a PASSED"), (2, "test_b FAILED")]
+
+
+def test_log_hub_evicts_oldest_finished_buffers() -> None:
+    async def scenario() -> LogHub:
+        hub = LogHub(max_lines=10, retained_runs=1)
+        for run_id in (1, 2):
+            await hub.open(run_id).close()
+        hub.open(3)
+        return hub
+
+    hub = asyncio.run(scenario())
+
+    assert hub.get(1) is None
+    assert hub.get(2) is not None
+    assert hub.get(3) is not None
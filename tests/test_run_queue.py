@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.exceptions import QueueFullError
+from app.runner import Job, JobQueue, WorkerPool
+from app.schemas import RunPriority, TestRunRequest
+
+
+def make_request(priority: RunPriority = RunPriority.NORMAL) -> TestRunRequest:
+    return TestRunRequest(test_suite="tests/smoke", priority=priority)
+
+
+def test_queue_serves_lanes_by_priority() -> None:
+    async def scenario() -> list[RunPriority]:
+        queue = JobQueue(max_depth=10)
+        for priority in (RunPriority.LOW, RunPriority.NORMAL, RunPriority.HIGH):
+            queue.submit(1, make_request(priority))
+
+        return [(await queue.next_job()).priority for _ in range(3)]
+
+    order = asyncio.run(scenario())
+
+    assert order == [RunPriority.HIGH, RunPriority.NORMAL, RunPriority.LOW]
+
+
+def test_queue_rejects_jobs_over_depth_limit() -> None:
+    async def scenario() -> JobQueue:
+        queue = JobQueue(max_depth=2)
+        queue.submit(1, make_request())
+        queue.submit(2, make_request(RunPriority.HIGH))
+
+        with pytest.raises(QueueFullError):
+            queue.submit(1, make_request())
+
+        return queue
+
+    queue = asyncio.run(scenario())
+
+    assert queue.depth == 2
+    assert queue.lane_depths() == {"high": 1, "normal": 1, "low": 0}
+
+
+def test_worker_pool_caps_concurrency() -> None:
+    async def scenario() -> int:
+        queue = JobQueue(max_depth=20)
+        running = 0
+        peak = 0
+
+        async def handler(_: Job) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        pool = WorkerPool(queue, workers=3, handler=handler)
+        for _ in range(12):
+            queue.submit(1, make_request())
+
+        await pool.start()
+        await asyncio.wait_for(queue.join(), timeout=5)
+        await pool.stop()
+        return peak
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_queue_skips_cancelled_jobs() -> None:
+    async def scenario() -> tuple[bool, int, int]:
+        queue = JobQueue(max_depth=2)
+        queue.submit(1, make_request())
+        queue.submit(2, make_request())
+
+        cancelled = queue.cancel(1)
+        # The cancelled job's slot is free again straight away
+        queue.submit(3, make_request())
+        return cancelled, queue.depth, (await queue.next_job()).run_id
+
+    cancelled, depth, next_run = asyncio.run(scenario())
+
+    assert cancelled
+    assert depth == 2
+    assert next_run == 2
+
+
+def test_worker_pool_cancels_running_job() -> None:
+    async def scenario() -> tuple[bool, bool, list[int]]:
+        queue = JobQueue(max_depth=5)
+        finished: list[int] = []
+
+        async def handler(job: Job) -> None:
+            await asyncio.sleep(60 if job.run_id == 1 else 0)
+            finished.append(job.run_id)
+
+        pool = WorkerPool(queue, workers=1, handler=handler)
+        queue.submit(1, make_request())
+        queue.submit(2, make_request())
+        await pool.start()
+        await asyncio.sleep(0.01)
+
+        cancelled = await pool.cancel(1)
+        await asyncio.wait_for(queue.join(), timeout=5)
+        unknown = await pool.cancel(1)
+        await pool.stop()
+        return cancelled, unknown, finished
+
+    cancelled, unknown, finished = asyncio.run(scenario())
+
+    assert cancelled
+    assert not unknown
+    assert finished == [2]
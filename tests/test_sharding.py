@@ -0,0 +1,98 @@
+import asyncio
+from pathlib import Path
+
+from app.runner import (
+    ColdLauncher,
+    LogBuffer,
+    ShardLauncher,
+    merge_exit_codes,
+    plan_shards,
+    run_pytest_worker,
+)
+from app.schemas import TestRunRequest
+
+SUITE = """
+def test_a():
+    pass
+
+
+def test_b():
+    pass
+
+
+def test_c():
+    pass
+"""
+
+
+def test_plan_shards_balances_by_duration() -> None:
+    durations = {"slow": 10.0, "mid_a": 6.0, "mid_b": 4.0, "fast": 1.0}
+
+    groups = plan_shards(list(durations), durations, shards=2)
+
+    loads = sorted(sum(durations[node] for node in group) for group in groups)
+    assert loads == [10.0, 11.0]
+    assert sorted(node for group in groups for node in group) == sorted(durations)
+
+
+def test_plan_shards_weights_unknown_tests_with_median() -> None:
+    durations = {"a": 2.0, "b": 4.0, "c": 6.0}
+
+    groups = plan_shards(["a", "b", "c", "new"], durations, shards=2)
+
+    assert ["c", "a"] in groups
+    assert ["b", "new"] in groups
+
+
+def test_plan_shards_never_creates_empty_shards() -> None:
+    assert plan_shards(["only"], {}, shards=4) == [["only"]]
+    assert plan_shards([], {}, shards=4) == []
+
+
+def test_merge_exit_codes_reports_worst_outcome() -> None:
+    assert merge_exit_codes([0, 0]) == 0
+    assert merge_exit_codes([0, 1, 5]) == 1
+    assert merge_exit_codes([1, 2, 0]) == 2
+    assert merge_exit_codes([0, None]) is None
+    assert merge_exit_codes([5, 5]) == 5
+
+
+def test_shards_are_capped_at_the_shard_processes(tmp_path: Path) -> None:
+    suite = tmp_path / "test_sharded_suite.py"
+    suite.write_text(SUITE)
+    request = TestRunRequest(test_suite=str(suite), shards=3)
+    log = LogBuffer(max_lines=500)
+
+    outcome = asyncio.run(
+        run_pytest_worker(
+            request,
+            log,
+            ColdLauncher(),
+            shard_launcher=ShardLauncher(ColdLauncher(), 2),
+        )
+    )
+
+    assert outcome.exit_code == 0
+    assert outcome.total_tests == 3
+    lines = [line for _, line in log.snapshot()]
+    assert "[orchestrator] 3 shards requested, capped at 2 shard processes" in lines
+    assert {line.split("]")[0] for line in lines if line.startswith("[shard")} == {
+        "[shard 0",
+        "[shard 1",
+    }
+
+
+def test_concurrent_runs_of_the_checkout_skip_coverage() -> None:
+    # Inside the checkout, so pytest picks up its --cov addopts
+    request = TestRunRequest(test_suite="tests/test_decoding.py", shards=2)
+    logs = [LogBuffer(max_lines=500) for _ in range(3)]
+
+    async def scenario() -> list[int | None]:
+        outcomes = await asyncio.gather(
+            *(run_pytest_worker(request, log, ColdLauncher()) for log in logs)
+        )
+        return [outcome.exit_code for outcome in outcomes]
+
+    assert asyncio.run(scenario()) == [0, 0, 0]
+    for log in logs:
+        assert not any("Coverage HTML written" in line for _, line in log.snapshot())
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.db import async_db, repository
+from app.main import app
+from app.schemas import (
+    AttemptSummary,
+    RequestTimingSummary,
+    RunStatus,
+    RunSummary,
+    TestRunRequest,
+)
+
+
+async def fetch(*paths: str) -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=app)
+    # Opened by the API lifespan, which ASGITransport does not run
+    async_db.open()
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://orchestrator"
+        ) as client:
+            return list(await asyncio.gather(*(client.get(path) for path in paths)))
+    finally:
+        # Pooled asyncpg connections are bound to this event loop
+        await async_db.close()
+
+
+def test_status_endpoints_read_through_the_async_engine(
+    db_session: Session,
+) -> None:
+    suite = "tests/test_status_endpoints.py::probe"
+    run = repository.create_run(db_session, TestRunRequest(test_suite=suite))
+    timing: dict[str, Any] = {"count": 4, "p50": 0.01, "p95": 0.02, "p99": 0.03}
+    repository.mark_run_finished(
+        db_session,
+        run.id,
+        RunStatus.PASSED,
+        RunSummary(
+            exit_code=0,
+            total_tests=2,
+            failed_tests=0,
+            attempts=[
+                AttemptSummary(
+                    attempt=1, exit_code=0, total_tests=2, failed_tests=0, duration=1.0
+                )
+            ],
+            request_timings=[
+                RequestTimingSummary(
+                    method="POST", endpoint="/booking", phase="ttfb", **timing
+                ),
+                RequestTimingSummary(
+                    method="GET", endpoint="/booking/{id}", phase="ttfb", **timing
+                ),
+            ],
+        ),
+    )
+
+    try:
+        detail, timings, listing, missing, missing_timings = asyncio.run(
+            fetch(
+                f"/runs/{run.id}",
+                f"/runs/{run.id}/timings",
+                f"/runs?suite={suite}&status=passed",
+                "/runs/0",
+                "/runs/0/timings",
+            )
+        )
+    finally:
+        repository.delete_run(db_session, run.id)
+
+    assert detail.status_code == 200
+    assert detail.json()["status"] == "passed"
+    assert [a["attempt"] for a in detail.json()["attempts"]] == [1]
+
+    assert timings.status_code == 200
+    assert [(t["method"], t["endpoint"]) for t in timings.json()] == [
+        ("POST", "/booking"),
+        ("GET", "/booking/{id}"),
+    ]
+
+    assert [item["id"] for item in listing.json()] == [run.id]
+    assert missing.status_code == 404
+    assert missing_timings.status_code == 404
+
+
+def test_runs_are_submitted_and_cancelled_through_the_async_engine(
+    db_session: Session,
+) -> None:
+    async def submit_and_cancel() -> tuple[httpx.Response, httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async_db.open()
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://orchestrator"
+            ) as client:
+                submitted = await client.post(
+                    "/run", json={"test_suite": "tests/test_status_endpoints.py"}
+                )
+                run_id = submitted.json()["run_id"]
+                return submitted, await client.delete(f"/runs/{run_id}")
+        finally:
+            await async_db.close()
+
+    submitted, cancelled = asyncio.run(submit_and_cancel())
+    run_id = submitted.json()["run_id"]
+    try:
+        assert submitted.status_code == 202
+        assert cancelled.status_code == 200
+        assert cancelled.json()["status"] == "cancelled"
+        run = repository.get_run(db_session, run_id)
+        assert run is not None
+        assert run.status == RunStatus.CANCELLED
+        assert run.finished_at is not None
+    finally:
+        repository.delete_run(db_session, run_id)
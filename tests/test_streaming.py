@@ -0,0 +1,67 @@
+import json
+import tracemalloc
+from collections.abc import Iterator
+
+import pytest
+
+from app.clients import BookerClient
+from app.clients.streaming import iter_json_array
+from tests.stubs import StubBooker
+
+
+def split(data: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_elements_survive_any_chunk_boundary(size: int) -> None:
+    elements = [{"bookingid": 12345, "name": "Zoë"}, [], 10, -2.5e3, "a,]", None]
+    data = (
+        f" [ {json.dumps(elements[0])},\n{', '.join(map(json.dumps, elements[1:]))} ] "
+    )
+
+    assert list(iter_json_array(split(data.encode(), size))) == elements
+    assert list(iter_json_array(split(b"[]", size))) == []
+
+
+@pytest.mark.parametrize("data", [b"", b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1,]"])
+def test_malformed_arrays_are_rejected(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(data, 2)))
+
+
+def test_memory_stays_flat_for_huge_listings() -> None:
+    def listing(count: int) -> Iterator[bytes]:
+        yield b"["
+        for start in range(0, count, 1000):
+            ids = range(start, min(start + 1000, count))
+            yield ",".join(f'{{"bookingid": {i}}}' for i in ids).encode()
+            yield b"," if start + 1000 < count else b"]"
+
+    tracemalloc.start()
+    try:
+        total = sum(item["bookingid"] for item in iter_json_array(listing(200_000)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert total == sum(range(200_000))
+    # The body alone is ~4 MB; decoded as a list it would be several times that
+    assert peak < 256 * 1024
+
+
+def test_iter_booking_ids_stops_early(stub_booker: StubBooker) -> None:
+    booking_ids = [stub_booker.add_booking({"n": n}) for n in range(5000)]
+    client = BookerClient(stub_booker.url)
+    try:
+        assert list(client.iter_booking_ids()) == client.get_booking_ids()
+
+        ids = client.iter_booking_ids()
+        assert next(i for i in ids if i == booking_ids[10]) == booking_ids[10]
+        ids.close()
+
+        # The pool is still usable after abandoning a response midway
+        assert client.get_booking_ids() == booking_ids
+    finally:
+        client.close()
@@ -0,0 +1,68 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from app.clients import BookerClient
+from app.exceptions import APIClientError
+from config.settings import ClientSettings
+from tests.stubs import STUB_TOKEN, StubBooker
+
+
+def authenticate(url: str, token_cache: Path) -> str:
+    config = ClientSettings.model_validate({"CLIENT_TOKEN_CACHE": token_cache})
+    client = BookerClient(url, config)
+    try:
+        return client.authenticate("admin", "secret")
+    finally:
+        client.close()
+
+
+def test_processes_share_one_token(stub_booker: StubBooker, tmp_path: Path) -> None:
+    token_cache = tmp_path / "tokens.json"
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        tokens = pool.starmap(authenticate, [(stub_booker.url, token_cache)] * 8)
+
+    assert tokens == [STUB_TOKEN] * 8
+    assert stub_booker.hits["POST /auth"] == 1
+    assert token_cache.stat().st_mode & 0o077 == 0
+
+
+def test_rejected_token_is_refreshed_once(
+    stub_booker: StubBooker, tmp_path: Path
+) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    config = ClientSettings.model_validate(
+        {"CLIENT_TOKEN_CACHE": tmp_path / "tokens.json"}
+    )
+    client = BookerClient(stub_booker.url, config)
+    try:
+        token = client.authenticate("admin", "secret")
+        # The API no longer accepts the token, e.g. after a restart
+        stub_booker.faults[f"/booking/{booking_id}"] = [403]
+        client.delete_booking(booking_id, token)
+    finally:
+        client.close()
+
+    assert booking_id not in stub_booker.bookings
+    assert stub_booker.hits["POST /auth"] == 2
+    assert stub_booker.hits[f"DELETE /booking/{booking_id}"] == 2
+
+
+def test_foreign_token_is_not_replaced(stub_booker: StubBooker, tmp_path: Path) -> None:
+    booking_id = stub_booker.add_booking({"firstname": "Alex"})
+    config = ClientSettings.model_validate(
+        {"CLIENT_TOKEN_CACHE": tmp_path / "tokens.json"}
+    )
+    client = BookerClient(stub_booker.url, config)
+    try:
+        client.authenticate("admin", "secret")
+        with pytest.raises(APIClientError) as exc_info:
+            client.delete_booking(booking_id, "invalid_token_xyz")
+    finally:
+        client.close()
+
+    assert exc_info.value.status_code == 403
+    assert booking_id in stub_booker.bookings
+    assert stub_booker.hits[f"DELETE /booking/{booking_id}"] == 1